@@ -1,122 +1,58 @@
 import tkinter as tk
 from tkinter import messagebox
 
+from inheritance_engine import DEFAULT_G, EstateFacts, FamilyTree, distribute
+
+def parse_grandchildren(text):
+    """«1, 3» -> [1, 3]: по числу внуков у каждого умершего ребёнка."""
+    return [int(part) for part in text.replace(";", ",").split(",") if part.strip()]
+
+
 def calculate():
     try:
-        estate = float(entry_estate.get())
-        G = float(entry_G.get())
-
         alive_children = int(entry_alive_children.get())
-        dead_children = int(entry_dead_children.get())
-        grandchildren = int(entry_grandchildren.get())
-
-        has_spouse = spouse_var.get()
-        has_parents = parents_var.get()
-        has_grandparents = grandparents_var.get()
-        has_will = will_var.get()
-
-        original_estate = estate
-        distribution = {}
-        laws_used = []
-        info = ""
-
-        total_branches = alive_children + dead_children
-
-        # ==================================================
-        # ✅ ЕСЛИ НЕТ ЗАВЕЩАНИЯ → ВСЁ СТРОГО ПО ЗАКОНУ
-        # ==================================================
-        if not has_will:
-
-            # ✅ 1. СУПРУГ ПОЛУЧАЕТ ПЕРВЫМ
-            if has_spouse:
-                spouse_share = max(estate / 4, 4 * G)
-                distribution["Супруг"] = round(spouse_share, 2)
-                estate -= spouse_share
-                laws_used.append("§ 8 Arveloven — доля супруга при наличии детей")
-
-            # ✅ 2. ДЕТИ И ВНУКИ
-            if total_branches > 0:
-                branch_share = estate / total_branches
-
-                if alive_children > 0:
-                    distribution["Каждый живой ребёнок"] = round(branch_share, 2)
-                    laws_used.append("§ 4 Arveloven — дети наследуют в первой очереди")
-
-                if dead_children > 0 and grandchildren > 0:
-                    per_grandchild = branch_share / grandchildren
-                    distribution["Каждый внук"] = round(per_grandchild, 2)
-                    laws_used.append("§ 5 Arveloven — внуки наследуют по праву представления")
-
-                info = "✅ Сначала супруг, затем дети и внуки"
-
-            # ✅ 3. РОДИТЕЛИ
-            elif has_parents:
-                distribution["Каждый родитель"] = round(estate / 2, 2)
-                laws_used.append("§ 6 Arveloven — родители наследуют при отсутствии потомков")
-                info = "✅ Наследуют родители"
-
-            # ✅ 4. ДЕДУШКИ И БАБУШКИ
-            elif has_grandparents:
-                distribution["Каждый дедушка и бабушка"] = round(estate / 4, 2)
-                laws_used.append("§ 7 Arveloven — дедушки и бабушки наследуют")
-                info = "✅ Наследуют дедушки и бабушки"
-
-            else:
-                info = "⚠️ Наследников нет → имущество переходит государству"
-                laws_used.append("§ 9 Arveloven — наследство государству")
-
-        # ==================================================
-        # ✅ ЕСЛИ ЗАВЕЩАНИЕ ЕСТЬ → 2/3 + 15G
-        # ==================================================
-        else:
-            if total_branches > 0:
-                pliktdel = estate * 2 / 3
-                branch_share = pliktdel / total_branches
-                limit_15G = 15 * G
-                actual_branch = min(branch_share, limit_15G)
-
-                if alive_children > 0:
-                    distribution["Каждый живой ребёнок"] = round(actual_branch, 2)
-                    laws_used.append("§ 50 Arveloven — обязательная доля детей")
-
-                if dead_children > 0 and grandchildren > 0:
-                    distribution["Каждый внук"] = round(actual_branch / grandchildren, 2)
-                    laws_used.append("§ 5 Arveloven — внуки получают долю умершего")
-
-                total_to_children = actual_branch * total_branches
-                estate -= total_to_children
-                laws_used.append("§ 51 Arveloven — ограничение 15G")
-
-            if has_spouse:
-                spouse_share = min(estate, 4 * G)
-                distribution["Супруг"] = round(spouse_share, 2)
-                estate -= spouse_share
-                laws_used.append("§ 8 Arveloven — доля супруга")
-
-            distribution["По завещанию"] = round(estate, 2)
-            laws_used.append("§ 40 Arveloven — свобода завещания")
-            info = "✅ Применено завещание с обязательными долями"
-
-        # ==================================================
-        # ✅ ВЫВОД
-        # ==================================================
-        output = "\n====== ИТОГ ======\n"
-        output += f"Наследство: {original_estate:,.0f} NOK\n\n"
-
-        for k, v in distribution.items():
-            output += f"{k}: {v:,.0f} NOK\n"
-
-        output += "\n-------------------\n"
-        output += info + "\n\n"
-        output += "📚 ПРИМЕНЁННЫЕ СТАТЬИ ЗАКОНА:\n"
-
-        for law in laws_used:
-            output += f"• {law}\n"
-
-        label_result.config(text=output)
-
+        # дерево по ветвям: у каждого умершего ребёнка своё число внуков (§ 4)
+        family = FamilyTree.from_branches(alive_children, parse_grandchildren(entry_grandchildren.get()))
+        facts = EstateFacts(
+            estate=float(entry_estate.get()),
+            G=float(entry_G.get()),
+            alive_children=alive_children,
+            family=family,
+            spouse=bool(spouse_var.get()),
+            # флажки: родители/бабушки-дедушки считаются парой
+            parents=2 if parents_var.get() else 0,
+            grandparents=4 if grandparents_var.get() else 0,
+            has_will=bool(will_var.get()),
+        )
+        dist = distribute(facts)
     except ValueError:
         messagebox.showerror("Ошибка", "Проверьте все поля!")
+        return
+
+    # ==================================================
+    # ✅ ВЫВОД
+    # ==================================================
+    output = "\n====== ИТОГ ======\n"
+    output += f"Наследство: {dist.estate:,.0f} NOK\n\n"
+
+    for share in dist.shares:
+        output += f"{share.label}: {share.per_person:,.0f} NOK\n"
+    for name, amount in dist.heirs.items():
+        if name.startswith("Внук"):
+            output += f"{name}: {amount:,.0f} NOK\n"
+    if dist.by_will:
+        output += f"По завещанию: {dist.by_will:,.0f} NOK\n"
+    if dist.unclaimed:
+        output += f"Без наследников: {dist.unclaimed:,.0f} NOK\n"
+
+    output += "\n-------------------\n"
+    output += dist.info + "\n\n"
+    output += "📚 ПРИМЕНЁННЫЕ СТАТЬИ ЗАКОНА:\n"
+
+    for law in dist.laws_used:
+        output += f"• {law}\n"
+
+    label_result.config(text=output)
 
 # ================= GUI =================
 root = tk.Tk()
@@ -129,7 +65,7 @@ entry_estate.pack()
 
 tk.Label(root, text="Размер G (например 130000):").pack()
 entry_G = tk.Entry(root)
-entry_G.insert(0, "130000")
+entry_G.insert(0, f"{DEFAULT_G:.0f}")
 entry_G.pack()
 
 tk.Label(root, text="Живые дети:").pack()
@@ -137,14 +73,8 @@ entry_alive_children = tk.Entry(root)
 entry_alive_children.insert(0, "0")
 entry_alive_children.pack()
 
-tk.Label(root, text="Умершие дети:").pack()
-entry_dead_children = tk.Entry(root)
-entry_dead_children.insert(0, "0")
-entry_dead_children.pack()
-
-tk.Label(root, text="Внуки (от умерших детей):").pack()
+tk.Label(root, text="Внуки от умерших детей — по каждому умершему через запятую (например: 1, 3):").pack()
 entry_grandchildren = tk.Entry(root)
-entry_grandchildren.insert(0, "0")
 entry_grandchildren.pack()
 
 spouse_var = tk.IntVar()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Текст Arveloven (laws/arveloven.txt) в разобранном виде: часть → kapittel → §.
+
+Файл разбирается один раз, результат вместе с обратным индексом
+сохраняется в бинарный кэш рядом с текстом (laws/arveloven.pickle) и
+дальше загружается за миллисекунды. Кэш пересобирается сам, когда меняется
+исходный файл.
+
+Из кода: `section("8")`, `search("pliktdel")`, `search('"sitte i uskifte"')`,
+`cited(LAW_SPOUSE_WITH_CHILDREN)`. Из консоли: `python arveloven.py 8 50`,
+`python arveloven.py --search uskifte`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import math
+import os
+import pickle
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "laws", "arveloven.txt")
+
+# Меняется при любом изменении формата кэша: старый файл просто пересоберётся
+CACHE_VERSION = 1
+
+# BM25; заголовок § считается несколько раз, префиксные совпадения
+# (pliktdel → pliktdelsarven) весят меньше точных
+BM25_K1 = 1.2
+BM25_B = 0.75
+HEADING_WEIGHT = 3
+PREFIX_WEIGHT = 0.5
+MIN_PREFIX = 4
+
+_PART_RE = re.compile(r"^([A-ZÆØÅ]\w+ del)\.\s*(.+)$")
+_CHAPTER_RE = re.compile(r"^Kapittel (\d+)\.\s*(.+)$")
+# «§ 11 om …» и «§ 26, § 29 …» в тексте — не заголовки: после номера сразу точка
+_DIVISION_RE = re.compile(r"^([IVX]+)\.\s*(.+)$")
+_SECTION_RE = re.compile(r"^§ (\d+(?: [a-z])?)\.\s*([A-ZÆØÅ].*)$")
+_NOTE_RE = re.compile(r"^\d\t(.*)$")
+_NUMBER_RE = re.compile(r"^\s*(?:§+\s*)?(\d+)\s*([a-zA-Z])?\s*$")
+_CITATION_RE = re.compile(r"§\s*(\d+)(?:\s+([a-z])\b)?")
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class Part(NamedTuple):
+    title: str  # «Andre del»
+    heading: str  # «Retten til arv»
+
+
+class Chapter(NamedTuple):
+    number: int
+    heading: str
+    part: int  # индекс в Corpus.parts
+
+
+class Section(NamedTuple):
+    number: str  # «8», «88 a»
+    heading: str
+    paragraphs: Tuple[str, ...]
+    notes: Tuple[str, ...]  # «Endret ved lov …»
+    chapter: int  # индекс в Corpus.chapters
+    division: str = ""  # раздел внутри главы: «III. Livsarvingenes pliktdelsarv mv.»
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.paragraphs)
+
+    @property
+    def title(self) -> str:
+        return f"§ {self.number}. {self.heading}"
+
+
+class SearchHit(NamedTuple):
+    section: Section
+    score: float
+    snippet: str
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def normalize_number(number: object) -> str:
+    """'§ 88a', '88 A', 8 → '88 a' / '8' — ключ для поиска по номеру."""
+    match = _NUMBER_RE.match(str(number))
+    if not match:
+        raise ValueError(f"Не похоже на номер параграфа: {number!r}")
+    digits, letter = match.groups()
+    return f"{int(digits)} {letter.lower()}" if letter else str(int(digits))
+
+
+# ================== РАЗБОР ==================
+
+def parse(lines: Iterable[str]) -> Tuple[List[Part], List[Chapter], List[Section]]:
+    """Разбирает текст закона построчно; абзацы разделены пустыми строками."""
+    parts: List[Part] = []
+    chapters: List[Chapter] = []
+    sections: List[Section] = []
+    current: Optional[dict] = None
+    division = ""
+
+    def close() -> None:
+        if current is not None:
+            sections.append(
+                Section(
+                    current["number"],
+                    current["heading"],
+                    tuple(current["paragraphs"]),
+                    tuple(current["notes"]),
+                    current["chapter"],
+                    current["division"],
+                )
+            )
+
+    for lineno, raw in enumerate(lines, 1):
+        line = raw.rstrip("\n").strip("﻿").rstrip()
+        if not line:
+            continue
+        match = _PART_RE.match(line)
+        if match:
+            close()
+            current = None
+            parts.append(Part(*match.groups()))
+            continue
+        match = _CHAPTER_RE.match(line)
+        if match:
+            close()
+            current = None
+            chapters.append(Chapter(int(match.group(1)), match.group(2), max(len(parts) - 1, 0)))
+            division = ""
+            continue
+        match = _DIVISION_RE.match(line)
+        if match:
+            close()
+            current = None
+            division = line
+            continue
+        match = _SECTION_RE.match(line)
+        if match:
+            close()
+            current = {
+                "number": match.group(1),
+                "heading": match.group(2).strip(),
+                "paragraphs": [],
+                "notes": [],
+                "chapter": max(len(chapters) - 1, 0),
+                "division": division,
+            }
+            continue
+        if current is None:
+            raise ValueError(f"Строка {lineno}: текст вне параграфа: {line[:60]!r}")
+        match = _NOTE_RE.match(line)
+        if match:
+            current["notes"].append(match.group(1).strip())
+        else:
+            current["paragraphs"].append(line)
+    close()
+    return parts, chapters, sections
+
+
+# ================== ИНДЕКС ==================
+
+class Corpus:
+    """Разобранный закон с обратным индексом.
+
+    Индекс хранится плоскими массивами, чтобы кэш грузился одним куском:
+    terms[термин] = (lo, hi) — диапазон в post_docs/post_freqs (номер § и
+    взвешенная частота); позиции токенов i-й записи —
+    positions[post_starts[i]:post_starts[i + 1]], заголовок идёт первым.
+    """
+
+    __slots__ = (
+        "parts", "chapters", "sections", "by_number", "terms", "vocabulary",
+        "post_docs", "post_freqs", "post_starts", "positions", "lengths", "avg_length",
+    )
+
+    def __init__(self, parts: List[Part], chapters: List[Chapter], sections: List[Section]) -> None:
+        self.parts = parts
+        self.chapters = chapters
+        self.sections = sections
+        self.by_number = {section.number: i for i, section in enumerate(sections)}
+        collected: Dict[str, List[Tuple[int, int, List[int]]]] = {}
+        lengths = array("l")
+        for doc, section in enumerate(sections):
+            heading = tokenize(section.heading)
+            tokens = heading + tokenize(section.text)
+            lengths.append(len(tokens) + (HEADING_WEIGHT - 1) * len(heading))
+            positions: Dict[str, List[int]] = {}
+            for pos, token in enumerate(tokens):
+                positions.setdefault(token, []).append(pos)
+            for token, where in positions.items():
+                in_heading = bisect_left(where, len(heading))
+                collected.setdefault(token, []).append((doc, len(where) + (HEADING_WEIGHT - 1) * in_heading, where))
+        self.vocabulary = sorted(collected)
+        self.terms = {}
+        self.post_docs, self.post_freqs = array("l"), array("l")
+        self.post_starts, self.positions = array("l", [0]), array("l")
+        for term in self.vocabulary:
+            lo = len(self.post_docs)
+            for doc, freq, where in collected[term]:
+                self.post_docs.append(doc)
+                self.post_freqs.append(freq)
+                self.positions.extend(where)
+                self.post_starts.append(len(self.positions))
+            self.terms[term] = (lo, len(self.post_docs))
+        self.lengths = lengths
+        self.avg_length = sum(lengths) / max(len(lengths), 1)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    # ---------- по номеру ----------
+
+    def section(self, number: object) -> Section:
+        key = normalize_number(number)
+        try:
+            return self.sections[self.by_number[key]]
+        except KeyError:
+            raise KeyError(f"В Arveloven нет § {key}") from None
+
+    def chapter(self, number: int) -> Tuple[Chapter, List[Section]]:
+        for index, chapter in enumerate(self.chapters):
+            if chapter.number == number:
+                return chapter, [s for s in self.sections if s.chapter == index]
+        raise KeyError(f"В Arveloven нет kapittel {number}")
+
+    def location(self, section: Section) -> Tuple[Part, Chapter]:
+        chapter = self.chapters[section.chapter]
+        return self.parts[chapter.part], chapter
+
+    def cited(self, citation: str) -> List[Section]:
+        """Параграфы, упомянутые в строке вида «§ 8 Arveloven — …»."""
+        found = []
+        for digits, letter in _CITATION_RE.findall(citation):
+            key = f"{digits} {letter}" if letter else digits
+            if key in self.by_number:
+                found.append(self.sections[self.by_number[key]])
+        return found
+
+    # ---------- полнотекстовый поиск ----------
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Термин и слова, которые с него начинаются (норвежские составные слова)."""
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        matches = [(term, 1.0)] if term in self.terms else []
+        if prefix or len(term) >= MIN_PREFIX:
+            weight = 1.0 if prefix else PREFIX_WEIGHT
+            i = bisect_left(self.vocabulary, term)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+                if self.vocabulary[i] != term:
+                    matches.append((self.vocabulary[i], weight))
+                i += 1
+        return matches
+
+    def _bm25(self, doc: int, freq: float, df: int) -> float:
+        idf = math.log(1.0 + (len(self.sections) - df + 0.5) / (df + 0.5))
+        norm = 1.0 - BM25_B + BM25_B * self.lengths[doc] / self.avg_length
+        return idf * freq * (BM25_K1 + 1.0) / (freq + BM25_K1 * norm)
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for token, weight in self._expand(term):
+            lo, hi = self.terms[token]
+            for i in range(lo, hi):
+                doc = self.post_docs[i]
+                score = weight * self._bm25(doc, self.post_freqs[i], hi - lo)
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def _positions(self, term: str) -> Dict[int, array]:
+        lo, hi = self.terms[term]
+        return {
+            self.post_docs[i]: self.positions[self.post_starts[i]:self.post_starts[i + 1]]
+            for i in range(lo, hi)
+        }
+
+    def _phrase_scores(self, words: Sequence[str]) -> Dict[int, float]:
+        if not words or any(word not in self.terms for word in words):
+            return {}
+        lists = [self._positions(word) for word in words]
+        scores: Dict[int, float] = {}
+        for doc in set(lists[0]).intersection(*lists[1:]):
+            starts = set(lists[0][doc])
+            for offset, positions in enumerate(lists[1:], 1):
+                starts &= {pos - offset for pos in positions[doc]}
+            if starts:
+                scores[doc] = sum(
+                    self._bm25(doc, len(starts), len(positions)) for positions in lists
+                )
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = 10) -> List[SearchHit]:
+        """Параграфы, где есть все слова и фразы запроса («…» — фраза, «слово*» — префикс)."""
+        groups: List[Dict[int, float]] = []
+        highlight: List[str] = []
+        for phrase, word in _QUERY_RE.findall(query):
+            if phrase:
+                words = tokenize(phrase)
+                groups.append(self._phrase_scores(words))
+                highlight.append(" ".join(words))
+            else:
+                for term in tokenize(word) if not word.endswith("*") else [word.lower()]:
+                    groups.append(self._term_scores(term))
+                    highlight.append(term.rstrip("*"))
+        if not groups:
+            return []
+        docs = set(groups[0]).intersection(*groups[1:])
+        ranked = sorted(docs, key=lambda doc: (-sum(g[doc] for g in groups), doc))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            SearchHit(self.sections[doc], sum(g[doc] for g in groups), _snippet(self.sections[doc], highlight))
+            for doc in ranked
+        ]
+
+
+def _snippet(section: Section, terms: Sequence[str], width: int = 160) -> str:
+    pattern = re.compile("|".join(re.escape(t) for t in terms if t), re.IGNORECASE) if terms else None
+    for paragraph in section.paragraphs:
+        match = pattern.search(paragraph) if pattern else None
+        if match:
+            start = max(match.start() - width // 3, 0)
+            text = paragraph[start:start + width]
+            return ("…" if start else "") + text + ("…" if start + width < len(paragraph) else "")
+    first = section.paragraphs[0] if section.paragraphs else ""
+    return first[:width] + ("…" if len(first) > width else "")
+
+
+# ================== КЭШ ==================
+
+def default_cache_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".pickle"
+
+
+def _stamp(path: str) -> Tuple[int, int, int]:
+    info = os.stat(path)
+    return CACHE_VERSION, info.st_size, info.st_mtime_ns
+
+
+def build(path: str = DEFAULT_PATH) -> Corpus:
+    with open(path, encoding="utf-8") as f:
+        return Corpus(*parse(f))
+
+
+def load(path: str = DEFAULT_PATH, cache_path: Optional[str] = None, rebuild: bool = False) -> Corpus:
+    """Корпус из бинарного кэша; при устаревшем или битом кэше — разбор текста и запись кэша."""
+    cache_path = cache_path or default_cache_path(path)
+    stamp = _stamp(path)
+    if not rebuild:
+        try:
+            with open(cache_path, "rb") as f:
+                if pickle.load(f) == stamp:
+                    return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            pass
+    corpus = build(path)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(stamp, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(corpus, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except OSError:
+        # каталог только для чтения — работаем без кэша
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+    return corpus
+
+
+_default: Optional[Corpus] = None
+
+
+def corpus() -> Corpus:
+    """Корпус по умолчанию (laws/arveloven.txt), загружается один раз за процесс."""
+    global _default
+    if _default is None:
+        _default = load()
+    return _default
+
+
+def section(number: object) -> Section:
+    return corpus().section(number)
+
+
+def search(query: str, limit: Optional[int] = 10) -> List[SearchHit]:
+    return corpus().search(query, limit)
+
+
+def cited(citation: str) -> List[Section]:
+    return corpus().cited(citation)
+
+
+# ================== CLI ==================
+
+def format_section(corpus: Corpus, section: Section) -> str:
+    part, chapter = corpus.location(section)
+    path = [f"{part.title}. {part.heading}", f"Kapittel {chapter.number}. {chapter.heading}"]
+    if section.division:
+        path.append(section.division)
+    lines = [" / ".join(path), section.title, ""]
+    lines.extend(paragraph + "\n" for paragraph in section.paragraphs)
+    lines.extend(section.notes)
+    return "\n".join(lines).rstrip()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Поиск по тексту Arveloven (по номеру § или по словам).")
+    parser.add_argument("numbers", nargs="*", metavar="§", help="Номера параграфов: 8, '88 a', §50.")
+    parser.add_argument("--search", "-s", metavar="ЗАПРОС", help="Слова и \"фразы\"; слово* — поиск по префиксу.")
+    parser.add_argument("--limit", type=int, default=10, help="Сколько результатов поиска показать (по умолчанию 10).")
+    parser.add_argument("--chapter", type=int, metavar="N", help="Показать заголовки параграфов главы N.")
+    parser.add_argument("--toc", action="store_true", help="Оглавление: части, главы и параграфы.")
+    parser.add_argument("--source", default=DEFAULT_PATH, help="Файл закона (по умолчанию laws/arveloven.txt).")
+    parser.add_argument("--cache", metavar="ФАЙЛ", help="Файл бинарного кэша (по умолчанию рядом с текстом, .pickle).")
+    parser.add_argument("--rebuild", action="store_true", help="Разобрать текст заново и перезаписать кэш.")
+    args = parser.parse_args(argv)
+
+    law = load(args.source, args.cache, rebuild=args.rebuild)
+    status = 0
+
+    if args.toc:
+        for p, part in enumerate(law.parts):
+            print(f"{part.title}. {part.heading}")
+            for c, chapter in enumerate(law.chapters):
+                if chapter.part == p:
+                    print(f"  Kapittel {chapter.number}. {chapter.heading}")
+                    division = ""
+                    for s in law.sections:
+                        if s.chapter == c:
+                            if s.division != division:
+                                division = s.division
+                                print(f"    {division}")
+                            print(f"    {'  ' if division else ''}{s.title}")
+
+    if args.chapter is not None:
+        try:
+            chapter, members = law.chapter(args.chapter)
+        except KeyError as e:
+            print(e.args[0], file=sys.stderr)
+            status = 1
+        else:
+            print(f"Kapittel {chapter.number}. {chapter.heading}")
+            for s in members:
+                print(f"  {s.title}")
+
+    for number in args.numbers:
+        try:
+            print(format_section(law, law.section(number)))
+        except (KeyError, ValueError) as e:
+            print(e.args[0], file=sys.stderr)
+            status = 1
+            continue
+        print()
+
+    if args.search:
+        hits = law.search(args.search, args.limit)
+        if not hits:
+            print("Ничего не найдено.")
+        for hit in hits:
+            print(f"{hit.section.title}  [{hit.score:.2f}]")
+            print(f"    {hit.snippet}")
+
+    if not (args.toc or args.chapter is not None or args.numbers or args.search):
+        parser.print_help()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
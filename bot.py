@@ -1,95 +1,332 @@
-<<<<<<< HEAD
-import discord
-from google import genai
-=======
+import asyncio
+import contextlib
 import os
-import discord
-import google.generativeai as genai
+import time
+from collections import OrderedDict, deque
 
 # ================= НАСТРОЙКИ =================
->>>>>>> 
 
 DISCORD_TOKEN = ""
 GEMINI_API_KEY = ""
 
-<<<<<<< HEAD
-# Настраиваем новый клиент Gemini
-client_ai = genai.Client(api_key=GEMINI_API_KEY)
+# Модель можно сменить без правки кода: GEMINI_MODEL=gemini-1.5-pro-latest
+MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash-latest")
+# "grpc" держит одно долгоживущее соединение на процесс; "rest" — HTTP
+GEMINI_TRANSPORT = os.environ.get("GEMINI_TRANSPORT", "grpc")
 
-intents = discord.Intents.default()
-intents.message_content = True
+GENERATION_CONFIG = {"temperature": 0.8, "max_output_tokens": 512}
 
-discord_client = discord.Client(intents=intents)
+# Одновременных запросов к Gemini; остальные ждут своей очереди
+MAX_CONCURRENT_REQUESTS = 8
+# Секунд на один ответ (включая ожидание очереди), потом запрос отменяется
+REQUEST_TIMEOUT = 60
 
-=======
-MODEL_NAME = "gemini-1.5-flash-latest"
+# Ответ показывается по мере генерации: сообщение правится не чаще раза
+# в STREAM_EDIT_INTERVAL секунд (лимиты Discord), длинный ответ делится
+# на несколько сообщений по DISCORD_MESSAGE_LIMIT символов
+STREAM_EDIT_INTERVAL = 1.0
+DISCORD_MESSAGE_LIMIT = 1900
+
+# Память бота: история одного пользователя ограничена по токенам (личность
+# не считается и не вытесняется), неактивные дольше HISTORY_TTL секунд
+# забываются, всего в памяти не больше MAX_USERS и MAX_TOTAL_TOKENS
+HISTORY_TOKEN_BUDGET = 2000
+HISTORY_TTL = 6 * 60 * 60
+MAX_USERS = 5000
+MAX_TOTAL_TOKENS = 2_000_000
 
 
 # =============================================
 
-genai.configure(api_key=GEMINI_API_KEY)
+DEFAULT_SYSTEM_PROMPT = "Ты дружелюбный и полезный ассистент."
 
-intents = discord.Intents.default()
-intents.message_content = True
-discord_client = discord.Client(intents=intents)
+# google.generativeai и discord тяжёлые: импортируются только когда нужны
+_genai = None
+_model = None
+_generation_slots = None
+_generation_pool = None
 
-# История сообщений для каждого пользователя
-user_history = {}
-user_personas = {}
 
-DEFAULT_SYSTEM_PROMPT = "Ты дружелюбный и полезный ассистент."
-MAX_HISTORY = 10
+# ================== ФУНКЦИИ ==================
 
+def get_genai():
+    """Ленивый импорт и настройка Gemini SDK (один раз за процесс)."""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=GEMINI_API_KEY, transport=GEMINI_TRANSPORT)
+        _genai = genai
+    return _genai
 
-# ================== ФУНКЦИИ ==================
 
-def build_prompt(history):
+def get_model():
     """
-    Конвертация истории сообщений в один текстовый prompt.
-    Gemini принимает обычный текст, а не список {"role": "..."}.
+    Одна модель на процесс: SDK держит внутри неё клиент с открытым
+    соединением, поэтому TLS-рукопожатие и сборка объектов не
+    повторяются на каждое сообщение.
     """
-    final = ""
-    for msg in history:
-        if msg["role"] == "system":
-            final += f"System: {msg['content']}\n"
-        elif msg["role"] == "user":
-            final += f"User: {msg['content']}\n"
-        elif msg["role"] == "assistant":
-            final += f"Assistant: {msg['content']}\n"
-    final += "Assistant:"
-    return final
+    global _model
+    if _model is None:
+        _model = get_genai().GenerativeModel(MODEL_NAME, generation_config=GENERATION_CONFIG)
+    return _model
 
 
-# ================== ЛОГИКА БОТА ==================
+async def warm_up():
+    """Открывает соединение с Gemini заранее (в on_ready), чтобы первый !ai не платил за него."""
+    started = time.perf_counter()
+    try:
+        model = get_model()
+        if hasattr(model, "count_tokens_async"):
+            await asyncio.wait_for(model.count_tokens_async("ping"), timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        print("🔥 WARM-UP ERROR:", e)
+        return
+    print(f"Gemini {MODEL_NAME} готов за {time.perf_counter() - started:.2f} с")
 
->>>>>>> 
-@discord_client.event
-async def on_ready():
-    print(f"Бот {discord_client.user} запущен!")
 
-<<<<<<< HEAD
-=======
+# Замер накладных расходов: подготовка (модель, prompt), первый кусок и весь ответ Gemini
+call_stats = {"calls": 0, "prepare_seconds": 0.0, "first_chunk_seconds": 0.0, "generate_seconds": 0.0}
 
->>>>>>> 
-@discord_client.event
-async def on_message(message):
-    if message.author == discord_client.user:
-        return
-<<<<<<< HEAD
-    
-    if message.content.startswith("!gem"):
-        prompt = message.content[5:]
-
-        try:
-            response = client_ai.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=prompt
+
+def format_stats():
+    calls = call_stats["calls"]
+    if not calls:
+        return "Запросов к Gemini ещё не было."
+    prepare = call_stats["prepare_seconds"] / calls * 1000
+    first_chunk = call_stats["first_chunk_seconds"] / calls * 1000
+    generate_ = call_stats["generate_seconds"] / calls * 1000
+    return (
+        f"Модель: `{MODEL_NAME}`, запросов: {calls}\n"
+        f"Подготовка: {prepare:.2f} мс/запрос, первый кусок ответа: {first_chunk:.0f} мс, "
+        f"весь ответ Gemini: {generate_:.0f} мс/запрос"
+    )
+
+
+ROLE_PREFIXES = {"system": "System", "user": "User", "assistant": "Assistant"}
+
+
+def estimate_tokens(text):
+    """Грубая оценка без токенизатора: ~4 символа на токен."""
+    return len(text) // 4 + 1
+
+
+class Conversation:
+    __slots__ = ("persona", "lines", "tokens", "last_seen")
+
+    def __init__(self, persona):
+        self.persona = persona
+        self.lines = deque()  # (строка prompt, токены)
+        self.tokens = 0
+        self.last_seen = time.monotonic()
+
+
+class ConversationStore:
+    """
+    История диалогов всех пользователей с ограничением памяти.
+
+    Каждое сообщение один раз превращается в строку prompt («User: …») и
+    хранится вместе с оценкой токенов; prompt собирается одним join.
+    Старые сообщения вытесняются по бюджету токенов, личность закреплена.
+    Пользователи лежат в порядке последнего обращения (LRU): из начала
+    удаляются устаревшие по TTL и лишние сверх общих лимитов.
+    """
+
+    def __init__(self, token_budget=HISTORY_TOKEN_BUDGET, ttl=HISTORY_TTL,
+                 max_users=MAX_USERS, max_total_tokens=MAX_TOTAL_TOKENS):
+        self.token_budget = token_budget
+        self.ttl = ttl
+        self.max_users = max_users
+        self.max_total_tokens = max_total_tokens
+        self.total_tokens = 0
+        self._users = OrderedDict()
+
+    def __len__(self):
+        return len(self._users)
+
+    def _touch(self, user_id):
+        self._expire()
+        conversation = self._users.get(user_id)
+        if conversation is None:
+            conversation = self._users[user_id] = Conversation(DEFAULT_SYSTEM_PROMPT)
+            self.total_tokens += estimate_tokens(conversation.persona)
+        else:
+            self._users.move_to_end(user_id)
+        conversation.last_seen = time.monotonic()
+        return conversation
+
+    def _drop(self, user_id):
+        conversation = self._users.pop(user_id, None)
+        if conversation is not None:
+            self.total_tokens -= conversation.tokens + estimate_tokens(conversation.persona)
+
+    def _expire(self):
+        deadline = time.monotonic() - self.ttl
+        while self._users:
+            user_id, oldest = next(iter(self._users.items()))
+            if oldest.last_seen >= deadline:
+                break
+            self._drop(user_id)
+
+    def _enforce_limits(self, keep):
+        while len(self._users) > 1 and (
+            len(self._users) > self.max_users or self.total_tokens > self.max_total_tokens
+        ):
+            user_id = next(iter(self._users))
+            if user_id == keep:
+                break
+            self._drop(user_id)
+
+    def set_persona(self, user_id, persona):
+        conversation = self._touch(user_id)
+        self.total_tokens += estimate_tokens(persona) - estimate_tokens(conversation.persona)
+        conversation.persona = persona
+        self._enforce_limits(user_id)
+
+    def add(self, user_id, role, content):
+        conversation = self._touch(user_id)
+        line = f"{ROLE_PREFIXES[role]}: {content}\n"
+        tokens = estimate_tokens(line)
+        conversation.lines.append((line, tokens))
+        conversation.tokens += tokens
+        self.total_tokens += tokens
+        # Последнее сообщение остаётся, даже если одно не влезает в бюджет
+        while conversation.tokens > self.token_budget and len(conversation.lines) > 1:
+            _, dropped = conversation.lines.popleft()
+            conversation.tokens -= dropped
+            self.total_tokens -= dropped
+        self._enforce_limits(user_id)
+
+    def reset(self, user_id):
+        self._drop(user_id)
+
+    def prompt(self, user_id):
+        """
+        Prompt одним текстом: Gemini принимает обычный текст,
+        а не список {"role": "..."}.
+        """
+        conversation = self._touch(user_id)
+        return "".join((f"System: {conversation.persona}\n", *(line for line, _ in conversation.lines), "Assistant:"))
+
+
+# История сообщений и личности всех пользователей
+conversations = ConversationStore()
+
+
+async def generate_stream(model, prompt):
+    """
+    Потоковый ответ Gemini кусками текста, не блокирующий event loop.
+    Не больше MAX_CONCURRENT_REQUESTS одновременно; через REQUEST_TIMEOUT
+    от начала (включая очередь) запрос отменяется с asyncio.TimeoutError.
+    """
+    global _generation_slots
+    if _generation_slots is None:
+        _generation_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + REQUEST_TIMEOUT
+
+    def left():
+        return max(deadline - loop.time(), 0)
+
+    await asyncio.wait_for(_generation_slots.acquire(), left())
+    try:
+        if hasattr(model, "generate_content_async"):
+            response = await asyncio.wait_for(model.generate_content_async(prompt, stream=True), left())
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), left())
+                except StopAsyncIteration:
+                    break
+                yield chunk.text
+        else:
+            # Старый SDK без async API: синхронный вызов в отдельном потоке, ответ целиком.
+            # Поток по таймауту не прервать, но event loop дальше не ждёт.
+            response = await asyncio.wait_for(
+                loop.run_in_executor(_thread_pool(), model.generate_content, prompt), left()
             )
-            await message.reply(response.text)
-        except Exception as e:
-            await message.reply(f"Ошибка: {e}")
+            yield response.text
+    finally:
+        _generation_slots.release()
+
+
+def _thread_pool():
+    global _generation_pool
+    if _generation_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _generation_pool = ThreadPoolExecutor(MAX_CONCURRENT_REQUESTS, thread_name_prefix="gemini")
+    return _generation_pool
 
-=======
+
+def split_message(text, limit=DISCORD_MESSAGE_LIMIT):
+    """
+    Режет текст на куски не длиннее limit: по абзацу, строке или пробелу.
+    Граница куска зависит только от первых limit символов после его начала,
+    поэтому при дописывании текста уже готовые куски не меняются.
+    """
+    pieces = []
+    while len(text) > limit:
+        window = text[:limit + 1]
+        for separator in ("\n\n", "\n", " "):
+            cut = window.rfind(separator, 1)
+            if cut > limit // 2:
+                break
+        else:
+            cut = limit
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip("\n ") if cut < len(text) else ""
+    pieces.append(text)
+    return pieces
+
+
+class StreamingReply:
+    """
+    Ответ, который дописывается по мере генерации: сначала заглушка,
+    потом правки не чаще STREAM_EDIT_INTERVAL; куски сверх лимита Discord
+    уходят отдельными сообщениями.
+    """
+
+    PLACEHOLDER = "✍️ …"
+    CURSOR = " ▌"
+
+    def __init__(self, message):
+        self.message = message
+        self.text = ""
+        self.sent = []  # [(discord-сообщение, показанный текст)]
+        self.last_edit = 0.0
+
+    async def start(self):
+        self.sent.append((await self.message.reply(self.PLACEHOLDER), self.PLACEHOLDER))
+
+    async def write(self, chunk):
+        self.text += chunk
+        if time.monotonic() - self.last_edit >= STREAM_EDIT_INTERVAL:
+            await self.flush(final=False)
+
+    async def flush(self, final=True):
+        pieces = split_message(self.text) if self.text else [self.PLACEHOLDER]
+        if not final and len(pieces[-1]) + len(self.CURSOR) <= DISCORD_MESSAGE_LIMIT:
+            pieces[-1] += self.CURSOR
+        for i, piece in enumerate(pieces):
+            if not piece:
+                continue
+            if i < len(self.sent):
+                sent, shown = self.sent[i]
+                if shown != piece:
+                    await sent.edit(content=piece)
+                    self.sent[i] = (sent, piece)
+            else:
+                self.sent.append((await self.message.channel.send(piece), piece))
+        self.last_edit = time.monotonic()
+
+
+# ================== ЛОГИКА БОТА ==================
+
+async def handle_message(discord_client, message):
+    if message.author == discord_client.user:
+        return
 
     user_id = str(message.author.id)
     content = message.content.strip()
@@ -101,14 +338,19 @@ async def on_message(message):
             "`!ai текст` — спросить ИИ\n"
             "`!persona текст` — задать стиль\n"
             "`!reset` — сбросить историю\n"
+            "`!stats` — время ответов модели\n"
             "`!help` — помощь"
         )
         return
 
+    # ---------- STATS ----------
+    if content.startswith("!stats"):
+        await message.reply(format_stats())
+        return
+
     # ---------- RESET ----------
     if content.startswith("!reset"):
-        user_history.pop(user_id, None)
-        user_personas.pop(user_id, None)
+        conversations.reset(user_id)
         await message.reply("🔄 История и личность сброшены.")
         return
 
@@ -120,7 +362,7 @@ async def on_message(message):
             await message.reply("❗ Использование: `!persona текст личности`")
             return
 
-        user_personas[user_id] = new_persona
+        conversations.set_persona(user_id, new_persona)
         await message.reply(f"Личность обновлена: **{new_persona}**")
         return
 
@@ -133,50 +375,70 @@ async def on_message(message):
         await message.reply("❗ Напиши: `!ai текст`")
         return
 
-    # Создаём историю если нет
-    if user_id not in user_history:
-        persona = user_personas.get(user_id, DEFAULT_SYSTEM_PROMPT)
-        user_history[user_id] = [
-            {"role": "system", "content": persona}
-        ]
-
-    # Добавляем новое сообщение
-    user_history[user_id].append({"role": "user", "content": prompt})
-
-    # Ограничиваем историю
-    if len(user_history[user_id]) > MAX_HISTORY:
-        user_history[user_id] = user_history[user_id][-MAX_HISTORY:]
+    conversations.add(user_id, "user", prompt)
 
     # ---------- GENERATION ----------
+    reply = StreamingReply(message)
     try:
-        full_prompt = build_prompt(user_history[user_id])
+        started = time.perf_counter()
+        model = get_model()
+        full_prompt = conversations.prompt(user_id)
+        prepared = time.perf_counter()
+        await reply.start()
+
+        first_chunk = None
+        # aclosing: при ошибке в Discord слот Gemini освобождается сразу
+        async with contextlib.aclosing(generate_stream(model, full_prompt)) as chunks:
+            async for chunk in chunks:
+                if first_chunk is None:
+                    first_chunk = time.perf_counter()
+                await reply.write(chunk)
+
+        call_stats["calls"] += 1
+        call_stats["prepare_seconds"] += prepared - started
+        call_stats["first_chunk_seconds"] += (first_chunk or time.perf_counter()) - prepared
+        call_stats["generate_seconds"] += time.perf_counter() - prepared
 
-        model = genai.GenerativeModel("gemini-1.5-flash-latest")
+        # Добавляем ответ в историю
+        conversations.add(user_id, "assistant", reply.text)
 
+    except asyncio.TimeoutError:
+        print(f"⌛ TIMEOUT: {user_id} ждал дольше {REQUEST_TIMEOUT} с")
+        reply.text = f"{reply.text.rstrip()}\n\n⌛ Gemini не ответил за {REQUEST_TIMEOUT} с, попробуй ещё раз."
 
-        response = model.generate_content(
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.8,
-                max_output_tokens=512
-            )
-        )
+    except Exception as e:
+        print("🔥 ERROR:", e)
+        reply.text = f"{reply.text.rstrip()}\n\n⚠️ Ошибка модели Gemini."
 
-        answer = response.text
+    reply.text = reply.text.strip() or "⚠️ Gemini вернул пустой ответ."
+    if reply.sent:
+        await reply.flush()
+    else:
+        await message.reply(reply.text)
 
-        # Добавляем ответ в историю
-        user_history[user_id].append({"role": "assistant", "content": answer})
 
-    except Exception as e:
-        print("🔥 ERROR:", e)
-        answer = "⚠️ Ошибка модели Gemini."
+def create_client():
+    """Создаёт Discord-клиент; discord импортируется только здесь."""
+    import discord
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    discord_client = discord.Client(intents=intents)
+
+    @discord_client.event
+    async def on_ready():
+        print(f"Бот {discord_client.user} запущен!")
+        # on_ready повторяется при переподключениях; модель создаётся один раз
+        if _model is None:
+            await warm_up()
 
-    if len(answer) > 1900:
-        answer = answer[:1900] + "…"
+    @discord_client.event
+    async def on_message(message):
+        await handle_message(discord_client, message)
 
-    await message.reply(answer)
+    return discord_client
 
 
 # Запуск
->>>>>>> 
-discord_client.run(DISCORD_TOKEN)
+if __name__ == "__main__":
+    create_client().run(DISCORD_TOKEN)
@@ -2,9 +2,41 @@
 """
 Простой CLI-калькулятор.
 Запуск: py -3 calculator.py
+
+Кроме `a op b` понимает полноценные выражения: скобки, унарный минус,
+переменные и функции (`2 * (x + 1) ** 2 - sqrt(y)`). Выражение один раз
+компилируется в замыкания (`compile_expression`) и затем быстро
+вычисляется для любых значений переменных.
+
+Пакетные режимы:
+  py -3 calculator.py --file formulas.txt        # по выражению в строке
+  py -3 calculator.py --expr "a * b" --table data.csv > out.csv
+  py -3 calculator.py --expr "a / b" --table data.csv --vector --output r.npy
 """
 
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import math
 import operator
+import sys
+from functools import lru_cache, reduce
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 
 OPS = {
@@ -16,31 +48,711 @@ OPS = {
 }
 
 
+def _round(value: float, ndigits: Optional[float] = None) -> float:
+    """round() для чисел из выражения: все литералы — float, а ndigits нужен int."""
+    if ndigits is None:
+        return round(value)
+    return round(value, int(ndigits))
+
+
+# имя -> (функция, минимум аргументов, максимум аргументов; None — сколько угодно)
+FUNCTIONS: Dict[str, Tuple[Callable[..., float], int, Optional[int]]] = {
+    "abs": (abs, 1, 1),
+    "sqrt": (math.sqrt, 1, 1),
+    "exp": (math.exp, 1, 1),
+    "log": (math.log, 1, 2),
+    "ln": (math.log, 1, 1),
+    "log10": (math.log10, 1, 1),
+    "sin": (math.sin, 1, 1),
+    "cos": (math.cos, 1, 1),
+    "tan": (math.tan, 1, 1),
+    "floor": (math.floor, 1, 1),
+    "ceil": (math.ceil, 1, 1),
+    "round": (_round, 1, 2),
+    "min": (min, 1, None),
+    "max": (max, 1, None),
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+# бинарные операции по уровням приоритета (** обрабатывается отдельно:
+# правоассоциативна и сильнее унарного минуса слева, как в Python)
+_LEVELS = (("+", "-"), ("*", "/"))
+
+
+class ExpressionError(ValueError):
+    """Синтаксическая ошибка или неизвестное имя в выражении."""
+
+
 def calculate(a: float, op: str, b: float) -> float:
     if op not in OPS:
         raise ValueError(f"Неподдерживаемая операция: {op}")
     return OPS[op](a, b)
 
 
-def main() -> None:
+# ================== РАЗБОР ==================
+
+class Token(NamedTuple):
+    kind: str  # "num", "name", "op", "(", ")", ","
+    text: str
+    pos: int
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens: List[Token] = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+        elif ch.isdigit() or (ch == "." and i + 1 < n and text[i + 1].isdigit()):
+            start = i
+            while i < n and (text[i].isdigit() or text[i] == "."):
+                i += 1
+            if i < n and text[i] in "eE":
+                j = i + 1
+                if j < n and text[j] in "+-":
+                    j += 1
+                if j < n and text[j].isdigit():
+                    i = j
+                    while i < n and text[i].isdigit():
+                        i += 1
+            tokens.append(Token("num", text[start:i], start))
+        elif ch.isalpha() or ch == "_":
+            start = i
+            while i < n and (text[i].isalnum() or text[i] == "_"):
+                i += 1
+            tokens.append(Token("name", text[start:i], start))
+        elif text.startswith("**", i):
+            tokens.append(Token("op", "**", i))
+            i += 2
+        elif ch == "^":
+            tokens.append(Token("op", "**", i))
+            i += 1
+        elif ch in "+-*/":
+            tokens.append(Token("op", ch, i))
+            i += 1
+        elif ch in "(),":
+            tokens.append(Token(ch, ch, i))
+            i += 1
+        else:
+            raise ExpressionError(f"Неожиданный символ {ch!r} в позиции {i + 1}")
+    return tokens
+
+
+# Узлы дерева — кортежи: ("num", value), ("var", name), ("neg", node),
+# ("bin", op, left, right), ("call", name, args)
+Node = tuple
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _take(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("Неожиданный конец выражения")
+        self.index += 1
+        return token
+
+    def _expect(self, kind: str) -> Token:
+        token = self._take()
+        if token.kind != kind:
+            raise ExpressionError(f"Ожидалось {kind!r}, получено {token.text!r} в позиции {token.pos + 1}")
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ExpressionError("Пустое выражение")
+        node = self._binary(0)
+        token = self._peek()
+        if token is not None:
+            raise ExpressionError(f"Лишний фрагмент {token.text!r} в позиции {token.pos + 1}")
+        return node
+
+    def _binary(self, level: int) -> Node:
+        if level == len(_LEVELS):
+            return self._unary()
+        node = self._binary(level + 1)
+        while True:
+            token = self._peek()
+            if token is None or token.kind != "op" or token.text not in _LEVELS[level]:
+                return node
+            self.index += 1
+            node = ("bin", token.text, node, self._binary(level + 1))
+
+    def _unary(self) -> Node:
+        token = self._peek()
+        if token is not None and token.kind == "op" and token.text in "+-":
+            self.index += 1
+            operand = self._unary()
+            return ("neg", operand) if token.text == "-" else operand
+        return self._power()
+
+    def _power(self) -> Node:
+        base = self._atom()
+        token = self._peek()
+        if token is not None and token.kind == "op" and token.text == "**":
+            self.index += 1
+            return ("bin", "**", base, self._unary())
+        return base
+
+    def _atom(self) -> Node:
+        token = self._take()
+        if token.kind == "num":
+            try:
+                return ("num", float(token.text))
+            except ValueError:
+                raise ExpressionError(f"Некорректное число {token.text!r} в позиции {token.pos + 1}") from None
+        if token.kind == "(":
+            node = self._binary(0)
+            self._expect(")")
+            return node
+        if token.kind == "name":
+            nxt = self._peek()
+            if nxt is not None and nxt.kind == "(":
+                return self._call(token)
+            return ("var", token.text)
+        raise ExpressionError(f"Неожиданный {token.text!r} в позиции {token.pos + 1}")
+
+    def _call(self, name: Token) -> Node:
+        if name.text not in FUNCTIONS:
+            raise ExpressionError(f"Неизвестная функция {name.text!r}")
+        self._expect("(")
+        args: List[Node] = []
+        token = self._peek()
+        if token is not None and token.kind == ")":
+            self.index += 1
+        else:
+            while True:
+                args.append(self._binary(0))
+                token = self._take()
+                if token.kind == ")":
+                    break
+                if token.kind != ",":
+                    raise ExpressionError(f"Ожидалась ',' или ')' в позиции {token.pos + 1}")
+        _, low, high = FUNCTIONS[name.text]
+        if len(args) < low or (high is not None and len(args) > high):
+            raise ExpressionError(f"Функция {name.text}: неверное число аргументов ({len(args)})")
+        return ("call", name.text, tuple(args))
+
+
+def parse(text: str) -> Node:
+    """Разобрать выражение в дерево (кортежи, см. Node)."""
+    return _Parser(text).parse()
+
+
+# ================== КОМПИЛЯЦИЯ ==================
+
+Evaluator = Callable[[Mapping[str, float]], float]
+
+
+def _compile_node(node: Node, variables: set) -> Tuple[Evaluator, Optional[float]]:
+    """Вернуть (замыкание, константа или None); константы сворачиваются заранее."""
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return (lambda env: value), value
+    if kind == "var":
+        name = node[1]
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return (lambda env: value), value
+        variables.add(name)
+        return (lambda env: env[name]), None
+    if kind == "neg":
+        operand, const = _compile_node(node[1], variables)
+        if const is not None:
+            value = -const
+            return (lambda env: value), value
+        return (lambda env: -operand(env)), None
+    if kind == "bin":
+        func = OPS[node[1]]
+        left, left_const = _compile_node(node[2], variables)
+        right, right_const = _compile_node(node[3], variables)
+        if left_const is not None and right_const is not None:
+            try:
+                value = func(left_const, right_const)
+            except (ArithmeticError, ValueError):
+                pass  # ошибку покажем при вычислении, а не при компиляции
+            else:
+                return (lambda env: value), value
+        if left_const is not None:
+            return (lambda env: func(left_const, right(env))), None
+        if right_const is not None:
+            return (lambda env: func(left(env), right_const)), None
+        return (lambda env: func(left(env), right(env))), None
+    # call
+    func = FUNCTIONS[node[1]][0]
+    compiled = [_compile_node(arg, variables)[0] for arg in node[2]]
+    if len(compiled) == 1:
+        (arg,) = compiled
+        return (lambda env: func(arg(env))), None
+    return (lambda env: func(*[arg(env) for arg in compiled])), None
+
+
+class CompiledExpression:
+    """Выражение, один раз скомпилированное в дерево замыканий."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tree = parse(source)
+        names: set = set()
+        self._evaluate, self.constant = _compile_node(self.tree, names)
+        self.variables = frozenset(names)
+
+    def evaluate(self, env: Optional[Mapping[str, float]] = None) -> float:
+        try:
+            return self._evaluate(env or {})
+        except KeyError as exc:
+            raise ExpressionError(f"Не задано значение переменной {exc.args[0]!r}") from None
+
+    def __call__(self, **env: float) -> float:
+        return self.evaluate(env)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """Скомпилировать выражение (с кэшем по тексту)."""
+    return CompiledExpression(source)
+
+
+def evaluate(source: str, env: Optional[Mapping[str, float]] = None) -> float:
+    return compile_expression(source).evaluate(env)
+
+
+def describe_error(exc: Exception) -> str:
+    """Сообщение об ошибке вычисления по-русски."""
+    if isinstance(exc, ZeroDivisionError):
+        return "деление на ноль"
+    if isinstance(exc, OverflowError):
+        return "переполнение"
+    if isinstance(exc, ExpressionError):
+        return str(exc)
+    if isinstance(exc, (ValueError, TypeError)):
+        return f"недопустимый аргумент ({exc})"
+    return str(exc)
+
+
+# ================== ПОТОКОВЫЕ РЕЖИМЫ ==================
+
+def _split_assignment(line: str) -> Tuple[Optional[str], str]:
+    """`имя = выражение` -> (имя, выражение); иначе (None, строка)."""
+    name, sep, rest = line.partition("=")
+    name = name.strip()
+    if sep and name.isidentifier() and name not in CONSTANTS and name not in FUNCTIONS:
+        return name, rest.strip()
+    return None, line
+
+
+def evaluate_lines(lines: Iterable[str], env: Optional[Dict[str, float]] = None) -> Iterator[Tuple[str, Optional[float], Optional[str]]]:
+    """
+    Вычислить выражения построчно: (строка, результат, ошибка).
+
+    Пустые строки и комментарии (#) пропускаются; `имя = выражение`
+    сохраняет результат как переменную для следующих строк.
+    """
+    env = {} if env is None else env
+    for raw in lines:
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        name, source = _split_assignment(line)
+        try:
+            value = compile_expression(source).evaluate(env)
+        except (ArithmeticError, ValueError, TypeError) as exc:
+            yield line, None, describe_error(exc)
+            continue
+        if name is not None:
+            env[name] = value
+        yield line, value, None
+
+
+def evaluate_table(
+    expression: CompiledExpression,
+    rows: TextIO,
+    out: TextIO,
+    column: str = "result",
+    delimiter: str = ",",
+    env: Optional[Mapping[str, float]] = None,
+) -> Tuple[int, int]:
+    """
+    Вычислить expression для каждой строки CSV (переменные — по заголовку,
+    недостающие берутся из env; значение из строки важнее) и дописать
+    столбец column. Возвращает (строк, ошибок).
+    """
+    env = dict(env or {})
+    reader = csv.reader(rows, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return 0, 0
+    missing = expression.variables - set(header) - set(env)
+    if missing:
+        raise ExpressionError(f"В таблице нет столбцов: {', '.join(sorted(missing))}")
+    # берём только нужные столбцы, по индексам
+    used = [(name, header.index(name)) for name in sorted(expression.variables & set(header))]
+    writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(header + [column])
+    evaluate_env = expression._evaluate
+    count = errors = 0
+    for row in reader:
+        if not row:
+            continue
+        count += 1
+        try:
+            bindings = dict(env)
+            bindings.update((name, float(row[index])) for name, index in used)
+            result = repr(evaluate_env(bindings))
+        except (ArithmeticError, ValueError, TypeError, IndexError) as exc:
+            errors += 1
+            result = f"ошибка: {describe_error(exc)}"
+        writer.writerow(row + [result])
+    return count, errors
+
+
+# ================== ВЕКТОРНЫЙ РЕЖИМ ==================
+
+# OPS и FUNCTIONS -> имена ufunc NumPy
+VECTOR_OPS = {"+": "add", "-": "subtract", "*": "multiply", "/": "true_divide", "**": "power"}
+VECTOR_FUNCTIONS = {
+    "abs": "absolute",
+    "sqrt": "sqrt",
+    "exp": "exp",
+    "ln": "log",
+    "log10": "log10",
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "floor": "floor",
+    "ceil": "ceil",
+}
+VECTOR_CHUNK_ROWS = 1 << 18
+
+
+def _require_numpy() -> Any:
+    """NumPy нужен только векторному режиму."""
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError("Для векторного режима нужен NumPy: pip install numpy") from exc
+    return np
+
+
+VectorEvaluator = Callable[[Mapping[str, Any]], Any]
+
+
+def _compile_vector(node: Node, np: Any) -> VectorEvaluator:
+    """То же дерево, что и у compile_expression, но на ufunc-ах NumPy."""
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return lambda env: value
+    if kind == "var":
+        name = node[1]
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env: value
+        return lambda env: env[name]
+    if kind == "neg":
+        operand = _compile_vector(node[1], np)
+        return lambda env: np.negative(operand(env))
+    if kind == "bin":
+        ufunc = getattr(np, VECTOR_OPS[node[1]])
+        left = _compile_vector(node[2], np)
+        right = _compile_vector(node[3], np)
+        return lambda env: ufunc(left(env), right(env))
+    name = node[1]
+    args = [_compile_vector(arg, np) for arg in node[2]]
+    if name in VECTOR_FUNCTIONS:
+        ufunc = getattr(np, VECTOR_FUNCTIONS[name])
+        return lambda env: ufunc(args[0](env))
+    if name == "log":
+        if len(args) == 1:
+            return lambda env: np.log(args[0](env))
+        return lambda env: np.log(args[0](env)) / np.log(args[1](env))
+    if name in ("min", "max"):
+        ufunc = np.minimum if name == "min" else np.maximum
+        return lambda env: reduce(ufunc, [arg(env) for arg in args])
+    if name == "round":
+        digits = _constant_digits(node[2][1]) if len(args) == 2 else 0
+        return lambda env: np.round(args[0](env), digits)
+    raise ExpressionError(f"Функция {name} не поддерживается в векторном режиме")
+
+
+def _constant_digits(node: Node) -> int:
+    _, const = _compile_node(node, set())
+    if const is None:
+        raise ExpressionError("round(x, n): в векторном режиме n должно быть константой")
+    return int(const)
+
+
+def evaluate_columns(
+    expression: CompiledExpression,
+    columns: Mapping[str, Any],
+    rows: Optional[int] = None,
+    env: Optional[Mapping[str, float]] = None,
+) -> Any:
+    """
+    Вычислить выражение над столбцами (массивы одинаковой длины).
+    Переменные, которых нет среди столбцов, берутся из env как константы.
+    Результат без столбцов (константа) растягивается до rows строк.
+
+    Деление на ноль, переполнение и недопустимые аргументы не бросают
+    исключений: такие элементы возвращаются замаскированными
+    (numpy.ma.MaskedArray).
+    """
+    np = _require_numpy()
+    env = env or {}
+    missing = expression.variables - set(columns) - set(env)
+    if missing:
+        raise ExpressionError(f"Нет столбцов: {', '.join(sorted(missing))}")
+    used = {name: np.asarray(columns[name], dtype=float) for name in expression.variables & set(columns)}
+    lengths = {values.shape for values in used.values()}
+    if len(lengths) > 1:
+        raise ExpressionError("Столбцы разной длины")
+    # столбец важнее константы с тем же именем
+    bindings = {name: float(env[name]) for name in expression.variables - set(used)}
+    bindings.update(used)
+    evaluator = _compile_vector(expression.tree, np)
+    with np.errstate(all="ignore"):
+        result = np.asarray(evaluator(bindings), dtype=float)
+    if result.ndim == 0:
+        shape = next(iter(lengths)) if lengths else rows
+        if shape is not None:
+            result = np.full(shape, float(result))
+    return np.ma.masked_invalid(result)
+
+
+def _read_csv_columns(
+    handle: TextIO, names: Iterable[str], delimiter: str, chunk_rows: int, optional: Iterable[str] = ()
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Читать нужные столбцы CSV блоками по chunk_rows строк: (строк в блоке,
+    столбцы). Имена из optional (заданные через --var) могут отсутствовать.
+    """
+    np = _require_numpy()
+    header = next(csv.reader([handle.readline()], delimiter=delimiter), [])
+    optional = set(optional)
+    names = sorted(name for name in names if name in header or name not in optional)
+    missing = set(names) - set(header)
+    if missing:
+        raise ExpressionError(f"В таблице нет столбцов: {', '.join(sorted(missing))}")
+    indices = [header.index(name) for name in names]
+    while True:
+        chunk = list(itertools.islice(handle, chunk_rows))
+        if not chunk:
+            return
+        # пустые строки не считаются строками таблицы (genfromtxt их пропускает)
+        lines = [line for line in chunk if line.strip()]
+        if not lines:
+            continue
+        if not indices:
+            # выражение без переменных: нужны только размеры блоков
+            yield len(lines), {}
+            continue
+        try:
+            block = np.loadtxt(lines, delimiter=delimiter, usecols=indices, dtype=float, ndmin=2)
+        except ValueError:
+            # пустые или нечисловые ячейки -> NaN (медленнее, но редкость)
+            block = np.genfromtxt(lines, delimiter=delimiter, usecols=indices, dtype=float)
+            block = block.reshape(-1, len(indices))
+        yield len(block), {name: block[:, pos] for pos, name in enumerate(names)}
+
+
+def _open_array(path: str) -> Any:
+    """.npy открывается через mmap, остальное читается как сырые float64."""
+    np = _require_numpy()
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=np.float64, mode="r")
+
+
+def _read_array_columns(arrays: Mapping[str, Any], chunk_rows: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) > 1:
+        raise ExpressionError("Массивы разной длины")
+    total = lengths.pop() if lengths else 0
+    for start in range(0, total, chunk_rows):
+        yield min(chunk_rows, total - start), {name: values[start:start + chunk_rows] for name, values in arrays.items()}
+
+
+def _write_vector_output(chunks: Iterable[Any], out: Optional[str]) -> Tuple[int, int]:
+    """
+    Записать результат потоком: CSV (замаскированные — пустые ячейки),
+    .npy или сырые float64 (замаскированные — NaN). Возвращает (строк, масок).
+    """
+    np = _require_numpy()
+    count = masked = 0
+    # первый блок — до открытия out: ошибка в выражении не оставит пустой файл
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is not None:
+        chunks = itertools.chain([first], chunks)
+    if out is None or out.endswith(".csv"):
+        handle = sys.stdout if out is None else open(out, "w", encoding="utf-8", newline="")
+        try:
+            handle.write("result\n")
+            for chunk in chunks:
+                count += chunk.size
+                masked += int(np.ma.count_masked(chunk))
+                text = [repr(value) if value is not None else "" for value in chunk.tolist()]
+                handle.write("\n".join(text) + "\n")
+        finally:
+            if handle is not sys.stdout:
+                handle.close()
+        return count, masked
+    header = {"descr": np.dtype(float).str, "fortran_order": False, "shape": (0,)}
+    with open(out, "wb") as handle:
+        is_npy = out.endswith(".npy")
+        if is_npy:
+            np.lib.format.write_array_header_1_0(handle, header)
+            data_start = handle.tell()
+        for chunk in chunks:
+            count += chunk.size
+            masked += int(np.ma.count_masked(chunk))
+            np.ascontiguousarray(chunk.filled(np.nan), dtype=float).tofile(handle)
+        if is_npy:
+            # длина заранее неизвестна (CSV) — дописываем её в заголовок
+            handle.seek(0)
+            header["shape"] = (count,)
+            np.lib.format.write_array_header_1_0(handle, header)
+            if handle.tell() != data_start:
+                raise RuntimeError("размер заголовка .npy изменился")
+    return count, masked
+
+
+def evaluate_vector_stream(
+    expression: CompiledExpression,
+    csv_path: Optional[str] = None,
+    arrays: Optional[Mapping[str, str]] = None,
+    out: Optional[str] = None,
+    delimiter: str = ",",
+    chunk_rows: int = VECTOR_CHUNK_ROWS,
+    env: Optional[Mapping[str, float]] = None,
+) -> Tuple[int, int]:
+    """
+    Столбцы из CSV или .npy/.f64 -> блоки -> evaluate_columns -> поток в out;
+    env — константы (--var) для переменных, которых нет среди столбцов.
+    """
+    env = env or {}
+    if arrays:
+        opened = {name: _open_array(path) for name, path in arrays.items()}
+        blocks = _read_array_columns(opened, chunk_rows)
+        return _write_vector_output((evaluate_columns(expression, block, rows, env) for rows, block in blocks), out)
+    handle = _open_input(csv_path or "-")
+    try:
+        blocks = _read_csv_columns(handle, expression.variables, delimiter, chunk_rows, env)
+        return _write_vector_output((evaluate_columns(expression, block, rows, env) for rows, block in blocks), out)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _open_input(path: str) -> TextIO:
+    return sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Калькулятор выражений.")
+    parser.add_argument("expression", nargs="?", help="Выражение, например \"2 * (x + 1)\" (без него — интерактивный ввод).")
+    parser.add_argument("--var", action="append", default=[], metavar="ИМЯ=ЗНАЧЕНИЕ", help="Значение переменной (можно несколько раз).")
+    parser.add_argument("--file", metavar="ФАЙЛ", help="Вычислить все выражения из файла (по одному в строке, '-' — stdin).")
+    parser.add_argument("--table", metavar="CSV", help="Вычислить выражение для каждой строки CSV ('-' — stdin); результат — новый столбец.")
+    parser.add_argument("--expr", help="Выражение для --table (вместо позиционного).")
+    parser.add_argument("--column", default="result", help="Имя столбца с результатом для --table (по умолчанию result).")
+    parser.add_argument("--delimiter", default=",", help="Разделитель CSV (по умолчанию ',').")
+    parser.add_argument("--vector", action="store_true", help="Векторный режим для --table: столбцы блоками через NumPy, на выходе только столбец результата.")
+    parser.add_argument("--array", action="append", default=[], metavar="ИМЯ=ФАЙЛ", help="Столбец из .npy (mmap) или сырого float64; включает векторный режим.")
+    parser.add_argument("--output", metavar="ФАЙЛ", help="Куда писать результат векторного режима: .csv, .npy или сырой float64 (по умолчанию CSV в stdout).")
+    parser.add_argument("--chunk-rows", type=int, default=VECTOR_CHUNK_ROWS, help=f"Размер блока в векторном режиме (по умолчанию {VECTOR_CHUNK_ROWS}).")
+    return parser
+
+
+def _parse_vars(items: Sequence[str]) -> Dict[str, float]:
+    env: Dict[str, float] = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip().isidentifier():
+            raise ExpressionError(f"Ожидалось ИМЯ=ЗНАЧЕНИЕ, получено {item!r}")
+        env[name.strip()] = evaluate(value)
+    return env
+
+
+def _interactive() -> None:
     try:
         raw = input("Введите выражение (пример: 2 + 3 или 2 ** 4): ").strip()
         if not raw:
             print("Пустой ввод. Завершение.")
             return
-        parts = raw.split()
-        if len(parts) != 3:
-            print("Используйте формат: число операция число (пример: 10 / 4)")
-            return
-        a_str, op, b_str = parts
-        a, b = float(a_str), float(b_str)
-        result = calculate(a, op, b)
+        result = evaluate(raw)
         print(f"Результат: {result}")
     except ZeroDivisionError:
         print("Ошибка: деление на ноль.")
-    except ValueError as exc:
-        print(f"Ошибка: {exc}")
+    except (ArithmeticError, ValueError, TypeError) as exc:
+        print(f"Ошибка: {describe_error(exc)}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        env = _parse_vars(args.var)
+        if args.vector or args.array:
+            source = args.expr or args.expression
+            if not source:
+                print("Ошибка: для векторного режима нужно выражение (--expr).", file=sys.stderr)
+                return 2
+            arrays = dict(item.split("=", 1) for item in args.array)
+            count, masked = evaluate_vector_stream(
+                compile_expression(source), args.table, arrays, args.output, args.delimiter, args.chunk_rows, env
+            )
+            print(f"Строк: {count}, замаскировано: {masked}", file=sys.stderr)
+            return 0
+        if args.table:
+            source = args.expr or args.expression
+            if not source:
+                print("Ошибка: для --table нужно выражение (--expr).", file=sys.stderr)
+                return 2
+            expression = compile_expression(source)
+            handle = _open_input(args.table)
+            try:
+                count, errors = evaluate_table(expression, handle, sys.stdout, args.column, args.delimiter, env)
+            finally:
+                if handle is not sys.stdin:
+                    handle.close()
+            print(f"Строк: {count}, ошибок: {errors}", file=sys.stderr)
+            return 1 if errors else 0
+        if args.file:
+            handle = _open_input(args.file)
+            errors = 0
+            try:
+                for line, value, error in evaluate_lines(handle, env):
+                    if error is not None:
+                        errors += 1
+                        print(f"{line}\tошибка: {error}")
+                    else:
+                        print(f"{line}\t{value!r}")
+            finally:
+                if handle is not sys.stdin:
+                    handle.close()
+            return 1 if errors else 0
+        if args.expression:
+            print(evaluate(args.expression, env))
+            return 0
+    except (ArithmeticError, ValueError, TypeError, RuntimeError) as exc:
+        print(f"Ошибка: {describe_error(exc)}", file=sys.stderr)
+        return 1
+    _interactive()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
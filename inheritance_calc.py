@@ -2,8 +2,25 @@
 
 from __future__ import annotations
 
+import argparse
+import csv
+import json
 import sys
 
+from inheritance_engine import (
+    RECORD_FORMATS,
+    EstateFacts,
+    distribute,
+    distribute_many,
+    estate_from_assets,
+    format_distribution,
+    guess_format,
+    parse_sweep_axis,
+    read_records,
+    sweep,
+    write_results,
+)
+
 # Настраиваем кодировку консоли на UTF-8.
 try:
     sys.stdout.reconfigure(encoding="utf-8")
@@ -53,98 +70,141 @@ def ask_int(prompt: str, min_value: int = 0, max_value: int | None = None) -> in
             print("Нужно целое число, попробуйте еще раз.")
 
 
-def main() -> None:
-    if not sys.stdin.isatty():
-        print("Этот скрипт требует интерактивного ввода. Запустите его в обычной консоли.")
-        return
-
-    print("=== Калькулятор наследства ===")
+def ask_facts() -> EstateFacts:
+    """Задать вопросы в консоли и собрать EstateFacts."""
     marital_money = ask_float("Сколько денег было у вас в браке (общие деньги, NOK): ")
     personal_money = ask_float("Сколько у вас было личных денег (NOK): ")
 
     spouse_alive = ask_yes_no("Есть ли живая жена/муж")
+    facts = EstateFacts(
+        estate=estate_from_assets(marital_money, personal_money, spouse_alive),
+        spouse=spouse_alive,
+    )
+
+    facts.alive_children = ask_int("Сколько у вас детей (число): ", min_value=0)
+    if facts.alive_children == 0:
+        facts.parents = ask_int("Сколько у вас живых родителей (0-2): ", min_value=0, max_value=2)
+        if facts.parents == 0:
+            facts.grandparents = ask_int("Сколько у вас живых бабушек/дедушек: ", min_value=0, max_value=4)
+    return facts
+
+
+def _run_json(path: str) -> int:
+    """JSON-объект (или список объектов) EstateFacts -> JSON с распределением."""
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        data = json.load(handle)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    records = data if isinstance(data, list) else [data]
+    results = []
+    failed = 0
+    for record in records:
+        try:
+            results.append(distribute(EstateFacts.from_dict(record)).to_dict())
+        except (TypeError, ValueError) as exc:
+            failed += 1
+            results.append({"error": str(exc)})
+    output = results if isinstance(data, list) else results[0]
+    json.dump(output, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    return 1 if failed else 0
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    """Поток записей (CSV/JSONL) -> поток результатов с laws_used."""
+    in_fmt = args.input_format if args.input_format != "auto" else guess_format(args.batch)
+    out_fmt = args.output_format if args.output_format != "auto" else guess_format(args.output, default=in_fmt)
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8", newline="")
+    target = sys.stdout if not args.output or args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        results = distribute_many(
+            read_records(source, in_fmt), args.workers, args.chunk_size, flat=out_fmt == "csv"
+        )
+        errors = write_results(results, target, out_fmt)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    if errors:
+        print(f"Записей с ошибками: {errors}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _run_sweep(args: argparse.Namespace) -> int:
+    """Сетка сценариев -> CSV-таблица (строка на точку сетки)."""
+    params: dict = {}
+    try:
+        for item in args.set:
+            name, _, value = item.partition("=")
+            axis = parse_sweep_axis(value)
+            params[name.strip()] = axis[0].item() if len(axis) == 1 else axis
+        for item in args.sweep:
+            name, _, spec = item.partition("=")
+            params[name.strip()] = parse_sweep_axis(spec)
+        grid = sweep(**params)
+    except (TypeError, ValueError, RuntimeError) as exc:
+        print(f"Ошибка: {exc}", file=sys.stderr)
+        return 2
+    target = sys.stdout if not args.output or args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        writer = csv.DictWriter(target, fieldnames=grid.columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(grid.rows())
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Калькулятор распределения наследства (Arveloven).")
+    parser.add_argument(
+        "--json",
+        metavar="ФАЙЛ",
+        help="Без вопросов: взять данные из JSON ('-' — stdin), объект или список объектов EstateFacts.",
+    )
+    parser.add_argument("--batch", metavar="ФАЙЛ", help="Пакетный режим: записи из CSV или JSONL ('-' — stdin).")
+    parser.add_argument("--input-format", choices=("auto",) + RECORD_FORMATS, default="auto")
+    parser.add_argument("--output", metavar="ФАЙЛ", help="Куда писать результаты пакетного режима (по умолчанию stdout).")
+    parser.add_argument("--output-format", choices=("auto",) + RECORD_FORMATS, default="auto")
+    parser.add_argument("--workers", type=int, help="Число процессов (по умолчанию — по числу ядер).")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Записей на блок (по умолчанию 2000).")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="ПАРАМЕТР=ЗНАЧЕНИЯ",
+        help="Ось сценариев: 'estate=0:10000000:11' (равномерно) или 'alive_children=0,1,2'.",
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="ПАРАМЕТР=ЗНАЧЕНИЕ",
+        help="Фиксированный параметр сценариев, например 'spouse=да' или 'G=124028'.",
+    )
+    args = parser.parse_args(argv)
+    if args.sweep:
+        return _run_sweep(args)
+    if args.batch:
+        return _run_batch(args)
+    if args.json:
+        return _run_json(args.json)
 
-    # Наследственная масса
-    if spouse_alive:
-        estate = marital_money / 2 + personal_money
-    else:
-        estate = marital_money + personal_money
-
-    shares: dict[str, float] = {}
-    remaining = estate
-
-    # Супруг/супруга
-    if spouse_alive:
-        children_count = ask_int("Сколько у вас детей (число): ", min_value=0)
-
-        if children_count > 0:
-            spouse_share = max(estate / 4, 520_000)
-            spouse_share = min(spouse_share, estate)  # если денег меньше порога
-            shares["Супруг(а)"] = spouse_share
-            remaining -= spouse_share
-
-            child_share = remaining / children_count
-            shares["Дети (каждый)"] = child_share
-            remaining = 0.0
-        else:
-            parents_count = ask_int(
-                "Сколько у вас живых родителей (0-2): ", min_value=0, max_value=2
-            )
-
-            if parents_count > 0:
-                spouse_share = max(estate / 2, 780_000)
-                spouse_share = min(spouse_share, estate)
-                shares["Супруг(а)"] = spouse_share
-                remaining -= spouse_share
-
-                parent_share = remaining / parents_count if parents_count else 0.0
-                shares["Родители (каждый)"] = parent_share
-                remaining = 0.0
-            else:
-                grandparents_count = ask_int(
-                    "Сколько у вас живых бабушек/дедушек: ", min_value=0
-                )
-                if grandparents_count > 0:
-                    shares["Супруг(а)"] = estate  # супруг забирает все
-                    remaining = 0.0
-                else:
-                    shares["Супруг(а)"] = estate  # других наследников нет
-                    remaining = 0.0
-    else:
-        # Супруг(а) нет
-        children_count = ask_int("Сколько у вас детей (число): ", min_value=0)
-        if children_count > 0:
-            child_share = estate / children_count
-            shares["Дети (каждый)"] = child_share
-            remaining = 0.0
-        else:
-            parents_count = ask_int(
-                "Сколько у вас живых родителей (0-2): ", min_value=0, max_value=2
-            )
-            if parents_count > 0:
-                parent_share = estate / parents_count if parents_count else 0.0
-                shares["Родители (каждый)"] = parent_share
-                remaining = 0.0
-            else:
-                grandparents_count = ask_int(
-                    "Сколько у вас живых бабушек/дедушек: ", min_value=0
-                )
-                if grandparents_count > 0:
-                    grand_share = estate / grandparents_count
-                    shares["Бабушки/дедушки (каждый)"] = grand_share
-                    remaining = 0.0
+    if not sys.stdin.isatty():
+        print("Этот скрипт требует интерактивного ввода. Запустите его в обычной консоли или используйте --json.")
+        return 1
 
-    print("\n--- Итоговое распределение ---")
-    print(f"Наследственная масса: {estate:,.2f} NOK")
-    if shares:
-        for role, amount in shares.items():
-            print(f"{role}: {amount:,.2f} NOK")
-    else:
-        print("Нет наследников по заданным условиям.")
+    print("=== Калькулятор наследства ===")
+    dist = distribute(ask_facts())
 
-    if remaining > 0:
-        print(f"Нераспределено: {remaining:,.2f} NOK")
+    print("\n--- Итоговое распределение ---")
+    print(format_distribution(dist))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
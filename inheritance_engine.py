@@ -0,0 +1,647 @@
+"""
+Правила распределения наследства по Arveloven без ввода/вывода.
+
+Общий движок для inheritance_calc.py (консоль) и Untitled-1.py (Tk):
+`distribute(EstateFacts(...)) -> Distribution`. Суммы в кронах, G —
+grunnbeløp folketrygden на дату открытия наследства.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO
+
+DEFAULT_G = 130_000.0
+
+ROLE_LABELS = {
+    "spouse": "Супруг(а)",
+    "child": "Каждый живой ребёнок",
+    "grandchild": "Каждый внук",
+    "parent": "Каждый родитель",
+    "grandparent": "Каждый дедушка и бабушка",
+}
+
+LAW_CHILDREN = "§ 4 Arveloven — дети наследуют в первой очереди"
+LAW_GRANDCHILDREN = "§ 4 Arveloven — внуки получают долю умершего родителя (по ветви)"
+LAW_PARENTS = "§ 5 Arveloven — родители наследуют при отсутствии потомков"
+LAW_GRANDPARENTS = "§ 6 Arveloven — дедушки и бабушки наследуют"
+LAW_SPOUSE_WITH_CHILDREN = "§ 8 Arveloven — супруг: 1/4, но не меньше 4G"
+LAW_SPOUSE_WITH_PARENTS = "§ 9 Arveloven — супруг: 1/2, но не меньше 6G"
+LAW_SPOUSE_ALL = "§ 9 Arveloven — супруг наследует всё"
+LAW_SPOUSE_MINIMUM = "§ 10 Arveloven — минимум супруга при завещании (4G / 6G)"
+LAW_WILL = "§ 40 Arveloven — свобода завещания"
+LAW_PLIKTDEL = "§ 50 Arveloven — обязательная доля 2/3, не больше 15G на ветвь"
+LAW_NO_HEIRS = "§ 76 Arveloven — без наследников имущество идёт на поддержку детей и молодёжи"
+
+
+class FamilyTree:
+    """
+    Потомки наследодателя в плоских массивах (без вложенных словарей).
+
+    Узел 0 — сам наследодатель. Каждый узел хранит индекс родителя и флаг
+    «жив»; родитель всегда добавлен раньше ребёнка, поэтому доли по ветвям
+    (§ 4) считаются двумя линейными проходами: снизу вверх — какие ветви
+    живы, сверху вниз — деление поровну между живыми ветвями.
+    """
+
+    __slots__ = ("parent", "alive", "names")
+
+    def __init__(self) -> None:
+        self.parent = array("l", [-1])
+        self.alive = bytearray([0])
+        self.names: List[str] = ["наследодатель"]
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self, parent: int = 0, alive: bool = True, name: Optional[str] = None) -> int:
+        """Добавить потомка узла parent; вернуть индекс нового узла."""
+        if not 0 <= parent < len(self.parent):
+            raise ValueError(f"Нет узла {parent} в дереве.")
+        self.parent.append(parent)
+        self.alive.append(1 if alive else 0)
+        self.names.append(name if name is not None else f"#{len(self.names)}")
+        return len(self.parent) - 1
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> "FamilyTree":
+        """
+        Из списка {"name", "parent", "alive"}; parent — имя родителя или
+        null/"" для детей наследодателя. Порядок записей любой. Тёзкам
+        (например, дед и внук) нужно поле "id": тогда parent ссылается на id.
+        """
+        children: Dict[Optional[str], List[Mapping[str, Any]]] = {}
+        keys = set()
+        count = 0
+        for record in records:
+            key = _record_key(record)
+            if key in keys:
+                raise ValueError(f"В дереве семьи дважды встречается «{key}»: задайте записям разные id.")
+            keys.add(key)
+            parent = record.get("parent")
+            children.setdefault(str(parent) if parent not in (None, "") else None, []).append(record)
+            count += 1
+        tree = cls()
+        stack: List[tuple] = [(None, 0)]
+        while stack:
+            name, index = stack.pop()
+            for record in children.pop(name, ()):
+                alive = record.get("alive", True)
+                if not isinstance(alive, bool):
+                    alive = str(alive).strip().lower() in _TRUE
+                key = _record_key(record)
+                stack.append((key, tree.add(index, alive, str(record["name"]))))
+        if len(tree) - 1 != count:
+            missing = ", ".join(sorted(str(name) for name in children))
+            raise ValueError(f"В дереве семьи нет родителей: {missing}")
+        return tree
+
+    @classmethod
+    def from_branches(cls, alive_children: int, grandchildren: Sequence[int] = ()) -> "FamilyTree":
+        """
+        Дерево из живых детей и умерших детей, у каждого из которых своё
+        число живых внуков: from_branches(1, [1, 3]) — внук первого умершего
+        получает 1/3, каждый из трёх внуков второго — по 1/9.
+        """
+        tree = cls()
+        for number in range(1, alive_children + 1):
+            tree.add(0, True, f"Ребёнок {number}")
+        for number, count in enumerate(grandchildren, alive_children + 1):
+            if count < 0:
+                raise ValueError("Число внуков не может быть отрицательным.")
+            child = tree.add(0, False, f"Ребёнок {number} (умер)")
+            for grandchild in range(1, count + 1):
+                tree.add(child, True, f"Внук {number}.{grandchild}")
+        return tree
+
+    def _live_branches(self) -> tuple:
+        """live[i] — узел жив или у него есть живые потомки; branches[i] — число живых ветвей под i."""
+        size = len(self.parent)
+        live = bytearray(self.alive)
+        branches = array("l", bytes(array("l").itemsize * size))
+        parent = self.parent
+        for index in range(size - 1, 0, -1):
+            if branches[index]:
+                live[index] = 1
+            if live[index]:
+                branches[parent[index]] += 1
+        return live, branches
+
+    def branch_count(self) -> int:
+        """Сколько ветвей детей наследодателя наследует (§ 4)."""
+        return self._live_branches()[1][0]
+
+    def stirpes(self, amount: float) -> List[float]:
+        """
+        Разделить amount по ветвям (§ 4) на любую глубину: доля каждого узла
+        (ненулевая только у живых наследников).
+        """
+        live, branches = self._live_branches()
+        parent, alive = self.parent, self.alive
+        share = [0.0] * len(parent)
+        share[0] = amount
+        for index in range(1, len(parent)):
+            above = parent[index]
+            # живой наследник забирает долю ветви целиком, его потомки не наследуют
+            if live[index] and (above == 0 or not alive[above]):
+                share[index] = share[above] / branches[above]
+        for index in range(len(parent)):
+            if not alive[index]:
+                share[index] = 0.0
+        return share
+
+    def heirs(self, amount: float) -> Dict[str, float]:
+        """{имя: доля} живых наследников; у тёзок к имени добавляется номер узла."""
+        return self._by_name(self.stirpes(amount))
+
+    def _by_name(self, shares: Sequence[float]) -> Dict[str, float]:
+        result: Dict[str, float] = {}
+        for index, value in enumerate(shares):
+            if value:
+                name = self.names[index]
+                result[name if name not in result else f"{name} #{index}"] = value
+        return result
+
+
+def _record_key(record: Mapping[str, Any]) -> str:
+    """Ключ записи семьи: id, если задан (в том числе 0), иначе имя."""
+    return str(record["id"] if record.get("id") is not None else record["name"])
+
+
+def stirpes_many(trees: Iterable[FamilyTree], amounts: Iterable[float]) -> Iterator[List[float]]:
+    """FamilyTree.stirpes для множества деревьев; время линейно по сумме узлов."""
+    for tree, amount in zip(trees, amounts):
+        yield tree.stirpes(amount)
+
+
+@dataclass
+class EstateFacts:
+    """Исходные данные по одному наследству."""
+
+    estate: float
+    G: float = DEFAULT_G
+    spouse: bool = False
+    alive_children: int = 0
+    # умершие дети, оставившие потомков, и число их детей (внуков)
+    dead_children: int = 0
+    grandchildren: int = 0
+    parents: int = 0
+    grandparents: int = 0
+    has_will: bool = False
+    # точное дерево потомков; если задано, счётчики детей/внуков не используются
+    family: Optional[FamilyTree] = None
+
+    def validate(self) -> None:
+        if self.estate < 0:
+            raise ValueError("Сумма наследства не может быть отрицательной.")
+        if self.G <= 0:
+            raise ValueError("G должно быть положительным.")
+        for name in ("alive_children", "dead_children", "grandchildren", "parents", "grandparents"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name}: количество не может быть отрицательным.")
+        if self.parents > 2:
+            raise ValueError("Родителей не может быть больше двух.")
+        if self.grandparents > 4:
+            raise ValueError("Бабушек и дедушек не может быть больше четырёх.")
+
+    @property
+    def branches(self) -> int:
+        """Число ветвей потомков (§ 4): живые дети + умершие дети с потомками."""
+        if self.family is not None:
+            return self.family.branch_count()
+        return self.alive_children + (self.dead_children if self.grandchildren > 0 else 0)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "EstateFacts":
+        """Из JSON/CSV-записи; лишние ключи игнорируются, строки приводятся к типам."""
+        values: Dict[str, Any] = {}
+        for item in fields(cls):
+            if item.name == "family":
+                if data.get("family"):
+                    values["family"] = FamilyTree.from_records(data["family"])
+                continue
+            if item.name not in data or data[item.name] in ("", None):
+                continue
+            raw = data[item.name]
+            if item.type in ("bool", bool):
+                values[item.name] = raw if isinstance(raw, bool) else str(raw).strip().lower() in _TRUE
+            elif item.type in ("int", int):
+                values[item.name] = int(raw)
+            else:
+                values[item.name] = float(str(raw).replace(",", "."))
+        if "estate" not in values:
+            raise ValueError("Не указана сумма наследства (estate).")
+        return cls(**values)
+
+
+_TRUE = {"1", "true", "yes", "y", "да", "d"}
+
+
+@dataclass
+class Share:
+    role: str
+    per_person: float
+    count: int
+
+    @property
+    def total(self) -> float:
+        return self.per_person * self.count
+
+    @property
+    def label(self) -> str:
+        return ROLE_LABELS.get(self.role, self.role)
+
+
+@dataclass
+class Distribution:
+    estate: float
+    shares: List[Share] = field(default_factory=list)
+    by_will: float = 0.0
+    unclaimed: float = 0.0
+    laws_used: List[str] = field(default_factory=list)
+    info: str = ""
+    # доли каждого наследника по имени (только при EstateFacts.family)
+    heirs: Dict[str, float] = field(default_factory=dict)
+
+    def share(self, role: str) -> float:
+        """Доля одного наследника роли role (0, если такой роли нет)."""
+        for item in self.shares:
+            if item.role == role:
+                return item.per_person
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for item, raw in zip(self.shares, data["shares"]):
+            raw["label"] = item.label
+        return data
+
+
+def estate_from_assets(marital_money: float, personal_money: float, spouse_alive: bool) -> float:
+    """Наследственная масса: при живом супруге половина общего имущества — его."""
+    return (marital_money / 2 if spouse_alive else marital_money) + personal_money
+
+
+def _descendant_shares(amount_per_branch: float, facts: EstateFacts, dist: Distribution) -> None:
+    tree = facts.family
+    if tree is not None:
+        shares = tree.stirpes(amount_per_branch * facts.branches)
+        children = sum(1 for i in range(1, len(tree)) if tree.parent[i] == 0 and tree.alive[i])
+        if children:
+            dist.shares.append(Share("child", amount_per_branch, children))
+        dist.heirs = tree._by_name(shares)
+        if any(shares[i] and tree.parent[i] != 0 for i in range(1, len(tree))):
+            dist.laws_used.append(LAW_GRANDCHILDREN)
+        return
+    if facts.alive_children > 0:
+        dist.shares.append(Share("child", amount_per_branch, facts.alive_children))
+    if facts.dead_children > 0 and facts.grandchildren > 0:
+        # без дерева семьи внуки считаются поровну распределёнными по умершим детям
+        per_grandchild = amount_per_branch * facts.dead_children / facts.grandchildren
+        dist.shares.append(Share("grandchild", per_grandchild, facts.grandchildren))
+        dist.laws_used.append(LAW_GRANDCHILDREN)
+
+
+def distribute(facts: EstateFacts) -> Distribution:
+    """Распределить наследство по Arveloven (§§ 4–10, 40, 50, 76)."""
+    facts.validate()
+    estate = facts.estate
+    G = facts.G
+    branches = facts.branches
+    dist = Distribution(estate=estate)
+
+    if facts.has_will:
+        remaining = estate
+        if branches > 0:
+            per_branch = min(estate * 2 / 3 / branches, 15 * G)
+            _descendant_shares(per_branch, facts, dist)
+            remaining -= per_branch * branches
+            dist.laws_used.insert(0, LAW_PLIKTDEL)
+        if facts.spouse:
+            minimum = 4 * G if branches > 0 else 6 * G
+            spouse_share = min(remaining, minimum)
+            dist.shares.insert(0, Share("spouse", spouse_share, 1))
+            remaining -= spouse_share
+            dist.laws_used.append(LAW_SPOUSE_MINIMUM)
+        dist.by_will = remaining
+        dist.laws_used.append(LAW_WILL)
+        dist.info = "Применено завещание с обязательными долями"
+        return dist
+
+    remaining = estate
+    if facts.spouse:
+        if branches > 0:
+            spouse_share = min(estate, max(estate / 4, 4 * G))
+            law = LAW_SPOUSE_WITH_CHILDREN
+        elif facts.parents > 0:
+            spouse_share = min(estate, max(estate / 2, 6 * G))
+            law = LAW_SPOUSE_WITH_PARENTS
+        else:
+            spouse_share = estate
+            law = LAW_SPOUSE_ALL
+        dist.shares.append(Share("spouse", spouse_share, 1))
+        dist.laws_used.append(law)
+        remaining -= spouse_share
+
+    if branches > 0:
+        dist.laws_used.append(LAW_CHILDREN)
+        _descendant_shares(remaining / branches, facts, dist)
+        dist.info = "Сначала супруг, затем дети и внуки" if facts.spouse else "Наследуют дети и внуки"
+    elif facts.parents > 0:
+        dist.shares.append(Share("parent", remaining / facts.parents, facts.parents))
+        dist.laws_used.append(LAW_PARENTS)
+        dist.info = "Наследуют родители"
+    elif facts.spouse:
+        dist.info = "Супруг(а) наследует всё"
+    elif facts.grandparents > 0:
+        dist.shares.append(Share("grandparent", remaining / facts.grandparents, facts.grandparents))
+        dist.laws_used.append(LAW_GRANDPARENTS)
+        dist.info = "Наследуют дедушки и бабушки"
+    else:
+        dist.unclaimed = remaining
+        dist.laws_used.append(LAW_NO_HEIRS)
+        dist.info = "Наследников нет"
+    return dist
+
+
+def format_distribution(dist: Distribution) -> str:
+    """Текстовый отчёт в стиле обоих интерфейсов."""
+    lines = [f"Наследство: {dist.estate:,.2f} NOK", ""]
+    for item in dist.shares:
+        lines.append(f"{item.label}: {item.per_person:,.2f} NOK" + (f" × {item.count}" if item.count > 1 else ""))
+    if dist.heirs:
+        lines.append("Потомки по ветвям (§ 4):")
+        lines += [f"  {name}: {amount:,.2f} NOK" for name, amount in dist.heirs.items()]
+    if dist.by_will:
+        lines.append(f"По завещанию: {dist.by_will:,.2f} NOK")
+    if dist.unclaimed:
+        lines.append(f"Без наследников: {dist.unclaimed:,.2f} NOK")
+    if not dist.shares and not dist.by_will and not dist.unclaimed:
+        lines.append("Нет наследников по заданным условиям.")
+    lines += ["", dist.info, "", "Применённые статьи закона:"]
+    lines += [f"• {law}" for law in dist.laws_used]
+    return "\n".join(lines)
+
+
+# ================== ПАКЕТНАЯ ОБРАБОТКА ==================
+
+RECORD_FORMATS = ("csv", "jsonl")
+RESULT_COLUMNS = (
+    "id", "estate", "spouse", "child", "grandchild", "parent", "grandparent",
+    "by_will", "unclaimed", "info", "laws_used", "heirs", "error",
+)
+
+
+def distribute_record(record: Mapping[str, Any], flat: bool = False) -> Dict[str, Any]:
+    """
+    Одна запись (dict из CSV/JSONL) -> результат; ошибки не бросаются,
+    а попадают в поле error. flat=True — плоская строка для CSV (RESULT_COLUMNS).
+    """
+    result: Dict[str, Any] = {"id": record.get("id")}
+    if "_invalid" in record:
+        result["error"] = f"Некорректный JSON: {record['_invalid']}"
+        return result
+    try:
+        dist = distribute(EstateFacts.from_dict(record))
+    except (TypeError, ValueError) as exc:
+        result["error"] = str(exc)
+        return result
+    if not flat:
+        result.update(dist.to_dict())
+        return result
+    result["estate"] = dist.estate
+    for role in ROLE_LABELS:
+        result[role] = dist.share(role)
+    result["by_will"] = dist.by_will
+    result["unclaimed"] = dist.unclaimed
+    result["info"] = dist.info
+    result["laws_used"] = "; ".join(dist.laws_used)
+    if dist.heirs:
+        result["heirs"] = json.dumps(dist.heirs, ensure_ascii=False)
+    return result
+
+
+def _distribute_chunk(records: List[Mapping[str, Any]], flat: bool) -> List[Dict[str, Any]]:
+    return [distribute_record(record, flat) for record in records]
+
+
+def distribute_many(
+    records: Iterable[Mapping[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    flat: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Распределить поток записей в порядке поступления.
+
+    Записи режутся на блоки по chunk_size и считаются на workers процессах
+    (по умолчанию — по числу ядер); в работе не больше 2 * workers блоков,
+    так что память не растёт с размером входа.
+    """
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(records)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from _distribute_chunk(chunk, flat)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_distribute_chunk, chunk, flat))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def guess_format(path: Optional[str], default: str = "jsonl") -> str:
+    if not path or path == "-":
+        return default
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    ext = {"json": "jsonl", "ndjson": "jsonl"}.get(ext, ext)
+    return ext if ext in RECORD_FORMATS else default
+
+
+def read_records(handle: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Записи EstateFacts из CSV (по заголовку) или JSONL (объект в строке)."""
+    if fmt == "csv":
+        yield from csv.DictReader(handle)
+        return
+    for number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield {"id": f"line {number}", "_invalid": str(exc)}
+
+
+def write_results(results: Iterable[Dict[str, Any]], handle: TextIO, fmt: str) -> int:
+    """Записать результаты потоком; вернуть число записей с ошибкой."""
+    errors = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(handle, fieldnames=RESULT_COLUMNS, lineterminator="\n", extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            errors += "error" in result
+            writer.writerow(result)
+        return errors
+    for result in results:
+        errors += "error" in result
+        handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return errors
+
+
+# ================== СЦЕНАРИИ (ВЕКТОРНО) ==================
+
+SWEEP_FIELDS = tuple(item.name for item in fields(EstateFacts) if item.name != "family")
+
+
+def _require_numpy() -> Any:
+    """NumPy нужен только для сеток сценариев."""
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError("Для сценариев нужен NumPy: pip install numpy") from exc
+    return np
+
+
+@dataclass
+class ScenarioGrid:
+    """
+    Результат sweep(): axes — значения по каждой меняющейся оси (в порядке
+    полей EstateFacts), shares — массивы формы (len(ax1), len(ax2), ...)
+    с долей одного наследника каждой роли, а также by_will и unclaimed.
+    """
+
+    axes: Dict[str, Any]
+    shares: Dict[str, Any]
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(values) for values in self.axes.values())
+
+    @property
+    def columns(self) -> List[str]:
+        """Заголовок rows(); ось spouse называется input_spouse, чтобы не совпасть с долей."""
+        return [self._axis_column(name) for name in self.axes] + list(self.shares)
+
+    def _axis_column(self, name: str) -> str:
+        return f"input_{name}" if name in self.shares else name
+
+    def rows(self) -> Iterator[Dict[str, float]]:
+        """Плоская таблица: одна строка на точку сетки."""
+        np = _require_numpy()
+        names = list(self.axes)
+        for index in np.ndindex(*self.shape):
+            row = {self._axis_column(name): self.axes[name][i].item() for name, i in zip(names, index)}
+            row.update({role: float(values[index]) for role, values in self.shares.items()})
+            yield row
+
+
+def sweep(**params: Any) -> ScenarioGrid:
+    """
+    Посчитать distribute() на целой сетке параметров массивами NumPy.
+
+    Каждый параметр EstateFacts — число/булево (фиксирован) или
+    последовательность (ось сетки):
+
+    >>> grid = sweep(estate=np.linspace(0, 1e7, 101), alive_children=[1, 2, 3], spouse=True)
+    >>> grid.shares["spouse"].shape
+    (101, 3)
+
+    Правила те же, что в distribute(), результаты совпадают поэлементно.
+    """
+    np = _require_numpy()
+    unknown = set(params) - set(SWEEP_FIELDS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+    if "estate" not in params:
+        raise ValueError("Не указана сумма наследства (estate).")
+    defaults = {item.name: item.default for item in fields(EstateFacts) if item.name in SWEEP_FIELDS[1:]}
+
+    axes: Dict[str, Any] = {}
+    for name in SWEEP_FIELDS:
+        value = np.asarray(params.get(name, defaults.get(name)))
+        if value.ndim > 1:
+            raise ValueError(f"{name}: ожидалось число или одномерный массив")
+        if value.ndim == 1:
+            axes[name] = value
+    ndim = len(axes)
+    values: Dict[str, Any] = {}
+    for name in SWEEP_FIELDS:
+        if name in axes:
+            shape = [1] * ndim
+            shape[list(axes).index(name)] = -1
+            values[name] = axes[name].reshape(shape)
+        else:
+            values[name] = np.asarray(params.get(name, defaults.get(name)))
+
+    E = values["estate"].astype(float)
+    G = values["G"].astype(float)
+    S = values["spouse"].astype(bool)
+    A = values["alive_children"].astype(int)
+    D = values["dead_children"].astype(int)
+    GC = values["grandchildren"].astype(int)
+    P = values["parents"].astype(int)
+    GP = values["grandparents"].astype(int)
+    W = values["has_will"].astype(bool)
+    if (E < 0).any() or (G <= 0).any() or any((v < 0).any() for v in (A, D, GC, P, GP)):
+        raise ValueError("Отрицательные суммы/количества или G <= 0 в сетке.")
+
+    branches = A + np.where(GC > 0, D, 0)
+    has_branches = branches > 0
+    safe_branches = np.maximum(branches, 1)
+
+    # без завещания (§§ 4–9, 76)
+    spouse_free = np.where(
+        has_branches,
+        np.minimum(E, np.maximum(E / 4, 4 * G)),
+        np.where(P > 0, np.minimum(E, np.maximum(E / 2, 6 * G)), E),
+    )
+    spouse_free = np.where(S, spouse_free, 0.0)
+    rest = E - spouse_free
+    branch_free = np.where(has_branches, rest / safe_branches, 0.0)
+    to_parents = ~has_branches & (P > 0)
+    to_grandparents = ~has_branches & (P == 0) & ~S & (GP > 0)
+    nobody = ~has_branches & (P == 0) & ~S & (GP == 0)
+
+    # с завещанием (§§ 10, 40, 50)
+    branch_will = np.where(has_branches, np.minimum(E * 2 / 3 / safe_branches, 15 * G), 0.0)
+    rest_will = E - branch_will * branches
+    spouse_will = np.where(S, np.minimum(rest_will, np.where(has_branches, 4 * G, 6 * G)), 0.0)
+
+    branch = np.where(W, branch_will, branch_free)
+    shares = {
+        "spouse": np.where(W, spouse_will, spouse_free),
+        "child": np.where(A > 0, branch, 0.0),
+        "grandchild": np.where((D > 0) & (GC > 0), branch * D / np.maximum(GC, 1), 0.0),
+        "parent": np.where(~W & to_parents, rest / np.maximum(P, 1), 0.0),
+        "grandparent": np.where(~W & to_grandparents, rest / np.maximum(GP, 1), 0.0),
+        "by_will": np.where(W, rest_will - spouse_will, 0.0),
+        "unclaimed": np.where(~W & nobody, rest, 0.0),
+    }
+    shape = tuple(len(v) for v in axes.values())
+    return ScenarioGrid(axes, {role: np.broadcast_to(v, shape).copy() for role, v in shares.items()})
+
+
+def parse_sweep_axis(spec: str) -> Any:
+    """'start:stop:num' (равномерно) или список через запятую."""
+    np = _require_numpy()
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        return np.linspace(float(start), float(stop), int(num))
+    items = [item.strip() for item in spec.split(",") if item.strip()]
+    if all(item.lower() in _TRUE | {"0", "false", "no", "n", "нет"} for item in items):
+        return np.array([item.lower() in _TRUE for item in items])
+    return np.array([float(item) for item in items])
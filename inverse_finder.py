@@ -5,16 +5,84 @@ Command-line helper that attempts to compute symbolic inverse functions.
 The tool accepts an expression in terms of one variable (default: x) and
 solves y = f(x) for x. Multiple solutions are reported whenever the
 inverse is multivalued.
+
+With --batch, many expressions (one per line) are solved in a single
+process, and --cache keeps solved inverses in a SQLite file keyed on the
+canonical form of the expression, the symbols and the domain. --workers and
+--timeout move solving into worker processes with a per-expression budget.
+compile_inverse() / --at evaluate x = f^-1(y) over NumPy arrays instead.
+SymPy is imported lazily; --serve keeps one warm process that --connect
+invocations reuse.
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hmac
+import importlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import multiprocessing.context
+import os
+import secrets
+import socket
+import socketserver
+import sqlite3
 import sys
-from typing import List, Sequence
+import time
+import types
+from collections import deque
+from functools import lru_cache
+from multiprocessing.connection import Connection, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access."""
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        # copy once so later lookups never come back through here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def _lazy_import(name: str) -> Any:
+    """
+    Return a module whose real import runs on first attribute access.
+
+    SymPy takes ~0.4 s to import; --help, argument errors and --connect
+    never touch it, and it stays out of sys.modules until they do.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"inverse_finder needs {name}: pip install {name}")
+    return _LazyModule(name)
 
-import sympy as sp
-from sympy.core.sympify import SympifyError
+
+sp = _lazy_import("sympy")
+
+# Shared secret for --serve/--connect; see serve().
+TOKEN_ENV = "INVERSE_FINDER_TOKEN"
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -50,6 +118,107 @@ def _build_parser() -> argparse.ArgumentParser:
             "functions (default: x)."
         ),
     )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help=(
+            "Solve every expression in FILE (one per line, '-' for stdin, "
+            "# starts a comment) instead of a single function."
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help=(
+            "SQLite file caching solved inverses across runs, keyed on the "
+            "canonical expression, symbols and domain."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=(
+            "Solve in N worker processes (default: inline, or 1 worker when "
+            "--timeout is given). Results are printed as they finish."
+        ),
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Wall-clock budget per expression. solve() gets half of it, "
+            "solveset the rest; if both overrun, the implicit equation is "
+            "reported for numeric solving and the timeout is noted."
+        ),
+    )
+    parser.add_argument(
+        "--at",
+        type=float,
+        nargs="+",
+        metavar="Y",
+        help="Evaluate the inverse numerically at these y values (CSV output).",
+    )
+    parser.add_argument(
+        "--at-file",
+        metavar="PATH",
+        help="Like --at, reading y values from a text file (one per line), .npy or '-'.",
+    )
+    parser.add_argument(
+        "--branch",
+        type=int,
+        help="Only evaluate this inverse branch (default: all).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        nargs=2,
+        default=(-10.0, 10.0),
+        metavar=("LO", "HI"),
+        help=(
+            "Where to look for monotone pieces of f when no closed-form "
+            "inverse exists (default: -10 10)."
+        ),
+    )
+    parser.add_argument(
+        "--simplify",
+        choices=SIMPLIFY_LEVELS,
+        default="full",
+        help=(
+            "Simplification applied once to each solution and the echoed "
+            "function: none, fast (cheap rewrites) or full (sp.simplify, "
+            "default)."
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report parse/solve/simplify/format times per expression on stderr (or in --json).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per expression instead of text.",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help=(
+            "Run as a long-lived server on 127.0.0.1:PORT (0 picks a free port). "
+            "Requests run arbitrary SymPy input (sympify uses eval), so every "
+            f"request must carry the token from ${TOKEN_ENV} or ~/.inverse_finder-PORT.token."
+        ),
+    )
+    parser.add_argument(
+        "--connect",
+        type=int,
+        metavar="PORT",
+        help=(
+            "Send this invocation to a --serve process instead of solving "
+            "locally; skips SymPy import and interpreter warm-up."
+        ),
+    )
     parser.add_argument(
         "--domain",
         choices=("real", "complex"),
@@ -68,68 +237,941 @@ def _sympify_expression(expr_str: str, input_symbol: sp.Symbol, output_symbol: s
     return sp.sympify(expr_str, locals=local_symbols)
 
 
-def _solve_for_inverse(expr: sp.Expr, input_symbol: sp.Symbol, output_symbol: sp.Symbol) -> Sequence[sp.Expr]:
+SIMPLIFY_LEVELS = ("none", "fast", "full")
+
+
+@lru_cache(maxsize=4096)
+def _simplify(expr: sp.Expr, level: str) -> sp.Expr:
+    """
+    The one simplification pass, memoized on (expr, level).
+
+    "fast" only tries cheap rewrites (together/powsimp, cancel for rational
+    functions) and keeps the shortest candidate; "full" is sp.simplify.
+    """
+    if level == "none" or expr.is_Atom:
+        return expr
+    if level == "full":
+        return sp.simplify(expr)
+    candidates = [expr, sp.powsimp(sp.together(expr))]
+    if expr.is_rational_function():
+        candidates.append(sp.cancel(expr))
+    return min(candidates, key=sp.count_ops)
+
+
+def _record(timings: Optional[Dict[str, float]], stage: str, started: float) -> None:
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+def _solve_for_inverse(
+    expr: sp.Expr,
+    input_symbol: sp.Symbol,
+    output_symbol: sp.Symbol,
+    simplify: str = "full",
+    timings: Optional[Dict[str, float]] = None,
+) -> Sequence[sp.Expr]:
     """Try solving y = f(x) for x and return all isolated solutions."""
     equation = sp.Eq(expr, output_symbol)
-    solutions = sp.solve(equation, input_symbol)
-    if solutions:
-        return [sp.simplify(sol) for sol in solutions]
-    return []
+    started = time.perf_counter()
+    try:
+        solutions = sp.solve(equation, input_symbol)
+    except NotImplementedError:
+        # e.g. "multiple generators" for x + sin(x); solveset handles these.
+        solutions = []
+    _record(timings, "solve", started)
+    started = time.perf_counter()
+    solutions = [_simplify(sol, simplify) for sol in solutions]
+    _record(timings, "simplify", started)
+    return solutions
 
 
 def _fallback_solveset(expr: sp.Expr, input_symbol: sp.Symbol, output_symbol: sp.Symbol, domain: str) -> sp.Set:
     """Use solveset to return an implicit solution set if solve() fails."""
     domain_set = sp.S.Reals if domain == "real" else sp.S.Complexes
-    residual = sp.simplify(expr - output_symbol)
-    return sp.solveset(residual, input_symbol, domain=domain_set)
+    # solveset normalises the equation itself; simplifying first only costs time
+    return sp.solveset(expr - output_symbol, input_symbol, domain=domain_set)
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    parser = _build_parser()
-    args = parser.parse_args(argv)
+def _implicit_inverse(expr: sp.Expr, input_symbol: sp.Symbol, output_symbol: sp.Symbol, domain: str) -> sp.Set:
+    """Last-resort implicit inverse: f(x) = y left for a numeric root finder."""
+    domain_set = sp.S.Reals if domain == "real" else sp.S.Complexes
+    return sp.ConditionSet(input_symbol, sp.Eq(expr, output_symbol), domain_set)
 
-    function_expr = args.function
-    if function_expr is None:
+
+STAGES = ("solve", "solveset", "numeric")
+# Fraction of the per-expression budget each symbolic stage may use; whatever
+# solve leaves unused goes to solveset. The numeric stage never hangs.
+STAGE_SHARES = {"solve": 0.5, "solveset": 1.0}
+
+
+class InverseResult(NamedTuple):
+    """Solutions of y = f(x) for x, or the implicit set when none exist."""
+
+    solutions: Sequence[sp.Expr]
+    fallback_set: Optional[sp.Set]
+    stage: str = "solve"
+
+
+def _run_stage(
+    stage: str,
+    expr: sp.Expr,
+    input_symbol: sp.Symbol,
+    output_symbol: sp.Symbol,
+    domain: str,
+    simplify: str = "full",
+    timings: Optional[Dict[str, float]] = None,
+) -> Optional[InverseResult]:
+    """Run one solving stage; None means "try the next stage"."""
+    if stage == "solve":
+        solutions = _solve_for_inverse(expr, input_symbol, output_symbol, simplify, timings)
+        return InverseResult(solutions, None, stage) if solutions else None
+    started = time.perf_counter()
+    try:
+        if stage == "solveset":
+            try:
+                return InverseResult([], _fallback_solveset(expr, input_symbol, output_symbol, domain), stage)
+            except NotImplementedError:
+                return None
+        return InverseResult([], _implicit_inverse(expr, input_symbol, output_symbol, domain), stage)
+    finally:
+        _record(timings, stage, started)
+
+
+def _invert(
+    expr: sp.Expr,
+    input_symbol: sp.Symbol,
+    output_symbol: sp.Symbol,
+    domain: str,
+    first_stage: str = "solve",
+    simplify: str = "full",
+    timings: Optional[Dict[str, float]] = None,
+) -> InverseResult:
+    for stage in STAGES[STAGES.index(first_stage):]:
+        result = _run_stage(stage, expr, input_symbol, output_symbol, domain, simplify, timings)
+        if result is not None:
+            return result
+    raise AssertionError("numeric stage always returns a result")
+
+
+class InverseCache:
+    """
+    Solved inverses keyed on (srepr of the expression, symbols, domain, simplify level).
+
+    sympify already puts expressions in canonical form, so "3 + x**2" and
+    "x**2+3" share an entry. Entries live in a dict for the current run and,
+    when a path is given, in a SQLite file shared between runs.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, InverseResult] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS inverse_cache (key TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(
+        expr: sp.Expr, input_symbol: sp.Symbol, output_symbol: sp.Symbol, domain: str, simplify: str = "full"
+    ) -> str:
+        return json.dumps([sp.srepr(expr), str(input_symbol), str(output_symbol), domain, simplify])
+
+    def get(self, key: str) -> Optional[InverseResult]:
+        result = self._entries.get(key)
+        if result is None and self._db is not None:
+            row = self._db.execute("SELECT payload FROM inverse_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                payload = json.loads(row[0])
+                fallback = payload["fallback"]
+                result = InverseResult(
+                    [sp.sympify(sol) for sol in payload["solutions"]],
+                    sp.sympify(fallback) if fallback is not None else None,
+                    payload.get("stage", "solve"),
+                )
+                self._entries[key] = result
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: InverseResult) -> None:
+        self._entries[key] = result
+        if self._db is not None:
+            payload = {
+                "solutions": [sp.srepr(sol) for sol in result.solutions],
+                "fallback": sp.srepr(result.fallback_set) if result.fallback_set is not None else None,
+                "stage": result.stage,
+            }
+            self._db.execute(
+                "INSERT OR REPLACE INTO inverse_cache (key, payload) VALUES (?, ?)",
+                (key, json.dumps(payload)),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class SolveOutcome(NamedTuple):
+    """One finished job: its result (None on error) and the stages that timed out."""
+
+    job_id: int
+    result: Optional[InverseResult]
+    timed_out: Tuple[str, ...] = ()
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    timings: Optional[Dict[str, float]] = None
+
+
+def _solver_worker(conn: Connection) -> None:
+    """Worker loop: receive (expr, symbols, domain, stage, simplify), report stages and the result."""
+    while True:
         try:
-            function_expr = input("Enter f(x): ").strip()
+            task = conn.recv()
         except EOFError:
-            parser.error("A function expression is required.")
-        if not function_expr:
-            parser.error("A function expression is required.")
+            return
+        if task is None:
+            return
+        expr, input_symbol, output_symbol, domain, first_stage, simplify = task
+        timings: Dict[str, float] = {}
+        try:
+            for stage in STAGES[STAGES.index(first_stage):]:
+                conn.send(("stage", stage))
+                result = _run_stage(stage, expr, input_symbol, output_symbol, domain, simplify, timings)
+                if result is not None:
+                    conn.send(("done", (result, timings)))
+                    break
+        except Exception as exc:  # reported per expression, the worker stays alive
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class _Slot:
+    """One worker process plus the job it is currently running."""
+
+    def __init__(self, context: multiprocessing.context.BaseContext) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_solver_worker, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job: Optional[dict] = None
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class SolverPool:
+    """
+    Worker processes solving expressions under a per-expression wall-clock budget.
+
+    Each job runs the stages solve -> solveset -> numeric. A stage that overruns
+    its share of the budget gets its worker terminated (the only reliable way to
+    interrupt SymPy) and the job continues with the next stage; the numeric
+    stage is cheap and runs in the supervisor. Outcomes are yielded as soon as
+    they finish, so the output order follows completion, not input.
+    """
+
+    def __init__(self, workers: int = 1, timeout: Optional[float] = None, simplify: str = "full") -> None:
+        self.timeout = timeout
+        self.simplify = simplify
+        self._context = multiprocessing.get_context()
+        self._slots = [_Slot(self._context) for _ in range(max(1, workers))]
+
+    def solve(
+        self, jobs: Iterable[Tuple[int, sp.Expr, sp.Symbol, sp.Symbol, str]]
+    ) -> Iterator[SolveOutcome]:
+        jobs = iter(jobs)
+        pending: Deque[dict] = deque()
+        exhausted = False
+        while True:
+            for slot in self._slots:
+                if slot.job is not None:
+                    continue
+                if not pending and not exhausted:
+                    try:
+                        job_id, expr, input_symbol, output_symbol, domain = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                    else:
+                        pending.append({
+                            "id": job_id, "task": (expr, input_symbol, output_symbol, domain),
+                            "stage": "solve", "timed_out": [], "used": 0.0, "start": time.perf_counter(),
+                            "timings": {},
+                        })
+                if pending:
+                    self._dispatch(slot, pending.popleft())
+            busy = [slot for slot in self._slots if slot.job is not None]
+            if not busy:
+                return
+
+            wait_for = None
+            if self.timeout is not None:
+                now = time.perf_counter()
+                wait_for = max(0.0, min(slot.job["deadline"] for slot in busy) - now)
+            ready = wait([slot.conn for slot in busy], timeout=wait_for)
+            now = time.perf_counter()
+            for slot in busy:
+                job = slot.job
+                if slot.conn in ready:
+                    try:
+                        kind, payload = slot.conn.recv()
+                    except EOFError:
+                        kind, payload = "error", "worker process died"
+                        self._replace(slot)
+                    if kind == "stage":
+                        self._enter_stage(job, payload, now)
+                        continue
+                    slot.job = None
+                    result, error = None, None
+                    if kind == "done":
+                        result, timings = payload
+                        job["timings"].update(timings)
+                    else:
+                        error = payload
+                    yield SolveOutcome(
+                        job["id"], result, tuple(job["timed_out"]), error, now - job["start"], job["timings"]
+                    )
+                elif self.timeout is not None and now >= job["deadline"]:
+                    self._replace(slot)
+                    job["timed_out"].append(job["stage"])
+                    job["timings"][job["stage"]] = now - job["stage_start"]
+                    job["used"] += now - job["stage_start"]
+                    next_stage = STAGES[STAGES.index(job["stage"]) + 1]
+                    if next_stage == "numeric":
+                        expr, input_symbol, output_symbol, domain = job["task"]
+                        result = _run_stage(next_stage, expr, input_symbol, output_symbol, domain,
+                                            self.simplify, job["timings"])
+                        yield SolveOutcome(
+                            job["id"], result, tuple(job["timed_out"]), None, now - job["start"], job["timings"]
+                        )
+                    else:
+                        job["stage"] = next_stage
+                        pending.appendleft(job)
+
+    def _dispatch(self, slot: _Slot, job: dict) -> None:
+        slot.job = job
+        self._enter_stage(job, job["stage"], time.perf_counter())
+        slot.conn.send(job["task"] + (job["stage"], self.simplify))
+
+    def _enter_stage(self, job: dict, stage: str, now: float) -> None:
+        if job["stage"] != stage:
+            job["used"] += now - job["stage_start"]
+        job["stage"] = stage
+        job["stage_start"] = now
+        if self.timeout is not None:
+            budget = self.timeout * STAGE_SHARES.get(stage, 1.0) - job["used"]
+            job["deadline"] = now + max(0.0, budget)
 
+    def _replace(self, slot: _Slot) -> None:
+        slot.kill()
+        index = self._slots.index(slot)
+        self._slots[index] = _Slot(self._context)
+        # keep the job reference on the caller's side; the new slot starts idle
+        slot.job = None
+
+    def close(self) -> None:
+        for slot in self._slots:
+            try:
+                slot.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for slot in self._slots:
+            slot.process.join(timeout=1)
+            if slot.process.is_alive():
+                slot.process.terminate()
+            slot.conn.close()
+
+
+def _solve_stream(
+    exprs: Iterable[Tuple[int, sp.Expr]],
+    args: argparse.Namespace,
+    cache: Optional[InverseCache],
+) -> Iterator[SolveOutcome]:
+    """Solve (job_id, expr) pairs, inline or in a SolverPool, serving cache hits first."""
     input_symbol = sp.Symbol(args.input_var)
     output_symbol = sp.Symbol(args.output_var)
-    inverse_input_symbol = sp.Symbol(args.inverse_input_var)
+    keys: Dict[int, str] = {}
 
+    def misses() -> Iterator[Tuple[int, sp.Expr, sp.Symbol, sp.Symbol, str]]:
+        for job_id, expr in exprs:
+            if cache is not None:
+                key = keys[job_id] = cache.key(expr, input_symbol, output_symbol, args.domain, args.simplify)
+                result = cache.get(key)
+                if result is not None:
+                    hits.append(SolveOutcome(job_id, result))
+                    continue
+            yield job_id, expr, input_symbol, output_symbol, args.domain
+
+    def inline() -> Iterator[SolveOutcome]:
+        for job_id, expr, i, o, domain in misses():
+            timings: Dict[str, float] = {}
+            started = time.perf_counter()
+            result = _invert(expr, i, o, domain, simplify=args.simplify, timings=timings)
+            yield SolveOutcome(job_id, result, elapsed=time.perf_counter() - started, timings=timings)
+
+    hits: List[SolveOutcome] = []
+    if args.workers is None and args.timeout is None:
+        outcomes: Iterable[SolveOutcome] = inline()
+        pool = None
+    else:
+        pool = SolverPool(args.workers or 1, args.timeout, args.simplify)
+        outcomes = pool.solve(misses())
     try:
-        expr = _sympify_expression(function_expr, input_symbol, output_symbol)
-    except SympifyError as exc:
-        parser.error(f"Could not parse expression: {exc}")
+        for outcome in outcomes:
+            while hits:
+                yield hits.pop(0)
+            # results reached only because a stage timed out are not cached:
+            # a later run with a larger budget may still find a closed form
+            if cache is not None and outcome.result is not None and not outcome.timed_out:
+                cache.put(keys[outcome.job_id], outcome.result)
+            yield outcome
+        while hits:
+            yield hits.pop(0)
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _require_numpy() -> Any:
+    """Import NumPy on demand; only the numeric inverse engine needs it."""
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError("Numeric inverses need NumPy: pip install numpy") from exc
+    return np
+
+
+def _vectorize(expr: sp.Expr, symbol: sp.Symbol) -> Callable[[Any], Any]:
+    """
+    Compile expr into a callable over NumPy arrays.
+
+    Plain NumPy covers most functions; SciPy adds special functions such as
+    LambertW. Whatever neither can print is evaluated elementwise through
+    mpmath, which is slow but still correct.
+    """
+    np = _require_numpy()
+    probe = np.array([0.5, 1.5], dtype=complex)
+    for modules in (["numpy"], ["scipy", "numpy"]):
+        try:
+            func = sp.lambdify(symbol, expr, modules=modules)
+            with np.errstate(all="ignore"):
+                func(probe)
+        except (ImportError, NameError, TypeError, AttributeError):
+            continue
+        return lambda values, func=func: np.broadcast_to(func(values), np.shape(values))
+    scalar = np.frompyfunc(sp.lambdify(symbol, expr, modules="mpmath"), 1, 1)
+    return lambda values: scalar(values).astype(complex)
+
+
+class NumericInverse:
+    """
+    x = f^-1(y) evaluated over arrays.
+
+    Closed-form branches from solve() are compiled once with lambdify.
+    Without a closed form, f is split into monotone pieces on ``interval``
+    and each piece is inverted with a vectorized safeguarded Newton
+    iteration. Either way, values outside a branch's range come back as NaN.
+    """
+
+    def __init__(
+        self,
+        expr: sp.Expr,
+        input_symbol: sp.Symbol,
+        output_symbol: sp.Symbol,
+        domain: str = "real",
+        interval: Tuple[float, float] = (-10.0, 10.0),
+        samples: int = 4097,
+        tol: float = 1e-12,
+    ) -> None:
+        self.expr = expr
+        self.domain = domain
+        self.tol = tol
+        self._f = _vectorize(expr, input_symbol)
+        self._df = _vectorize(sp.diff(expr, input_symbol), input_symbol)
+        # lambdify does not care about the printed form, so skip simplify
+        self.solutions = list(_solve_for_inverse(expr, input_symbol, output_symbol, simplify="none"))
+        if self.solutions:
+            self.kind = "closed-form"
+            self._branches = [_vectorize(sol, output_symbol) for sol in self.solutions]
+            self._pieces: List[Tuple[Any, Any, bool]] = []
+        else:
+            if domain != "real":
+                raise ValueError("numeric root finding covers real branches only; use --domain real")
+            self.kind = "numeric"
+            self._branches = []
+            self._pieces = self._monotone_pieces(interval, samples)
+
+    @property
+    def branch_count(self) -> int:
+        return len(self._branches) or len(self._pieces)
+
+    def __call__(self, y_values: Any, branch: Optional[int] = None) -> Any:
+        """Inverse at every y; shape (branches, *y.shape) unless one branch is chosen."""
+        np = _require_numpy()
+        y = np.asarray(y_values, dtype=complex if self.domain == "complex" else float)
+        indices = range(self.branch_count) if branch is None else [branch]
+        if branch is not None and not 0 <= branch < self.branch_count:
+            raise IndexError(f"branch {branch} out of range (0..{self.branch_count - 1})")
+        evaluate = self._closed_form if self._branches else self._root_find
+        with np.errstate(all="ignore"):
+            results = [evaluate(index, y) for index in indices]
+        if branch is not None:
+            return results[0]
+        dtype = complex if self.domain == "complex" else float
+        return np.stack(results) if results else np.empty((0,) + y.shape, dtype=dtype)
+
+    def _closed_form(self, index: int, y: Any) -> Any:
+        np = _require_numpy()
+        x = self._branches[index](y.astype(complex))
+        fx = self._f(x)
+        # solve() may return branches valid only on part of the domain; drop
+        # values that do not map back to y.
+        valid = np.isfinite(x) & (np.abs(fx - y) <= 1e-8 * (1 + np.abs(y)))
+        if self.domain == "real":
+            valid &= np.abs(x.imag) <= 1e-10 * (1 + np.abs(x.real))
+            return np.where(valid, x.real, np.nan)
+        return np.where(valid, x, complex(np.nan, np.nan))
+
+    def _real(self, func: Callable[[Any], Any], x: Any) -> Any:
+        np = _require_numpy()
+        values = np.asarray(func(x))
+        if np.iscomplexobj(values):
+            values = np.where(np.abs(values.imag) <= 1e-12 * (1 + np.abs(values.real)), values.real, np.nan)
+        return values.astype(float)
+
+    def _monotone_pieces(self, interval: Tuple[float, float], samples: int) -> List[Tuple[Any, Any, bool]]:
+        """Split f sampled on interval into (xs, fxs, increasing) runs."""
+        np = _require_numpy()
+        xs = np.linspace(interval[0], interval[1], samples)
+        with np.errstate(all="ignore"):
+            fx = self._real(self._f, xs)
+        slopes = np.sign(np.diff(fx))
+        pieces = []
+        start, direction = 0, 0.0
+        for cell, slope in enumerate(slopes):
+            if np.isnan(slope) or (direction and slope and slope != direction):
+                if direction:
+                    pieces.append((xs[start:cell + 1], fx[start:cell + 1], direction > 0))
+                start = cell if not np.isnan(slope) else cell + 1
+                direction = 0.0 if np.isnan(slope) else slope
+            elif slope and not direction:
+                direction = slope
+        if direction:
+            pieces.append((xs[start:], fx[start:], direction > 0))
+        return pieces
+
+    def _root_find(self, index: int, y: Any) -> Any:
+        np = _require_numpy()
+        xs, fxs, increasing = self._pieces[index]
+        sign = 1.0 if increasing else -1.0
+        # fxs is monotone but may have flat runs; searchsorted still brackets.
+        cell = np.clip(np.searchsorted(sign * fxs, sign * y) - 1, 0, len(xs) - 2)
+        inside = (sign * y >= sign * fxs[0]) & (sign * y <= sign * fxs[-1])
+        a, b = xs[cell], xs[cell + 1]
+        ga = fxs[cell] - y
+        x = (a + b) / 2
+        for _ in range(100):
+            gx = self._real(self._f, x) - y
+            done = (np.abs(gx) <= self.tol * (1 + np.abs(y))) | (b - a <= self.tol * (1 + np.abs(x)))
+            if done.all():
+                break
+            same = np.sign(gx) == np.sign(ga)
+            a = np.where(same, x, a)
+            ga = np.where(same, gx, ga)
+            b = np.where(same, b, x)
+            step = x - gx / self._real(self._df, x)
+            bad = ~np.isfinite(step) | (step <= a) | (step >= b)
+            x = np.where(done, x, np.where(bad, (a + b) / 2, step))
+        return np.where(inside, x, np.nan)
 
-    solutions = _solve_for_inverse(expr, input_symbol, output_symbol)
-    fallback_set = None
-    if not solutions:
-        fallback_set = _fallback_solveset(expr, input_symbol, output_symbol, args.domain)
 
+def compile_inverse(
+    function: Union[str, sp.Expr],
+    input_var: str = "x",
+    output_var: str = "y",
+    domain: str = "real",
+    interval: Tuple[float, float] = (-10.0, 10.0),
+    samples: int = 4097,
+    tol: float = 1e-12,
+) -> NumericInverse:
+    """
+    Build a NumericInverse for f; call it with an array of y values.
+
+    >>> inv = compile_inverse("x**2 + 3")
+    >>> inv([4.0, 7.0], branch=1)
+    array([1., 2.])
+    """
+    input_symbol = sp.Symbol(input_var)
+    output_symbol = sp.Symbol(output_var)
+    expr = function
+    if isinstance(function, str):
+        expr = _sympify_expression(function, input_symbol, output_symbol)
+    return NumericInverse(expr, input_symbol, output_symbol, domain, interval, samples, tol)
+
+
+def _read_y_values(path: str) -> Any:
+    np = _require_numpy()
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        return np.array([float(line) for line in handle if line.strip()])
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _run_numeric(parser: argparse.ArgumentParser, args: argparse.Namespace, expr: sp.Expr) -> int:
+    np = _require_numpy()
+    y = np.asarray(args.at, dtype=float) if args.at is not None else np.asarray(_read_y_values(args.at_file))
+    try:
+        inverse = NumericInverse(
+            expr, sp.Symbol(args.input_var), sp.Symbol(args.output_var), args.domain, tuple(args.interval)
+        )
+        values = inverse(y, args.branch)
+    except (ValueError, IndexError) as exc:
+        parser.error(str(exc))
+    if args.branch is not None:
+        values = values[np.newaxis]
+    columns = [args.branch] if args.branch is not None else range(inverse.branch_count)
+    print(f"# {inverse.kind} inverse, {inverse.branch_count} branch(es)", file=sys.stderr)
+    print(",".join([args.output_var] + [f"branch_{index}" for index in columns]))
+    for row in range(y.shape[0]):
+        print(",".join([repr(float(y[row]))] + [str(values[col, row]) for col in range(values.shape[0])]))
+    return 0
+
+
+def _format_result(
+    expr: sp.Expr,
+    outcome: SolveOutcome,
+    input_symbol: sp.Symbol,
+    output_symbol: sp.Symbol,
+    inverse_input_symbol: sp.Symbol,
+    simplify: str = "full",
+) -> List[str]:
     lines: List[str] = []
-    lines.append(f"Function f({input_symbol}) = {sp.simplify(expr)}")
-    if solutions:
+    lines.append(f"Function f({input_symbol}) = {_simplify(expr, simplify)}")
+    for stage in outcome.timed_out:
+        lines.append(f"  ({stage} timed out)")
+    result = outcome.result
+    if result is None:
+        lines.append(f"Solving failed: {outcome.error}")
+    elif result.solutions:
         lines.append("Inverse candidate(s) reported as y(x):")
-        for idx, sol in enumerate(solutions, start=1):
-            formatted = sp.simplify(sol.subs(output_symbol, inverse_input_symbol))
+        for idx, sol in enumerate(result.solutions, start=1):
+            # solutions were simplified once while solving; renaming y -> x
+            # cannot make them simpler
+            formatted = sol.subs(output_symbol, inverse_input_symbol)
             lines.append(f"  {idx}. {output_symbol} = {formatted}")
         lines.append(
             "Verify each branch under your domain assumptions; inverse input "
             f"variable is {inverse_input_symbol}."
         )
+    elif result.stage == "numeric":
+        lines.append("No symbolic solution within the budget; solve numerically:")
+        lines.append(f"  {result.fallback_set}")
     else:
         lines.append(
             "SymPy could not isolate the input variable explicitly. "
             "Implicit solution set:"
         )
-        lines.append(f"  {fallback_set}")
-    print("\n".join(lines))
-    return 0
+        lines.append(f"  {result.fallback_set}")
+    return lines
+
+
+def _result_record(
+    source: str,
+    outcome: SolveOutcome,
+    output_symbol: sp.Symbol,
+    inverse_input_symbol: sp.Symbol,
+) -> Dict[str, Any]:
+    result = outcome.result
+    record: Dict[str, Any] = {"function": source, "inverses": [], "implicit": None, "stage": None}
+    if result is not None:
+        record["inverses"] = [
+            str(sol.subs(output_symbol, inverse_input_symbol)) for sol in result.solutions
+        ]
+        record["implicit"] = str(result.fallback_set) if result.fallback_set is not None else None
+        record["stage"] = result.stage
+    record["timed_out"] = list(outcome.timed_out)
+    record["error"] = outcome.error
+    record["seconds"] = round(outcome.elapsed, 6)
+    return record
+
+
+def _emit(
+    args: argparse.Namespace,
+    source: str,
+    expr: sp.Expr,
+    outcome: SolveOutcome,
+    parse_seconds: float,
+    separator: bool = False,
+) -> None:
+    """Print one outcome; with --timings, report parse/solve/simplify/format times."""
+    input_symbol = sp.Symbol(args.input_var)
+    output_symbol = sp.Symbol(args.output_var)
+    inverse_input_symbol = sp.Symbol(args.inverse_input_var)
+    timings = dict(outcome.timings or {}) if args.timings else None
+    if timings is not None:
+        timings = {"parse": parse_seconds, **timings}
+    started = time.perf_counter()
+    if args.json:
+        record = _result_record(source, outcome, output_symbol, inverse_input_symbol)
+        if timings is not None:
+            timings["format"] = time.perf_counter() - started
+            record["timings"] = {stage: round(seconds, 6) for stage, seconds in timings.items()}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+    lines = _format_result(expr, outcome, input_symbol, output_symbol, inverse_input_symbol, args.simplify)
+    if separator:
+        print()
+    print("\n".join(lines), flush=True)
+    if timings is not None:
+        timings["format"] = time.perf_counter() - started
+        report = ", ".join(f"{stage} {seconds:.4f}s" for stage, seconds in timings.items())
+        print(f"timings [{source}]: {report}", file=sys.stderr)
+
+
+def _read_batch(handle: TextIO) -> Iterator[str]:
+    for line in handle:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield line
+
+
+def _run_batch(args: argparse.Namespace, cache: InverseCache) -> int:
+    input_symbol = sp.Symbol(args.input_var)
+    output_symbol = sp.Symbol(args.output_var)
+    inverse_input_symbol = sp.Symbol(args.inverse_input_var)
+
+    handle = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    sources: Dict[int, Tuple[str, sp.Expr, float]] = {}
+    failures = 0
+
+    def parsed() -> Iterator[Tuple[int, sp.Expr]]:
+        nonlocal failures
+        for job_id, source in enumerate(_read_batch(handle)):
+            started = time.perf_counter()
+            try:
+                expr = _sympify_expression(source, input_symbol, output_symbol)
+            except sp.SympifyError as exc:
+                failures += 1
+                print(f"Could not parse expression {source!r}: {exc}", file=sys.stderr)
+                continue
+            sources[job_id] = (source, expr, time.perf_counter() - started)
+            yield job_id, expr
+
+    timeouts = 0
+    try:
+        for count, outcome in enumerate(_solve_stream(parsed(), args, cache)):
+            source, expr, parse_seconds = sources.pop(outcome.job_id)
+            failures += outcome.result is None
+            timeouts += bool(outcome.timed_out)
+            _emit(args, source, expr, outcome, parse_seconds, separator=count > 0)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    print(f"cache: {cache.hits} hits, {cache.misses} misses; timeouts: {timeouts}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+class _ServerHandler(socketserver.StreamRequestHandler):
+    """One JSON line in ({"token", "argv", "cwd", "stdin"}), one JSON line out ({"stdout", "stderr", "code"})."""
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        expected = getattr(self.server, "token", None)
+        token = request.get("token")
+        if not expected or not isinstance(token, str) or not hmac.compare_digest(token, expected):
+            reply = {"stdout": "", "stderr": "unauthorized: missing or wrong server token\n", "code": 2}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            return
+        stdout, stderr = io.StringIO(), io.StringIO()
+        previous_cwd, previous_stdin = os.getcwd(), sys.stdin
+        try:
+            os.chdir(request.get("cwd") or previous_cwd)
+            sys.stdin = io.StringIO(request.get("stdin") or "")
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    option = _server_option(_build_parser().parse_args(request["argv"]))
+                    if option is not None:
+                        print(f"{option} cannot be forwarded to an inverse_finder server", file=sys.stderr)
+                        code = 2
+                    else:
+                        code = main(request["argv"])
+                except SystemExit as exc:
+                    code = exc.code if isinstance(exc.code, int) else 1
+                except Exception as exc:  # keep serving; the client sees the error
+                    print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+                    code = 1
+        finally:
+            sys.stdin = previous_stdin
+            os.chdir(previous_cwd)
+        reply = {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "code": code}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+def _server_option(args: argparse.Namespace) -> Optional[str]:
+    """The --serve/--connect option set in args, if any; a server must not run either."""
+    if args.serve is not None:
+        return "--serve"
+    if args.connect is not None:
+        return "--connect"
+    return None
+
+
+def _token_path(port: int) -> str:
+    return os.path.expanduser(f"~/.inverse_finder-{port}.token")
+
+
+def _read_token(port: int) -> Optional[str]:
+    """The shared server token: $INVERSE_FINDER_TOKEN, else the per-port token file."""
+    token = os.environ.get(TOKEN_ENV)
+    if token:
+        return token
+    try:
+        with open(_token_path(port), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except OSError:
+        return None
+
+
+def serve(port: int) -> None:
+    """
+    Answer inverse_finder invocations sent with --connect on 127.0.0.1:port.
+
+    SymPy is imported once here and the simplification memo stays warm, so
+    each request costs only the solve itself. Requests run one at a time.
+
+    Expressions go through sympify, which evaluates Python code, so any local
+    user who can reach the port could run code as this process. Every request
+    must therefore carry a shared token: $INVERSE_FINDER_TOKEN if set,
+    otherwise a fresh one written to ~/.inverse_finder-PORT.token (mode 0600)
+    and removed on shutdown.
+    """
+    sp.Symbol("x")  # force the lazy import before the first request
+    with socketserver.TCPServer(("127.0.0.1", port), _ServerHandler) as server:
+        bound = server.server_address[1]
+        server.token = os.environ.get(TOKEN_ENV)
+        token_file = None
+        if not server.token:
+            server.token = secrets.token_hex(16)
+            token_file = _token_path(bound)
+            fd = os.open(token_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)  # an older file keeps its mode otherwise
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(server.token + "\n")
+        print(f"inverse_finder serving on 127.0.0.1:{bound}", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if token_file is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(token_file)
+
+
+def _strip_option(argv: Sequence[str], option: str) -> List[str]:
+    """Drop "--opt VALUE" / "--opt=VALUE" from argv."""
+    stripped: List[str] = []
+    skip = False
+    for token in argv:
+        if skip:
+            skip = False
+        elif token == option:
+            skip = True
+        elif not token.startswith(option + "="):
+            stripped.append(token)
+    return stripped
+
+
+def _forward(args: argparse.Namespace, argv: Sequence[str]) -> int:
+    """Send this invocation to a --serve process and replay its output."""
+    if args.serve is not None:
+        print("--serve cannot be combined with --connect", file=sys.stderr)
+        return 2
+    forwarded = _strip_option(argv, "--connect")
+    stdin = None
+    prompts = args.function is None and args.batch is None and not sys.stdin.isatty()
+    if args.batch == "-" or args.at_file == "-" or prompts:
+        stdin = sys.stdin.read()
+    token = _read_token(args.connect)
+    if token is None:
+        print(f"No token for inverse_finder server on port {args.connect}: set ${TOKEN_ENV}", file=sys.stderr)
+        return 2
+    request = {"token": token, "argv": forwarded, "cwd": os.getcwd(), "stdin": stdin}
+    try:
+        with socket.create_connection(("127.0.0.1", args.connect)) as conn:
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+    except OSError as exc:
+        print(f"Could not reach inverse_finder server on port {args.connect}: {exc}", file=sys.stderr)
+        return 2
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["code"]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.connect is not None:
+        return _forward(args, argv)
+    if args.serve is not None:
+        serve(args.serve)
+        return 0
+
+    cache = InverseCache(args.cache) if args.cache or args.batch else None
+    try:
+        if args.batch:
+            return _run_batch(args, cache)
+        return _run_single(parser, args, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _run_single(parser: argparse.ArgumentParser, args: argparse.Namespace, cache: Optional[InverseCache]) -> int:
+    function_expr = args.function
+    if function_expr is None:
+        try:
+            function_expr = input("Enter f(x): ").strip()
+        except EOFError:
+            parser.error("A function expression is required.")
+        if not function_expr:
+            parser.error("A function expression is required.")
+
+    input_symbol = sp.Symbol(args.input_var)
+    output_symbol = sp.Symbol(args.output_var)
+
+    started = time.perf_counter()
+    try:
+        expr = _sympify_expression(function_expr, input_symbol, output_symbol)
+    except sp.SympifyError as exc:
+        parser.error(f"Could not parse expression: {exc}")
+    parse_seconds = time.perf_counter() - started
+
+    if args.at is not None or args.at_file is not None:
+        return _run_numeric(parser, args, expr)
+
+    (outcome,) = _solve_stream([(0, expr)], args, cache)
+    _emit(args, function_expr, expr, outcome, parse_seconds)
+    return 0 if outcome.result is not None else 1
 
 
 if __name__ == "__main__":
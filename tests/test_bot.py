@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import bot
+
+# Импорт bot.py не должен тянуть discord и google.generativeai: они
+# загружаются только в create_client() и get_genai(). Перехватчик
+# записывает и попытки импорта, так что тест работает и без этих пакетов
+_PROBE = """
+import sys
+
+attempted = []
+
+class Recorder:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in ("discord", "google"):
+            attempted.append(name)
+        return None
+
+sys.meta_path.insert(0, Recorder())
+sys.path.insert(0, {root!r})
+import bot
+print("heavy:", attempted)
+"""
+
+
+def test_import_skips_heavy_modules():
+    root = os.path.dirname(os.path.abspath(bot.__file__))
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(root=root)],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "heavy: []" in result.stdout
+
+
+def test_model_is_not_created_on_import():
+    assert bot._genai is None
+    assert bot._model is None
@@ -0,0 +1,240 @@
+import io
+
+import pytest
+
+import calculator
+
+
+def test_table_uses_var_bindings_under_row_values():
+    rows = io.StringIO("x,k\n1,2\n3,4\n")
+    out = io.StringIO()
+    count, errors = calculator.evaluate_table(
+        calculator.compile_expression("x * k + c"), rows, out, env={"k": 100.0, "c": 0.5}
+    )
+    assert (count, errors) == (2, 0)
+    # k есть в строке — значение из строки важнее --var
+    assert out.getvalue().splitlines() == ["x,k,result", "1,2,2.5", "3,4,12.5"]
+
+
+def test_table_still_reports_missing_columns():
+    with pytest.raises(calculator.ExpressionError):
+        calculator.evaluate_table(calculator.compile_expression("x + z"), io.StringIO("x\n1\n"), io.StringIO())
+
+
+def test_main_table_passes_var(tmp_path, capsys):
+    table = tmp_path / "t.csv"
+    table.write_text("x\n1\n2\n", encoding="utf-8")
+    assert calculator.main(["--table", str(table), "--expr", "x * k", "--var", "k=10"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["x,result", "1,10.0", "2,20.0"]
+
+
+def test_vector_constant_expression_is_broadcast_per_block(tmp_path):
+    np = pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("x\n1\n2\n3\n", encoding="utf-8")
+    out = tmp_path / "out.npy"
+    count, masked = calculator.evaluate_vector_stream(
+        calculator.compile_expression("2*3"), str(table), out=str(out), chunk_rows=2
+    )
+    assert (count, masked) == (3, 0)
+    assert np.load(out).tolist() == [6.0, 6.0, 6.0]
+
+
+def test_vector_constant_expression_to_csv(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("x\n1\n2\n", encoding="utf-8")
+    assert calculator.main(["--vector", "--table", str(table), "--expr", "2*3"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["result", "6.0", "6.0"]
+
+
+def test_evaluate_columns_uses_rows_without_columns():
+    pytest.importorskip("numpy")
+    result = calculator.evaluate_columns(calculator.compile_expression("1 + 1"), {}, rows=4)
+    assert result.tolist() == [2.0, 2.0, 2.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "source, env, expected",
+    [("round(x, 2)", {"x": 3.14159}, 3.14), ("round(x)", {"x": 2.6}, 3), ("round(1234.5, -2)", {}, 1200.0)],
+)
+def test_round_with_digits_in_scalar_mode(source, env, expected):
+    assert calculator.evaluate(source, env) == expected
+
+
+def test_main_round_with_digits(capsys):
+    assert calculator.main(["round(x, 2)", "--var", "x=2.71828"]) == 0
+    assert capsys.readouterr().out.strip() == "2.72"
+
+
+def test_vector_mode_uses_var_constants(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("x,k\n1,5\n2,6\n", encoding="utf-8")
+    argv = ["--vector", "--table", str(table), "--expr", "x * k + c", "--var", "c=0.5", "--var", "k=100"]
+    assert calculator.main(argv) == 0
+    # k есть в таблице — столбец важнее --var
+    assert capsys.readouterr().out.splitlines() == ["result", "5.5", "12.5"]
+
+
+def test_vector_arrays_use_var_constants(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    np.save(tmp_path / "x.npy", np.array([1.0, 2.0, 3.0]))
+    argv = ["--array", f"x={tmp_path / 'x.npy'}", "--expr", "x * k", "--var", "k=10"]
+    assert calculator.main(argv) == 0
+    assert capsys.readouterr().out.splitlines() == ["result", "10.0", "20.0", "30.0"]
+
+
+def test_vector_csv_with_blank_lines_and_empty_cells(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("x,y\n1,2\n\n3,\n5,6\n", encoding="utf-8")
+    assert calculator.main(["--vector", "--table", str(table), "--expr", "x + y"]) == 0
+    # пустая ячейка -> NaN -> пустой результат; пустая строка пропускается
+    assert capsys.readouterr().out.splitlines() == ["result", "3.0", "", "11.0"]
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.npy"])
+def test_vector_error_leaves_no_output_file(tmp_path, name):
+    pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("x\n1\n2\n", encoding="utf-8")
+    out = tmp_path / name
+    # переменной z нет ни в таблице, ни в --var
+    assert calculator.main(["--vector", "--table", str(table), "--expr", "x + z", "--output", str(out)]) == 1
+    assert not out.exists()
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1 + 2 * 3", 7.0),
+        ("(1 + 2) * 3", 9.0),
+        ("10 - 4 - 3", 3.0),
+        ("8 / 4 / 2", 1.0),
+        ("2 ** 3 ** 2", 512.0),  # ** правоассоциативна
+        ("-2 ** 2", -4.0),  # и сильнее унарного минуса слева
+        ("2 ** -1", 0.5),
+        ("2 ^ 3", 8.0),
+        ("--3", 3.0),
+        ("1.5e2 + .5", 150.5),
+        ("max(1, 7, 3) + min(4, 2)", 9.0),
+        ("log(8, 2)", 3.0),
+        ("sqrt(16) * pi / pi", 4.0),
+    ],
+)
+def test_precedence_and_functions(source, expected):
+    assert calculator.evaluate(source) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("source", ["", "1 +", "(1 + 2", "1 2", "foo(1)", "sqrt(1, 2)", "1 $ 2"])
+def test_parse_errors(source):
+    with pytest.raises(calculator.ExpressionError):
+        calculator.parse(source)
+
+
+def test_compiled_expression_is_reused_with_variables():
+    expression = calculator.compile_expression("a * x + b")
+    assert expression is calculator.compile_expression("a * x + b")
+    assert expression.variables == {"a", "x", "b"}
+    assert [expression(a=2, x=x, b=1) for x in (0, 1, 2)] == [1.0, 3.0, 5.0]
+    with pytest.raises(calculator.ExpressionError):
+        expression.evaluate({"a": 1})
+
+
+def test_constant_subexpressions_are_folded():
+    assert calculator.compile_expression("2 * pi + 1").constant == pytest.approx(2 * 3.141592653589793 + 1)
+    assert calculator.compile_expression("x + 1").constant is None
+
+
+def test_evaluate_lines_keeps_assignments_and_reports_errors():
+    lines = ["# комментарий", "a = 2", "", "b = a * 3  # шесть", "b / 0", "b + c", "b + 1"]
+    results = list(calculator.evaluate_lines(lines))
+    assert results[:2] == [("a = 2", 2.0, None), ("b = a * 3", 6.0, None)]
+    assert results[2] == ("b / 0", None, "деление на ноль")
+    assert results[3][1] is None and "'c'" in results[3][2]
+    assert results[4] == ("b + 1", 7.0, None)
+
+
+def test_table_counts_bad_rows_and_keeps_going():
+    out = io.StringIO()
+    count, errors = calculator.evaluate_table(
+        calculator.compile_expression("1 / x"), io.StringIO("x\n2\n0\nabc\n4\n"), out
+    )
+    assert (count, errors) == (4, 2)
+    lines = out.getvalue().splitlines()
+    assert lines[1] == "2,0.5" and lines[4] == "4,0.25"
+    assert lines[2] == "0,ошибка: деление на ноль"
+
+
+def test_main_file_mode(tmp_path, capsys):
+    script = tmp_path / "f.txt"
+    script.write_text("r = 2\npi * r ** 2\n", encoding="utf-8")
+    assert calculator.main(["--file", str(script)]) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "r = 2\t2.0"
+    assert out[1].startswith("pi * r ** 2\t12.566")
+
+
+def test_vector_masks_instead_of_raising():
+    np = pytest.importorskip("numpy")
+    x = np.array([1.0, 0.0, -4.0, 800.0])
+    result = calculator.evaluate_columns(calculator.compile_expression("1 / x + sqrt(x) + exp(x)"), {"x": x})
+    # 0 -> деление на ноль, -4 -> sqrt, 800 -> переполнение exp
+    assert result.mask.tolist() == [False, True, True, True]
+    assert result[0] == pytest.approx(1 + 1 + np.e)
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["x * y - 3", "-x ** 2 + y", "max(x, y, 2) - min(x, 1)", "log(x, 2) + ln(y)", "round(x / 3, 2)", "abs(x - y) * pi"],
+)
+def test_vector_matches_scalar_engine(source):
+    np = pytest.importorskip("numpy")
+    x = np.array([0.5, 2.0, 7.0, 10.0])
+    y = np.array([3.0, 1.5, 9.0, 0.25])
+    expression = calculator.compile_expression(source)
+    vector = calculator.evaluate_columns(expression, {"x": x, "y": y})
+    scalar = [expression(x=a, y=b) for a, b in zip(x.tolist(), y.tolist())]
+    assert vector.tolist() == pytest.approx(scalar)
+
+
+def test_vector_round_needs_constant_digits():
+    pytest.importorskip("numpy")
+    with pytest.raises(calculator.ExpressionError):
+        calculator.evaluate_columns(calculator.compile_expression("round(x, n)"), {"x": [1.0], "n": [1.0]})
+
+
+def test_vector_raw_f64_to_npy_in_chunks(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    x = np.arange(10, dtype=np.float64)
+    x.tofile(tmp_path / "x.f64")
+    out = tmp_path / "out.npy"
+    argv = ["--array", f"x={tmp_path / 'x.f64'}", "--expr", "1 / (x - 3)", "--output", str(out), "--chunk-rows", "3"]
+    assert calculator.main(argv) == 0
+    assert "Строк: 10, замаскировано: 1" in capsys.readouterr().err
+    result = np.load(out)
+    assert result.shape == (10,)
+    assert np.isnan(result[3])
+    assert result[[0, 4, 9]].tolist() == pytest.approx([-1 / 3, 1.0, 1 / 6])
+
+
+def test_vector_csv_chunks_to_raw_output(tmp_path):
+    np = pytest.importorskip("numpy")
+    table = tmp_path / "t.csv"
+    table.write_text("a;b\n" + "".join(f"{i};{i + 1}\n" for i in range(7)), encoding="utf-8")
+    out = tmp_path / "out.f64"
+    count, masked = calculator.evaluate_vector_stream(
+        calculator.compile_expression("a * b"), str(table), out=str(out), delimiter=";", chunk_rows=2
+    )
+    assert (count, masked) == (7, 0)
+    assert np.fromfile(out, dtype=np.float64).tolist() == [i * (i + 1) for i in range(7)]
+
+
+def test_vector_arrays_of_different_length(tmp_path):
+    np = pytest.importorskip("numpy")
+    np.save(tmp_path / "x.npy", np.zeros(3))
+    np.save(tmp_path / "y.npy", np.zeros(4))
+    arrays = {"x": str(tmp_path / "x.npy"), "y": str(tmp_path / "y.npy")}
+    with pytest.raises(calculator.ExpressionError):
+        calculator.evaluate_vector_stream(calculator.compile_expression("x + y"), arrays=arrays)
@@ -0,0 +1,213 @@
+import pytest
+
+from inheritance_engine import (
+    LAW_GRANDCHILDREN,
+    LAW_PLIKTDEL,
+    LAW_SPOUSE_WITH_CHILDREN,
+    LAW_SPOUSE_WITH_PARENTS,
+    EstateFacts,
+    FamilyTree,
+    distribute,
+    distribute_many,
+    distribute_record,
+    stirpes_many,
+    sweep,
+)
+
+G = 100_000.0
+
+
+def shares(dist):
+    return {share.role: share.per_person for share in dist.shares}
+
+
+def test_family_rejects_duplicate_names():
+    records = [
+        {"name": "Ola"},
+        {"name": "Kari", "parent": "Ola"},
+        {"name": "Ola", "parent": "Kari"},
+    ]
+    with pytest.raises(ValueError, match="Ola"):
+        FamilyTree.from_records(records)
+
+
+def test_family_ids_disambiguate_namesakes():
+    records = [
+        {"id": "ola-1", "name": "Ola", "alive": False},
+        {"id": "kari", "name": "Kari", "parent": "ola-1", "alive": False},
+        {"id": "ola-2", "name": "Ola", "parent": "kari"},
+        {"id": "per", "name": "Per"},
+    ]
+    tree = FamilyTree.from_records(records)
+    assert tree.branch_count() == 2
+    assert tree.heirs(100.0) == {"Per": 50.0, "Ola": 50.0}
+
+
+def test_family_rejects_duplicate_ids():
+    with pytest.raises(ValueError):
+        FamilyTree.from_records([{"id": 1, "name": "A"}, {"id": 1, "name": "B"}])
+
+
+def test_from_branches_splits_per_dead_child():
+    tree = FamilyTree.from_branches(1, [1, 3, 0])
+    # умерший ребёнок без внуков ветви не образует
+    assert tree.branch_count() == 3
+    heirs = tree.heirs(900.0)
+    assert heirs["Ребёнок 1"] == pytest.approx(300.0)
+    assert heirs["Внук 2.1"] == pytest.approx(300.0)
+    assert [heirs[f"Внук 3.{i}"] for i in (1, 2, 3)] == pytest.approx([100.0] * 3)
+
+
+def test_spouse_with_children_gets_quarter():  # § 8
+    dist = distribute(EstateFacts(estate=8_000_000, G=G, spouse=True, alive_children=2))
+    assert shares(dist) == pytest.approx({"spouse": 2_000_000, "child": 3_000_000})
+    assert LAW_SPOUSE_WITH_CHILDREN in dist.laws_used
+
+
+def test_spouse_minimum_floor_with_children():  # § 8: не меньше 4G
+    dist = distribute(EstateFacts(estate=1_000_000, G=G, spouse=True, alive_children=2))
+    assert shares(dist) == pytest.approx({"spouse": 400_000, "child": 300_000})
+
+
+def test_spouse_minimum_takes_small_estate_whole():
+    dist = distribute(EstateFacts(estate=300_000, G=G, spouse=True, alive_children=1))
+    assert shares(dist) == pytest.approx({"spouse": 300_000, "child": 0})
+
+
+def test_spouse_with_parents_gets_half_or_6g():  # § 9
+    dist = distribute(EstateFacts(estate=1_000_000, G=G, spouse=True, parents=2))
+    assert shares(dist) == pytest.approx({"spouse": 600_000, "parent": 200_000})
+    assert LAW_SPOUSE_WITH_PARENTS in dist.laws_used
+
+
+def test_pliktdel_two_thirds_per_branch():  # § 50
+    dist = distribute(EstateFacts(estate=3_000_000, G=G, alive_children=2, has_will=True))
+    assert shares(dist) == pytest.approx({"child": 1_000_000})
+    assert dist.by_will == pytest.approx(1_000_000)
+    assert dist.laws_used[0] == LAW_PLIKTDEL
+
+
+def test_pliktdel_capped_at_15g_per_branch():  # § 50
+    dist = distribute(EstateFacts(estate=30_000_000, G=G, alive_children=2, has_will=True))
+    assert shares(dist) == pytest.approx({"child": 1_500_000})
+    assert dist.by_will == pytest.approx(27_000_000)
+
+
+def test_will_keeps_spouse_minimum():  # § 10
+    dist = distribute(EstateFacts(estate=30_000_000, G=G, spouse=True, alive_children=1, has_will=True))
+    assert shares(dist) == pytest.approx({"spouse": 400_000, "child": 1_500_000})
+    assert dist.by_will == pytest.approx(30_000_000 - 1_900_000)
+
+
+def test_stirpes_differs_from_counter_split():  # § 4
+    # два умерших ребёнка: у одного 1 внук, у другого 3
+    counters = distribute(EstateFacts(estate=1_200_000, G=G, dead_children=2, grandchildren=4))
+    assert shares(counters) == pytest.approx({"grandchild": 300_000})
+
+    tree = distribute(EstateFacts(estate=1_200_000, G=G, family=FamilyTree.from_branches(0, [1, 3])))
+    assert tree.heirs == pytest.approx(
+        {"Внук 1.1": 600_000, "Внук 2.1": 200_000, "Внук 2.2": 200_000, "Внук 2.3": 200_000}
+    )
+    assert LAW_GRANDCHILDREN in tree.laws_used
+
+
+def test_no_heirs_goes_unclaimed():  # § 76
+    dist = distribute(EstateFacts(estate=500_000, G=G))
+    assert dist.unclaimed == pytest.approx(500_000)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_distribute_many_matches_distribute(workers):
+    records = [
+        {"estate": 1_000_000 + 250_000 * i, "G": G, "spouse": i % 2 == 0, "alive_children": i % 3}
+        for i in range(12)
+    ]
+    results = list(distribute_many(records, workers=workers, chunk_size=5))
+    expected = [distribute(EstateFacts.from_dict(r)).to_dict() for r in records]
+    assert [r["shares"] for r in results] == [e["shares"] for e in expected]
+
+
+def test_sweep_matches_scalar_engine():
+    np = pytest.importorskip("numpy")
+    estates = np.linspace(0, 40_000_000, 9)
+    grid = sweep(estate=estates, G=[G], alive_children=[0, 1, 3], spouse=True, has_will=[False, True])
+    for row in grid.rows():
+        dist = distribute(
+            EstateFacts(
+                estate=row["estate"],
+                G=G,
+                spouse=True,
+                alive_children=int(row["alive_children"]),
+                has_will=bool(row["has_will"]),
+            )
+        )
+        assert row["spouse"] == pytest.approx(shares(dist).get("spouse", 0.0))
+        assert row["child"] == pytest.approx(shares(dist).get("child", 0.0))
+        assert row["by_will"] == pytest.approx(dist.by_will)
+
+
+def test_family_zero_id_is_a_real_id():
+    records = [
+        {"id": 0, "name": "Ola", "alive": False},
+        {"id": 1, "name": "Ola", "parent": 0},
+        {"id": 2, "name": "Kari"},
+    ]
+    tree = FamilyTree.from_records(records)
+    assert tree.branch_count() == 2
+    assert tree.heirs(100.0) == {"Ola": 50.0, "Kari": 50.0}
+
+
+def test_stirpes_to_any_depth():  # § 4
+    tree = FamilyTree()
+    dead = tree.add(0, alive=False)
+    tree.add(0, alive=False)  # умер без потомков — ветви нет
+    alive = tree.add(0, name="A")
+    tree.add(alive, name="A1")  # у живого ребёнка внуки не наследуют
+    grandchild = tree.add(dead, alive=False)
+    tree.add(dead, name="B2")
+    tree.add(grandchild, name="C1")
+    tree.add(grandchild, name="C2")
+    assert tree.heirs(800.0) == pytest.approx({"A": 400.0, "B2": 200.0, "C1": 100.0, "C2": 100.0})
+    assert sum(tree.stirpes(800.0)) == pytest.approx(800.0)
+
+
+def test_stirpes_deep_chain_without_recursion():
+    tree = FamilyTree()
+    node = 0
+    for _ in range(100_000):
+        node = tree.add(node, alive=False)
+    tree.add(node, name="last")
+    tree.add(0, name="other")
+    assert tree.heirs(10.0) == pytest.approx({"last": 5.0, "other": 5.0})
+
+
+def test_stirpes_many_matches_per_tree():
+    trees = [FamilyTree.from_branches(a, g) for a, g in [(2, []), (0, [2, 2]), (1, [0, 3])]]
+    amounts = [100.0, 400.0, 90.0]
+    expected = [tree.stirpes(amount) for tree, amount in zip(trees, amounts)]
+    assert list(stirpes_many(trees, amounts)) == expected
+
+
+def test_family_from_dict_records():
+    record = {
+        "id": "r1",
+        "estate": 900_000,
+        "G": G,
+        "spouse": True,
+        "family": [
+            {"name": "A", "alive": False},
+            {"name": "B", "parent": "A"},
+            {"name": "C", "parent": "A", "alive": "false"},
+            {"name": "D", "parent": "C"},
+            {"name": "E"},
+        ],
+    }
+    result = distribute_record(record)
+    assert result["id"] == "r1"
+    # супругу 4G, остальное — двум ветвям, ветвь A делится между B и веткой C
+    assert result["heirs"] == pytest.approx({"E": 250_000, "B": 125_000, "D": 125_000})
+
+
+def test_family_with_unknown_parent_is_reported():
+    result = distribute_record({"estate": 1, "family": [{"name": "X", "parent": "Y"}]})
+    assert "Y" in result["error"]
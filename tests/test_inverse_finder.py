@@ -0,0 +1,91 @@
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import inverse_finder
+
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def server():
+    with socketserver.TCPServer(("127.0.0.1", 0), inverse_finder._ServerHandler) as srv:
+        srv.token = TOKEN
+        thread = threading.Thread(target=srv.serve_forever, daemon=True)
+        thread.start()
+        yield srv.server_address[1]
+        srv.shutdown()
+
+
+def _request(port, argv, token=TOKEN):
+    request = {"argv": argv} if token is None else {"token": token, "argv": argv}
+    with socket.create_connection(("127.0.0.1", port), timeout=30) as conn:
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with conn.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+@pytest.mark.parametrize("argv", [["--serve", "0"], ["--ser", "0"], ["--connect", "1", "x"]])
+def test_server_refuses_serve_and_connect(server, argv):
+    reply = _request(server, argv)
+    assert reply["code"] == 2
+    assert "cannot be forwarded" in reply["stderr"]
+    # сервер продолжает отвечать
+    assert _request(server, ["--help"])["code"] == 0
+
+
+@pytest.mark.parametrize("token", [None, "", "wrong-token"])
+def test_server_requires_token(server, token):
+    reply = _request(server, ["--help"], token=token)
+    assert reply["code"] == 2
+    assert "unauthorized" in reply["stderr"]
+    assert reply["stdout"] == ""
+
+
+def test_connect_sends_token(server, monkeypatch, capsys):
+    monkeypatch.setenv(inverse_finder.TOKEN_ENV, TOKEN)
+    assert inverse_finder.main(["--connect", str(server), "x + 1"]) == 0
+    assert "x - 1" in capsys.readouterr().out
+
+
+def test_connect_without_token(monkeypatch, tmp_path, capsys):
+    monkeypatch.delenv(inverse_finder.TOKEN_ENV, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert inverse_finder.main(["--connect", "1", "x"]) == 2
+    assert "No token" in capsys.readouterr().err
+
+
+def test_connect_rejects_serve(capsys):
+    assert inverse_finder.main(["--connect", "1", "--serve", "2", "x"]) == 2
+    assert "--serve cannot be combined with --connect" in capsys.readouterr().err
+
+
+# --help и ошибки аргументов не должны импортировать SymPy (~0.4 с)
+STARTUP_BUDGET = 1.0
+
+_PROBE = """
+import runpy, sys
+sys.argv = [{path!r}] + {argv!r}
+try:
+    runpy.run_path({path!r}, run_name="__main__")
+except SystemExit as exc:
+    code = exc.code
+print("sympy-loaded:", "sympy" in sys.modules, file=sys.stderr)
+"""
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["--workers", "0", "x"], ["--no-such-option"]])
+def test_startup_paths_stay_fast_without_sympy(argv):
+    script = _PROBE.format(path=inverse_finder.__file__, argv=argv)
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+    elapsed = time.perf_counter() - started
+    assert "sympy-loaded: False" in proc.stderr
+    assert elapsed < STARTUP_BUDGET, f"{argv}: {elapsed:.2f} s"
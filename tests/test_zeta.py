@@ -0,0 +1,16 @@
+import pytest
+
+import zeta
+
+
+def test_checkpoint_without_workers_is_written_and_resumed(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    checkpoint = tmp_path / "run.bin"
+    zeta.main(["2", "4", "--checkpoint", str(checkpoint)])
+    assert np.fromfile(checkpoint, dtype=complex).size == 2
+    first = capsys.readouterr().out
+
+    zeta.main(["2", "4", "3", "--checkpoint", str(checkpoint)])
+    resumed = capsys.readouterr().out
+    assert resumed.startswith(first)
+    assert np.fromfile(checkpoint, dtype=complex).size == 3
@@ -1,35 +1,214 @@
 """
 Riemann zeta approximation for real and complex inputs.
-- Uses the Dirichlet eta series for Re(s) > 0 (and s != 1).
-- Provides exact values for non-positive integers via Bernoulli numbers.
-- For negative non-integers, falls back to the eta series (limited accuracy).
+- Uses the Dirichlet eta series for Re(s) >= 0 (and s != 1).
+- Provides exact values for non-positive integers via Bernoulli numbers,
+  generated on demand.
+- For Re(s) < 0 uses the functional equation
+  zeta(s) = 2^s pi^(s-1) sin(pi s / 2) Gamma(1 - s) zeta(1 - s).
+- Euler-Maclaurin summation covers heights the accelerated eta series
+  cannot reach away from the critical line.
+- riemann_zeta_many evaluates whole NumPy arrays of s at once (--batch).
+- The eta series can be summed directly or with convergence acceleration
+  (Borwein / Cohen-Villegas-Zagier weights, or Euler's binomial transform),
+  which needs tens of terms instead of hundreds of thousands.
+- On the critical line at large heights the Riemann-Siegel formula
+  Z(t) = exp(i theta(t)) zeta(1/2 + it) is used instead (O(sqrt(t)) terms),
+  which also drives the zero scanner (--zeros).
+- sweep() spreads large inputs over a process pool in chunks (--workers),
+  streaming results back in order with an optional resumable checkpoint.
+- --input/--output stream s values from text, CSV or binary arrays and write
+  CSV, JSONL or .npy incrementally, so sweeps run in bounded memory.
+- ZetaCache memoizes results in an LRU dict, optionally backed by a SQLite
+  file that several processes can share (--cache, --cache-size).
+- riemann_zeta_mp evaluates to any number of digits with mpmath arithmetic,
+  choosing working precision and term counts from the target (--precision).
 """
 
 import argparse
+import cmath
+import csv
+import functools
+import itertools
+import json
 import math
-from typing import Iterable, List, Union
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 Number = Union[float, complex]
 
-# Bernoulli numbers B_n for n up to 20 (odd n > 1 are zero).
-BERNOULLI = {
-    0: 1.0,
-    1: -0.5,
-    2: 1.0 / 6.0,
-    4: -1.0 / 30.0,
-    6: 1.0 / 42.0,
-    8: -1.0 / 30.0,
-    10: 5.0 / 66.0,
-    12: -691.0 / 2730.0,
-    14: 7.0 / 6.0,
-    16: -3617.0 / 510.0,
-    18: 43867.0 / 798.0,
-    20: -174611.0 / 330.0,
-}
+# Streaming input/output formats; "auto" picks one from the file extension.
+INPUT_FORMATS = ("text", "csv", "npy", "f64", "c128")
+OUTPUT_FORMATS = ("csv", "jsonl", "npy")
+
+# Upper bound on the number of complex terms held in memory at once by the
+# batch evaluator (rows x terms per block).
+BATCH_BLOCK_ELEMENTS = 1 << 20
+
+# Summation backends: the eta series (direct or accelerated) or
+# Euler-Maclaurin summation of zeta itself.
+METHODS = ("direct", "borwein", "euler", "euler-maclaurin")
+DEFAULT_METHOD = "borwein"
+
+# The Borwein coefficients grow like (3 + sqrt(8))^n and overflow a double
+# past n ~ 400; the Euler weights are binomial tails over 2^n.
+BORWEIN_MAX_TERMS = 380
+EULER_MAX_TERMS = 500
+
+# Riemann-Siegel remainder after the C0..C4 correction terms is roughly
+# RS_ERROR_SCALE / t^3 (double precision adds about 1e-16 * t * log t on
+# top). Below RS_MIN_HEIGHT the asymptotic expansion is not trusted.
+RS_ERROR_SCALE = 0.025
+RS_MIN_HEIGHT = 50.0
+
+# Riemann-Siegel correction coefficients C_k(p), k = 0..4, as Taylor series
+# in x = p - 1/2, derived from Psi(p) = cos(2pi(p^2 - p - 1/16)) / cos(2pi p).
+# Only even (k even) or odd (k odd) powers of x occur; each tuple lists the
+# coefficients of x^k, x^(k+2), x^(k+4), ... with x^k taken as x^(k mod 2).
+RS_COEFFICIENTS = (
+    (
+        0.3826834323650898, 1.7489618723100817, 2.118025207685496,
+        -0.8707216670511481, -3.4733112243465167, -1.6626947308999325,
+        1.216731288919232, 1.3014304161007977, 0.03051102182736167,
+        -0.3755803051545095, -0.1085784416564066, 0.051832902999549624,
+        0.029999480619902277, -0.0022759396706125644, -0.004382647416580339,
+        -0.0004064230183729847, 0.0004006097785422114, 8.971057991388841e-05,
+        -2.3025650027239108e-05, -9.380006601906792e-06, 6.323514947609108e-07,
+        6.551022819231502e-07,
+    ),
+    (
+        -0.053650205256750697, 0.11027818741081483, 1.2317200154315227,
+        1.2634964862799458, -1.695108997559503, -2.9998711967650102,
+        -0.10819944959899208, 1.9407662946212714, 0.7838423561500687,
+        -0.5054829667900366, -0.38450723496057976, 0.03747264646531532,
+        0.09092026610973176, 0.01044923755006451, -0.012582979651583417,
+        -0.003399503721151274, 0.0010410950537714891, 0.0005010949051118486,
+        -3.956359669003182e-05, -4.7624592453571896e-05, -1.8539355338085133e-06,
+        3.1936918080068973e-06, 4.0907807608506065e-07,
+    ),
+    (
+        0.005188542830293168, 0.0012378633552253898, -0.18137505725166997,
+        0.14291492748532125, 1.3303391766687565, 0.3522472353403734,
+        -2.421001595891951, -1.6760787022538108, 1.3689416723328371,
+        1.5539019430222982, -0.1722164273472998, -0.6359068055045431,
+        -0.09911649873041208, 0.14033480067387008, 0.04782352019827292,
+        -0.017356040641479782, -0.010225012534028593, 0.0009274149159794888,
+        0.0013572194372373386, 6.41369012029388e-05, -0.0001230080569819663,
+        -1.83135074047892e-05, 7.821628604322627e-06, 2.0087542484759946e-06,
+    ),
+    (
+        -0.0026794321814389136, 0.02995372109103515, -0.042570172541828696,
+        -0.28997965779803886, 0.4888831999235446, 1.230855876395746,
+        -0.8297560708527408, -2.249763536666567, 0.07845139961005472,
+        1.7467492800868893, 0.45968080979749937, -0.6619353471039775,
+        -0.31590441036173633, 0.12844792545207495, 0.10073382716626152,
+        -0.009530183848825268, -0.019264421687514088, -0.001246463715876929,
+        0.0024243969641103086, 0.000437647697741857, -0.00020714032687001792,
+        -6.274344504186516e-05, 1.157534381459567e-05, 5.88385492454038e-06,
+    ),
+    (
+        0.00046483389361763383, -0.004022642946136188, 0.003847177051796127,
+        0.06581175135809486, -0.19604124343694448, -0.20854053686358853,
+        0.9507754185141751, 0.5341535312914873, -1.67634944117634,
+        -1.076747157875129, 1.235339301656597, 1.0257825340057276,
+        -0.40124095793988546, -0.5036663995108304, 0.03573487795502745,
+        0.14431763086785418, 0.01509152741790347, -0.026098874779194363,
+        -0.006126628379519262, 0.003077503129870841, 0.0011562478934088753,
+        -0.00022775966758472127, -0.00014189637118181445, 7.464860307955628e-06,
+        1.2479701645401804e-05,
+    ),
+)
+
+# Bernoulli numbers B_0, B_1, B_2, ... (B_1 = -1/2), extended on demand.
+_BERNOULLI_CACHE: List[Fraction] = [Fraction(1), Fraction(-1, 2)]
+
+# zeta(1 - n) = -B_n / n overflows a double beyond this index.
+BERNOULLI_FLOAT_LIMIT = 300
+
+
+def bernoulli(n: int) -> Fraction:
+    """
+    Exact Bernoulli number B_n (with B_1 = -1/2).
+
+    Computed with the recurrence sum_{k<=m} C(m+1, k) B_k = 0, skipping the
+    odd indices above 1 (which are zero). Values are cached, so asking for
+    B_n costs only the indices not generated yet.
+    """
+    if n < 0:
+        raise ValueError("Bernoulli numbers are defined for n >= 0")
+    if n > 1 and n % 2 == 1:
+        return Fraction(0)
+    cache = _BERNOULLI_CACHE
+    while len(cache) <= n:
+        m = len(cache)
+        if m % 2 == 1:
+            cache.append(Fraction(0))
+            continue
+        total = Fraction(0)
+        binom = 1  # C(m + 1, k), updated incrementally
+        for k in range(m):
+            if cache[k]:
+                total += binom * cache[k]
+            binom = binom * (m + 1 - k) // (k + 1)
+        cache.append(-total / (m + 1))
+    return cache[n]
+
+
+def _exact_value(s: complex) -> Optional[complex]:
+    """Return zeta(s) exactly for s = 0 and negative integers, else None."""
+    # Exact values for negative integers (and s=0) via Bernoulli numbers.
+    if abs(s.imag) < 1e-12:
+        r = s.real
+        if r <= 0 and abs(r - round(r)) < 1e-12:
+            n = int(round(r))
+            if n == 0:
+                return complex(-0.5)
+            m = -n
+            b_index = m + 1
+            # Odd Bernoulli numbers above 1 are zero, giving zeta(-even) = 0.
+            if b_index % 2 == 1:
+                return complex(0.0)
+            if b_index > BERNOULLI_FLOAT_LIMIT:
+                # sign(B_2k) = (-1)^(k+1), so zeta(1 - 2k) has sign (-1)^k.
+                return complex(math.inf if (b_index // 2) % 2 == 0 else -math.inf)
+            return complex(-bernoulli(b_index) / b_index)
+    return None
+
+
+def _require_numpy() -> Any:
+    """Import NumPy on demand so the scalar path keeps working without it."""
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError(
+            "Batch evaluation needs NumPy: pip install numpy"
+        ) from exc
+    return np
 
 
 def riemann_zeta(
-    s: Number, max_terms: int = 200_000, tolerance: float = 1e-12
+    s: Number,
+    max_terms: int = 200_000,
+    tolerance: float = 1e-12,
+    method: str = DEFAULT_METHOD,
+    rs_threshold: Optional[float] = None,
 ) -> complex:
     """
     Compute zeta(s) for real or complex s using the Dirichlet eta series.
@@ -37,34 +216,179 @@ def riemann_zeta(
     Args:
         s: Real or complex input.
         max_terms: Hard cap on series terms to avoid infinite loops.
-        tolerance: Stop early when the current term is smaller than this.
+        tolerance: Target accuracy. The direct method stops once a term is
+            smaller than this; accelerated methods pick their term count
+            from it.
+        method: "direct", "borwein" (default), "euler" or
+            "euler-maclaurin". Accelerated methods hand over to
+            Euler-Maclaurin where they would exceed their term cap.
+        rs_threshold: |Im s| from which points on the critical line use
+            the Riemann-Siegel formula. Defaults to the height where it
+            meets the tolerance. Ignored by the direct method.
+
+    For Re(s) < 0 every method evaluates zeta(1 - s) and applies the
+    functional equation.
 
     Returns:
         Complex value approximating zeta(s). Returns math.inf for s == 1.
     """
+    return evaluate_zeta(s, max_terms, tolerance, method, rs_threshold).value
+
+
+class ZetaEvaluation(NamedTuple):
+    """A zeta value with the evaluator that produced it and its cost."""
+
+    value: complex
+    route: str
+    terms: int
+
+
+def evaluate_zeta(
+    s: Number,
+    max_terms: int = 200_000,
+    tolerance: float = 1e-12,
+    method: str = DEFAULT_METHOD,
+    rs_threshold: Optional[float] = None,
+) -> ZetaEvaluation:
+    """
+    riemann_zeta that also reports the route taken ("pole", "exact",
+    "riemann-siegel", "euler-maclaurin" or the eta method; a "reflect:"
+    prefix marks the functional equation) and the number of series terms.
+    """
+    _check_method(method)
     if s == 1:
-        return math.inf
+        return ZetaEvaluation(math.inf, "pole", 0)
 
     s_c = complex(s)
 
-    # Exact values for negative integers (and s=0) via Bernoulli numbers.
-    if abs(s_c.imag) < 1e-12:
-        r = s_c.real
-        if r <= 0 and abs(r - round(r)) < 1e-12:
-            n = int(round(r))
-            if n == 0:
-                return complex(-0.5)
-            if n < 0:
-                m = -n
-                b_index = m + 1
-                if b_index in BERNOULLI:
-                    return complex(-BERNOULLI[b_index] / (m + 1))
-                # Odd Bernoulli numbers above 1 are zero, giving zeta(-even) = 0.
-                if b_index % 2 == 1:
-                    return complex(0.0)
+    exact = _exact_value(s_c)
+    if exact is not None:
+        return ZetaEvaluation(exact, "exact", 0)
+
+    route = _route(s_c, method, tolerance, rs_threshold)
+    if route == "reflect":
+        mirror = evaluate_zeta(1 - s_c, max_terms, tolerance, method, rs_threshold)
+        return ZetaEvaluation(
+            _reflect(s_c, mirror.value), "reflect:" + mirror.route, mirror.terms
+        )
+    if route == "riemann-siegel":
+        terms = int(math.sqrt(abs(s_c.imag) / (2 * math.pi))) + len(RS_COEFFICIENTS)
+        return ZetaEvaluation(_zeta_riemann_siegel(s_c.imag), route, terms)
+    if route == "euler-maclaurin":
+        value, terms = _zeta_euler_maclaurin(s_c, tolerance)
+        return ZetaEvaluation(value, route, terms)
 
     s = s_c
+    if method == "direct":
+        eta, terms = _eta_direct(s, max_terms, tolerance)
+    else:
+        weights = _series_weights(s, method, max_terms, tolerance)
+        eta, terms = _eta_weighted(s, weights), len(weights)
+
+    denom = 1 - (2 ** (1 - s))
+    if abs(denom) < 1e-16:
+        return ZetaEvaluation(math.inf, route, terms)
+
+    return ZetaEvaluation(eta / denom, route, terms)
+
+
+def _check_method(method: str) -> None:
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown summation method {method!r}; expected one of {', '.join(METHODS)}"
+        )
+
+
+def _route(
+    s: complex, method: str, tolerance: float, rs_threshold: Optional[float]
+) -> str:
+    """
+    Evaluator riemann_zeta uses for s once poles and exact values are ruled
+    out: "reflect", "riemann-siegel", "euler-maclaurin" or the eta method.
+    """
+    if s.real < 0:
+        return "reflect"
+    if _use_riemann_siegel(s, method, tolerance, rs_threshold):
+        return "riemann-siegel"
+    if _use_euler_maclaurin(s, method, tolerance):
+        return "euler-maclaurin"
+    return method
+
+
+def _use_euler_maclaurin(s: complex, method: str, tolerance: float) -> bool:
+    if method == "euler-maclaurin":
+        return True
+    if method == "direct":
+        return False
+    cap = BORWEIN_MAX_TERMS if method == "borwein" else 2 * EULER_MAX_TERMS
+    return accelerated_terms(s, method, tolerance) > cap
+
+
+def _zeta_euler_maclaurin(s: complex, tolerance: float) -> Tuple[complex, int]:
+    """
+    Euler-Maclaurin summation:
+    zeta(s) = sum_{k<N} k^-s + N^(1-s)/(s-1) + N^-s/2
+              + sum_j B_2j/(2j)! s(s+1)...(s+2j-2) N^(-s-2j+1) + R.
+
+    N ~ |s| / pi makes successive correction terms shrink by about 4x, so
+    the tail is cut as soon as a term drops below the tolerance. Returns the
+    value and the number of terms (power sum plus corrections).
+    """
+    n_cut = max(10, math.ceil(abs(s) / math.pi) + 10)
+    total = 0j
+    for k in range(1, n_cut):
+        total += k ** -s
+    n_pow = n_cut ** -s
+    total += n_pow * n_cut / (s - 1) + n_pow / 2
+
+    # factor = s(s+1)...(s+2j-2) N^(-s-2j+1), starting at j = 1.
+    factor = s * n_pow / n_cut
+    factorial = 2
+    for j in range(1, 2 * n_cut):
+        term = float(bernoulli(2 * j) / factorial) * factor
+        total += term
+        if abs(term) < tolerance * max(1.0, abs(total)):
+            break
+        factor *= (s + 2 * j - 1) * (s + 2 * j) / (n_cut * n_cut)
+        factorial *= (2 * j + 1) * (2 * j + 2)
+    return total, n_cut + j
+
+
+def _log_sin(z: complex) -> complex:
+    """log(sin z) that stays finite when sin z itself would overflow."""
+    if abs(z.imag) < 300:
+        return cmath.log(cmath.sin(z))
+    # sin z = e^(-iz) (1 - e^(2iz)) i/2 for Im z > 0, mirrored below.
+    if z.imag > 0:
+        return -1j * z + cmath.log(0.5j) + cmath.log(1 - cmath.exp(2j * z))
+    return 1j * z + cmath.log(-0.5j) + cmath.log(1 - cmath.exp(-2j * z))
+
+
+def _reflect(s: complex, mirror: complex) -> complex:
+    """zeta(s) from zeta(1 - s) via the functional equation (Re s < 0)."""
+    if mirror == 0:
+        return 0j
+    log_factor = (
+        s * math.log(2)
+        + (s - 1) * math.log(math.pi)
+        + _log_sin(math.pi * s / 2)
+        + _log_gamma(1 - s)
+        + cmath.log(mirror)
+    )
+    if log_factor.real > 709:
+        # Beyond double range; keep the direction of the true value.
+        phase = cmath.exp(1j * log_factor.imag)
+        return complex(
+            math.copysign(math.inf, phase.real) if abs(phase.real) > 1e-12 else 0.0,
+            math.copysign(math.inf, phase.imag) if abs(phase.imag) > 1e-12 else 0.0,
+        )
+    return cmath.exp(log_factor)
+
+
+def _eta_direct(s: complex, max_terms: int, tolerance: float) -> Tuple[complex, int]:
+    """Plain partial sum of the eta series with a term-size early stop."""
     eta = 0.0j
+    k = 0
 
     for k in range(1, max_terms + 1):
         term = ((-1) ** (k - 1)) / (k**s)
@@ -72,11 +396,996 @@ def riemann_zeta(
         if abs(term) < tolerance:
             break
 
-    denom = 1 - (2 ** (1 - s))
-    if abs(denom) < 1e-16:
-        return math.inf
+    return eta, k
+
+
+def _eta_weighted(s: complex, weights: Sequence[float]) -> complex:
+    """Sum sum_k (-1)^(k-1) w_k / k^s for k = 1..len(weights)."""
+    eta = 0.0j
+    sign = 1.0
+    for k, w in enumerate(weights, start=1):
+        eta += sign * w / (k**s)
+        sign = -sign
+    return eta
+
+
+def accelerated_terms(s: Number, method: str, tolerance: float = 1e-12) -> int:
+    """
+    Number of series terms an accelerated method needs for the tolerance.
+
+    Both schemes converge geometrically (rate 3 + sqrt(8) for Borwein, 8 for
+    Euler) but the error carries a factor of about exp(pi * |Im s| / 2), so
+    the count grows linearly with the height. The result is not capped.
+    """
+    t = abs(complex(s).imag)
+    budget = math.log(3.0 / tolerance) + math.pi * t / 2 + math.log1p(t)
+    if method == "borwein":
+        return max(4, math.ceil(budget / math.log(3 + math.sqrt(8))))
+    if method == "euler":
+        # Euler sums 2n terms for a given n.
+        return 2 * max(4, math.ceil(budget / math.log(8)))
+    raise ValueError(f"No term estimate for method {method!r}")
+
+
+def _series_weights(
+    s: complex, method: str, max_terms: int, tolerance: float
+) -> Tuple[float, ...]:
+    """Weights for the accelerated eta sum, capped by max_terms and overflow."""
+    terms = min(accelerated_terms(s, method, tolerance), max_terms)
+    if method == "borwein":
+        return _borwein_weights(max(1, min(terms, BORWEIN_MAX_TERMS)))
+    return _euler_weights(max(1, min(terms // 2, EULER_MAX_TERMS)))
+
+
+@functools.lru_cache(maxsize=None)
+def _borwein_weights(n: int) -> Tuple[float, ...]:
+    """
+    Borwein's algorithm 2 (the Cohen-Villegas-Zagier Chebyshev weights):
+    eta(s) ~ sum_{k<n} (-1)^k (1 - d_k / d_n) / (k+1)^s with
+    d_k = n * sum_{i<=k} (n+i-1)! 4^i / ((n-i)! (2i)!).
+    """
+    d = []
+    term = 1.0 / n
+    acc = 0.0
+    for i in range(n + 1):
+        if i:
+            term *= 4.0 * (n + i - 1) * (n - i + 1) / ((2 * i) * (2 * i - 1))
+        acc += term
+        d.append(n * acc)
+    d_n = d[n]
+    return tuple(1.0 - d[k] / d_n for k in range(n))
+
+
+@functools.lru_cache(maxsize=None)
+def _euler_weights(n: int) -> Tuple[float, ...]:
+    """
+    Euler transform of the eta series: the first n terms have weight 1, term
+    n + j gets the binomial tail 2^-n * sum_{i>=j} C(n, i).
+    """
+    tail = [0.0] * (n + 2)
+    for i in range(n, -1, -1):
+        tail[i] = tail[i + 1] + math.comb(n, i) / 2.0**n
+    return tuple([1.0] * n + tail[1 : n + 1])
+
+
+def riemann_siegel_threshold(tolerance: float = 1e-12) -> float:
+    """Smallest height at which the Riemann-Siegel formula meets tolerance."""
+    return max(RS_MIN_HEIGHT, (RS_ERROR_SCALE / tolerance) ** (1.0 / 3.0))
+
+
+def _use_riemann_siegel(
+    s: complex, method: str, tolerance: float, rs_threshold: Optional[float]
+) -> bool:
+    if method == "direct" or abs(s.real - 0.5) > 1e-12:
+        return False
+    t = abs(s.imag)
+    if rs_threshold is not None:
+        return t >= max(rs_threshold, 2 * math.pi)
+    if t < RS_MIN_HEIGHT:
+        return False
+    return t >= riemann_siegel_threshold(tolerance)
+
+
+def _log_gamma(z: complex) -> complex:
+    """
+    log Gamma(z) for complex z with Re(z) > 0, continuous in Im(z).
+
+    Shifts z up to Re(z) >= 10 and applies the Stirling series, subtracting
+    the logs of the shifted factors one by one to stay on the same branch.
+    """
+    shift = 0j
+    while z.real < 10:
+        shift += cmath.log(z)
+        z += 1
+    inv = 1 / z
+    inv2 = inv * inv
+    series = 0j
+    power = inv
+    for n in range(2, 21, 2):
+        series += float(bernoulli(n)) / (n * (n - 1)) * power
+        power *= inv2
+    return (z - 0.5) * cmath.log(z) - z + 0.5 * math.log(2 * math.pi) + series - shift
+
+
+def riemann_siegel_theta(t: float) -> float:
+    """
+    Riemann-Siegel theta(t) = arg Gamma(1/4 + it/2) - (t/2) log(pi).
+
+    Uses the asymptotic expansion for |t| >= RS_MIN_HEIGHT and the complex
+    log-gamma otherwise. theta is odd in t.
+    """
+    if t < 0:
+        return -riemann_siegel_theta(-t)
+    if t < RS_MIN_HEIGHT:
+        return _log_gamma(complex(0.25, t / 2)).imag - t / 2 * math.log(math.pi)
+    inv = 1.0 / t
+    inv2 = inv * inv
+    tail = inv * (
+        1 / 48
+        + inv2 * (7 / 5760 + inv2 * (31 / 80640 + inv2 * (127 / 430080 + inv2 * 511 / 1216512)))
+    )
+    return t / 2 * math.log(t / (2 * math.pi)) - t / 2 - math.pi / 8 + tail
+
+
+def _rs_correction(p: float, a: float) -> float:
+    """Sum of C_k(p) / a^k for k = 0..4."""
+    x = p - 0.5
+    x2 = x * x
+    total = 0.0
+    scale = 1.0
+    for k, coeffs in enumerate(RS_COEFFICIENTS):
+        value = 0.0
+        for c in reversed(coeffs):
+            value = value * x2 + c
+        if k % 2:
+            value *= x
+        total += value * scale
+        scale /= a
+    return total
+
+
+def _riemann_siegel_z_asymptotic(t: float) -> float:
+    """Riemann-Siegel main sum plus C0..C4 remainder (t >= 2 pi)."""
+    a = math.sqrt(t / (2 * math.pi))
+    n_terms = int(a)
+    theta = riemann_siegel_theta(t)
+    main = 0.0
+    for n in range(1, n_terms + 1):
+        main += math.cos(theta - t * math.log(n)) / math.sqrt(n)
+    sign = 1.0 if n_terms % 2 == 1 else -1.0
+    remainder = sign * a ** -0.5 * _rs_correction(a - n_terms, a)
+    return 2 * main + remainder
+
+
+def riemann_siegel_z(
+    t: float, tolerance: float = 1e-12, method: str = DEFAULT_METHOD
+) -> float:
+    """
+    Hardy's Z(t) = exp(i theta(t)) zeta(1/2 + it), a real function whose
+    sign changes are the zeros on the critical line.
+
+    Heights that riemann_zeta would route to Riemann-Siegel use the O(sqrt t)
+    formula; lower ones go through the accelerated eta series.
+    """
+    s = complex(0.5, t)
+    if _use_riemann_siegel(s, method, tolerance, None):
+        return _riemann_siegel_z_asymptotic(abs(t))
+    value = cmath.exp(1j * riemann_siegel_theta(t)) * riemann_zeta(
+        s, tolerance=tolerance, method=method
+    )
+    return value.real
+
+
+def _zeta_riemann_siegel(t: float) -> complex:
+    """zeta(1/2 + it) from Z(t) and theta(t); zeta(conj s) = conj zeta(s)."""
+    height = abs(t)
+    value = _riemann_siegel_z_asymptotic(height) * cmath.exp(
+        -1j * riemann_siegel_theta(height)
+    )
+    return value if t >= 0 else value.conjugate()
+
+
+def zero_count_estimate(t: float) -> float:
+    """Smooth part of N(T), the number of zeros with 0 < Im(rho) <= T."""
+    return riemann_siegel_theta(t) / math.pi + 1
+
+
+def find_zeros(
+    t_start: float,
+    t_stop: float,
+    tolerance: float = 1e-10,
+    samples_per_gap: int = 8,
+) -> List[float]:
+    """
+    Locate zeros of zeta on the critical line with t_start <= t <= t_stop.
+
+    Z(t) is sampled with a step of a fraction of the mean zero spacing
+    2 pi / log(t / 2 pi); every sign change is refined by the Illinois
+    (modified regula falsi) method to |dt| < tolerance. Pairs of zeros
+    closer than the sampling step can be missed; compare the count against
+    zero_count_estimate to detect that and raise samples_per_gap.
+    """
+    if t_stop <= t_start:
+        return []
+
+    def z_of(t: float) -> float:
+        # Only the sign matters while scanning, so a loose tolerance lets
+        # Riemann-Siegel take over from a much lower height.
+        return riemann_siegel_z(t, tolerance=1e-8)
+
+    zeros: List[float] = []
+    t_prev = t_start
+    z_prev = z_of(t_prev)
+    while t_prev < t_stop:
+        gap = 2 * math.pi / math.log(max(t_prev, 7.0) / (2 * math.pi))
+        t_next = min(t_prev + gap / samples_per_gap, t_stop)
+        z_next = z_of(t_next)
+        if z_prev == 0.0:
+            zeros.append(t_prev)
+        elif z_prev * z_next < 0:
+            zeros.append(_refine_zero(z_of, t_prev, z_prev, t_next, z_next, tolerance))
+        t_prev, z_prev = t_next, z_next
+    if z_prev == 0.0:
+        zeros.append(t_prev)
+    return zeros
+
+
+def _refine_zero(f, a: float, fa: float, b: float, fb: float, tolerance: float) -> float:
+    """Illinois iteration on a bracket [a, b] with f(a) * f(b) < 0."""
+    side = 0
+    c = b
+    for _ in range(200):
+        c = (fa * b - fb * a) / (fa - fb)
+        if abs(b - a) < tolerance:
+            break
+        fc = f(c)
+        if fc == 0.0:
+            break
+        if fc * fb > 0:
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+    return c
+
+
+def riemann_zeta_many(
+    s_values: Any,
+    max_terms: int = 200_000,
+    tolerance: float = 1e-12,
+    method: str = DEFAULT_METHOD,
+    rs_threshold: Optional[float] = None,
+) -> Any:
+    """
+    Vectorized riemann_zeta over an array of s values.
+
+    The eta series is summed with NumPy broadcasting over the term index.
+    For the direct method every element keeps its own convergence mask: once
+    a term falls below the tolerance the element is frozen (exactly like the
+    scalar early stop) and drops out of the remaining blocks. Accelerated
+    methods group the elements by the term count they need; high points on
+    the critical line share one padded Riemann-Siegel main-sum matrix.
+
+    Args:
+        s_values: Array-like of real or complex inputs (any shape).
+        max_terms: Hard cap on series terms per element.
+        tolerance: Target accuracy, as for riemann_zeta.
+        method: "direct", "borwein" (default) or "euler".
+        rs_threshold: As for riemann_zeta.
+
+    Returns:
+        complex128 array with the same shape as s_values. Poles are inf.
+    """
+    np = _require_numpy()
+    _check_method(method)
+
+    s_arr = np.asarray(s_values, dtype=complex)
+    flat = s_arr.ravel()
+    out = np.zeros(flat.shape, dtype=complex)
+    pending = np.ones(flat.shape, dtype=bool)
+
+    pole = flat == 1
+    out[pole] = math.inf
+    pending &= ~pole
+
+    # Only a handful of inputs can be non-positive integers; check them
+    # through the scalar helper so both paths share one definition.
+    maybe_int = pending & (np.abs(flat.imag) < 1e-12) & (flat.real <= 0)
+    for i in np.flatnonzero(maybe_int):
+        exact = _exact_value(complex(flat[i]))
+        if exact is not None:
+            out[i] = exact
+            pending[i] = False
+
+    routes = {}
+    for i in np.flatnonzero(pending).tolist():
+        route = _route(complex(flat[i]), method, tolerance, rs_threshold)
+        routes.setdefault(route, []).append(i)
+
+    rs_idx = np.asarray(routes.pop("riemann-siegel", []), dtype=int)
+    if rs_idx.size:
+        out[rs_idx] = _zeta_riemann_siegel_many(flat[rs_idx].imag)
+        pending[rs_idx] = False
+
+    # The functional equation and Euler-Maclaurin have per-point term counts
+    # that do not share a matrix well; they run through the scalar path.
+    for route in ("reflect", "euler-maclaurin"):
+        for i in routes.pop(route, []):
+            out[i] = riemann_zeta(flat[i], max_terms, tolerance, method, rs_threshold)
+            pending[i] = False
+
+    idx = np.flatnonzero(pending)
+    if idx.size:
+        s_rest = flat[idx]
+        if method == "direct":
+            eta = _eta_direct_many(s_rest, max_terms, tolerance)
+        else:
+            eta = _eta_accelerated_many(s_rest, method, max_terms, tolerance)
+        denom = 1 - 2 ** (1 - s_rest)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = eta / denom
+        result[np.abs(denom) < 1e-16] = math.inf
+        out[idx] = result
+
+    return out.reshape(s_arr.shape)
+
+
+def _eta_direct_many(s: Any, max_terms: int, tolerance: float) -> Any:
+    """Direct eta partial sums for a 1-D complex array."""
+    np = _require_numpy()
+
+    sigma = s.real
+    tau = s.imag
+    eta = np.zeros(s.shape, dtype=complex)
+    active = np.arange(s.size)
+    k = 1
+    block = 64
+
+    while active.size and k <= max_terms:
+        width = min(block, max_terms - k + 1, max(1, BATCH_BLOCK_ELEMENTS // active.size))
+        ks = np.arange(k, k + width, dtype=float)
+        log_k = np.log(ks)
+        sign = np.where((np.arange(k, k + width) % 2) == 1, 1.0, -1.0)
+
+        magnitude = np.exp(-np.outer(sigma[active], log_k))
+        phase = -np.outer(tau[active], log_k)
+        terms = (sign * magnitude) * (np.cos(phase) + 1j * np.sin(phase))
+
+        # First term below tolerance (inclusive) ends that element's series.
+        small = magnitude < tolerance
+        done = small.any(axis=1)
+        cutoff = np.where(done, small.argmax(axis=1), width - 1)
+        keep = np.arange(width) <= cutoff[:, None]
+        eta[active] += np.where(keep, terms, 0).sum(axis=1)
+
+        active = active[~done]
+        k += width
+        block = min(block * 2, 1 << 16)
 
-    return eta / denom
+    return eta
+
+
+def _eta_accelerated_many(s: Any, method: str, max_terms: int, tolerance: float) -> Any:
+    """Weighted eta sums for a 1-D complex array, grouped by weight vector."""
+    np = _require_numpy()
+
+    eta = np.zeros(s.shape, dtype=complex)
+    groups: dict = {}
+    for i, value in enumerate(s.tolist()):
+        weights = _series_weights(value, method, max_terms, tolerance)
+        groups.setdefault(weights, []).append(i)
+
+    for weights, members in groups.items():
+        w = np.asarray(weights)
+        ks = np.arange(1, w.size + 1, dtype=float)
+        log_k = np.log(ks)
+        signed = np.where(np.arange(w.size) % 2 == 0, w, -w)
+        rows = np.asarray(members)
+        # Bound the temporary (rows x terms) matrix like the direct path.
+        step = max(1, BATCH_BLOCK_ELEMENTS // w.size)
+        for start in range(0, rows.size, step):
+            chunk = rows[start : start + step]
+            powers = np.exp(-np.outer(s[chunk], log_k))
+            eta[chunk] = powers @ signed
+
+    return eta
+
+
+def _zeta_riemann_siegel_many(t: Any) -> Any:
+    """Vectorized _zeta_riemann_siegel for a 1-D array of heights."""
+    np = _require_numpy()
+
+    height = np.abs(t)
+    a = np.sqrt(height / (2 * math.pi))
+    n_terms = a.astype(int)
+    theta = np.array([riemann_siegel_theta(h) for h in height.tolist()])
+
+    main = np.zeros(height.shape)
+    width = int(n_terms.max())
+    n = np.arange(1, width + 1, dtype=float)
+    log_n = np.log(n)
+    inv_sqrt_n = 1 / np.sqrt(n)
+    # Rows share one padded term matrix; terms past each row's N are masked.
+    step = max(1, BATCH_BLOCK_ELEMENTS // width)
+    for start in range(0, height.size, step):
+        rows = slice(start, start + step)
+        phase = theta[rows, None] - np.outer(height[rows], log_n)
+        keep = n[None, :] <= n_terms[rows, None]
+        main[rows] = np.where(keep, np.cos(phase) * inv_sqrt_n, 0.0).sum(axis=1)
+
+    x = a - n_terms - 0.5
+    x2 = x * x
+    correction = np.zeros(height.shape)
+    scale = np.ones(height.shape)
+    for k, coeffs in enumerate(RS_COEFFICIENTS):
+        value = np.zeros(height.shape)
+        for c in reversed(coeffs):
+            value = value * x2 + c
+        if k % 2:
+            value *= x
+        correction += value * scale
+        scale /= a
+
+    sign = np.where(n_terms % 2 == 1, 1.0, -1.0)
+    z = 2 * main + sign * a**-0.5 * correction
+    value = z * np.exp(-1j * theta)
+    return np.where(t >= 0, value, value.conj())
+
+
+def _require_mpmath() -> Any:
+    """Import mpmath on demand; only the arbitrary-precision mode needs it."""
+    try:
+        import mpmath
+    except ImportError as exc:
+        raise RuntimeError(
+            "Arbitrary-precision mode needs mpmath: pip install mpmath"
+        ) from exc
+    return mpmath
+
+
+class PrecisionEvaluation(NamedTuple):
+    """An arbitrary-precision zeta value and what it cost to get it."""
+
+    value: Any  # mpmath.mpc
+    digits: int
+    working_digits: int
+    terms: int
+    passes: int
+    seconds: float
+
+
+def riemann_zeta_mp(
+    s: Any, digits: int = 30, max_terms: int = 1_000_000, max_passes: int = 6
+) -> PrecisionEvaluation:
+    """
+    zeta(s) to `digits` significant digits (absolute digits near zeros).
+
+    Re(s) >= 0 is summed with Euler-Maclaurin in mpmath arithmetic, Re(s) < 0
+    goes through the functional equation, and non-positive integers are
+    exact Bernoulli quotients. The cut-off N grows with |s| and digits, and
+    the working precision adds guard digits for the cancellation in the
+    power sum. Each pass is checked against the previous one at higher
+    precision and N; once two agree to the target the result is returned.
+
+    Args:
+        s: Anything mpmath accepts, e.g. "0.5+14.134725j" (strings keep
+            all their digits, unlike Python floats).
+        digits: Target number of correct digits.
+        max_terms: Cost budget; RuntimeError once a pass would need a
+            larger N than this.
+        max_passes: Cost budget on the number of refinement passes.
+    """
+    mpmath = _require_mpmath()
+    started = time.perf_counter()
+
+    with mpmath.workdps(digits + 20):
+        s_mp = _parse_mp(mpmath, s) if isinstance(s, str) else mpmath.mpc(s)
+
+    if s_mp == 1:
+        return PrecisionEvaluation(mpmath.mpc(mpmath.inf), digits, digits, 0, 0, 0.0)
+    if s_mp.imag == 0 and s_mp.real <= 0 and s_mp.real == int(s_mp.real):
+        m = -int(s_mp.real)
+        if m == 0:
+            exact = Fraction(-1, 2)
+        elif (m + 1) % 2 == 1:
+            exact = Fraction(0)
+        else:
+            exact = -bernoulli(m + 1) / (m + 1)
+        with mpmath.workdps(digits + 5):
+            value = mpmath.mpc(mpmath.mpf(exact.numerator) / exact.denominator)
+        return PrecisionEvaluation(value, digits, digits + 5, 0, 1, time.perf_counter() - started)
+
+    reflect = s_mp.real < 0
+    with mpmath.workdps(digits + 20):
+        target = 1 - s_mp if reflect else s_mp
+
+    n_cut = math.ceil((float(abs(target)) + 4 * digits) / math.pi) + 10
+    # Guard digits cover the cancellation in a power sum of ~N terms.
+    working = digits + 10 + len(str(n_cut))
+
+    previous = None
+    terms = 0
+    for passes in range(1, max_passes + 1):
+        if n_cut > max_terms:
+            raise RuntimeError(
+                f"zeta({s}) to {digits} digits needs more than max_terms={max_terms} terms"
+            )
+        with mpmath.workdps(working):
+            value, used = _zeta_euler_maclaurin_mp(mpmath, target, n_cut, digits + 5)
+            if reflect:
+                value = (
+                    mpmath.power(2, s_mp)
+                    * mpmath.power(mpmath.pi, s_mp - 1)
+                    * mpmath.sinpi(s_mp / 2)
+                    * mpmath.gamma(1 - s_mp)
+                    * value
+                )
+            terms += used
+            if previous is not None:
+                scale = max(mpmath.mpf(1), abs(value))
+                if abs(value - previous) <= mpmath.mpf(10) ** (-digits) * scale:
+                    return PrecisionEvaluation(
+                        +value, digits, working, terms, passes, time.perf_counter() - started
+                    )
+            previous = value
+        working += 10
+        n_cut = n_cut + n_cut // 4 + 5
+
+    raise RuntimeError(
+        f"zeta({s}) did not settle to {digits} digits within {max_passes} passes"
+    )
+
+
+def _parse_mp(mpmath: Any, raw: str) -> Any:
+    """Parse "a", "bj" or "a+bj" into an mpc without a detour through floats."""
+    text = raw.strip().replace(" ", "").lower()
+    if not text.endswith("j"):
+        return mpmath.mpc(mpmath.mpf(text))
+    body = text[:-1]
+    # The split is the last sign that is neither leading nor an exponent's.
+    for i in range(len(body) - 1, 0, -1):
+        if body[i] in "+-" and body[i - 1] != "e":
+            imag = body[i:]
+            imag = imag + "1" if imag in "+-" else imag
+            return mpmath.mpc(mpmath.mpf(body[:i]), mpmath.mpf(imag))
+    return mpmath.mpc(0, mpmath.mpf(body or "1" if body not in "+-" else body + "1"))
+
+
+def _zeta_euler_maclaurin_mp(mpmath: Any, s: Any, n_cut: int, digits: int) -> Tuple[Any, int]:
+    """Euler-Maclaurin as in _zeta_euler_maclaurin, in the current mp precision."""
+    total = mpmath.fsum(mpmath.power(k, -s) for k in range(1, n_cut))
+    n_pow = mpmath.power(n_cut, -s)
+    total += n_pow * n_cut / (s - 1) + n_pow / 2
+
+    eps = mpmath.mpf(10) ** (-digits)
+    factor = s * n_pow / n_cut
+    factorial = 2
+    j = 0
+    for j in range(1, 4 * n_cut):
+        b = bernoulli(2 * j)
+        term = mpmath.mpf(b.numerator) / (b.denominator * factorial) * factor
+        total += term
+        if abs(term) < eps * max(1, abs(total)):
+            break
+        factor *= (s + 2 * j - 1) * (s + 2 * j) / (n_cut * n_cut)
+        factorial *= (2 * j + 1) * (2 * j + 2)
+    return total, n_cut + j
+
+
+class ZetaCache:
+    """
+    Memoized zeta values keyed on the normalized (s, method, tolerance).
+
+    Lookups go to an in-memory LRU dict first (bounded by max_entries), then
+    to an optional SQLite file, which several processes can read and write
+    at once. Counters record memory hits, store hits and misses.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, complex]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS zeta_cache "
+                "(key TEXT PRIMARY KEY, re REAL NOT NULL, im REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(
+        s: Number,
+        method: str = DEFAULT_METHOD,
+        tolerance: float = 1e-12,
+        max_terms: int = 200_000,
+        rs_threshold: Optional[float] = None,
+    ) -> tuple:
+        """
+        Normalized cache key. -0.0 and 0.0 compare equal, and max_terms only
+        counts where it can change the result: always for the direct method,
+        otherwise only when it is below the accelerated term caps.
+        """
+        s_c = complex(s)
+        terms = max_terms if method == "direct" or max_terms < 2 * EULER_MAX_TERMS else None
+        threshold = None if rs_threshold is None else float(rs_threshold)
+        return (s_c.real + 0.0, s_c.imag + 0.0, method, float(tolerance), terms, threshold)
+
+    def get(self, key: tuple) -> Optional[complex]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT re, im FROM zeta_cache WHERE key = ?", (repr(key),)
+            ).fetchone()
+            if row is not None:
+                self.store_hits += 1
+                value = complex(*row)
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, value: complex) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[tuple, complex]]) -> None:
+        rows = []
+        for key, value in items:
+            value = complex(value)
+            self._remember(key, value)
+            rows.append((repr(key), value.real, value.imag))
+        if self._db is not None and rows:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO zeta_cache (key, re, im) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def _remember(self, key: tuple, value: complex) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def zeta(
+        self,
+        s: Number,
+        max_terms: int = 200_000,
+        tolerance: float = 1e-12,
+        method: str = DEFAULT_METHOD,
+        rs_threshold: Optional[float] = None,
+    ) -> complex:
+        """riemann_zeta through the cache."""
+        key = self.key(s, method, tolerance, max_terms, rs_threshold)
+        value = self.get(key)
+        if value is None:
+            value = complex(riemann_zeta(s, max_terms, tolerance, method, rs_threshold))
+            self.put(key, value)
+        return value
+
+    def zeta_many(
+        self,
+        s_values: Any,
+        max_terms: int = 200_000,
+        tolerance: float = 1e-12,
+        method: str = DEFAULT_METHOD,
+        rs_threshold: Optional[float] = None,
+    ) -> Any:
+        """riemann_zeta_many through the cache; only misses are evaluated."""
+        np = _require_numpy()
+        s_arr = np.asarray(s_values, dtype=complex)
+        flat = s_arr.ravel()
+        out = np.empty(flat.shape, dtype=complex)
+        keys = [self.key(v, method, tolerance, max_terms, rs_threshold) for v in flat.tolist()]
+        missing = []
+        for i, key in enumerate(keys):
+            value = self.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                out[i] = value
+        if missing:
+            values = riemann_zeta_many(flat[missing], max_terms, tolerance, method, rs_threshold)
+            out[missing] = values
+            self.put_many(zip((keys[i] for i in missing), values.tolist()))
+        return out.reshape(s_arr.shape)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def sweep(
+    values: Iterable[Number],
+    workers: Optional[int] = None,
+    chunk_size: int = 4096,
+    checkpoint: Optional[str] = None,
+    max_terms: int = 200_000,
+    tolerance: float = 1e-12,
+    method: str = DEFAULT_METHOD,
+    rs_threshold: Optional[float] = None,
+    cache_path: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Evaluate zeta over a (possibly huge or lazy) sequence of s in parallel.
+
+    Inputs are cut into chunks of chunk_size and sent to a process pool as
+    complex128 arrays, so each task pickles one flat buffer instead of many
+    Python objects. Each worker runs riemann_zeta_many on its chunk. At most
+    two chunks per worker are in flight, which keeps memory bounded.
+
+    Args:
+        values: Iterable of s values; consumed lazily.
+        workers: Pool size (default: os.cpu_count()); 1 runs in-process.
+        chunk_size: Points per task.
+        checkpoint: Optional file of finished results (raw complex128 in
+            input order). If it exists, its results are yielded first and
+            the same number of inputs is skipped, so an interrupted sweep can
+            resume with the same values and options.
+        max_terms, tolerance, method, rs_threshold: As for riemann_zeta.
+        cache_path: Optional SQLite ZetaCache file shared by all workers.
+
+    Yields:
+        complex128 arrays, one per chunk, in input order.
+    """
+    np = _require_numpy()
+    _check_method(method)
+    workers = workers or os.cpu_count() or 1
+    options = (max_terms, tolerance, method, rs_threshold, cache_path)
+    inputs = iter(values)
+
+    sink = None
+    if checkpoint:
+        done = 0
+        if os.path.exists(checkpoint):
+            item = np.dtype(complex).itemsize
+            done = os.path.getsize(checkpoint) // item
+            # Drop a partially written record left by an interrupted run.
+            os.truncate(checkpoint, done * item)
+            for start in range(0, done, chunk_size):
+                count = min(chunk_size, done - start)
+                yield np.fromfile(
+                    checkpoint, dtype=complex, count=count, offset=start * item
+                )
+            # Skip the inputs whose results came from the checkpoint.
+            for _ in itertools.islice(inputs, done):
+                pass
+        sink = open(checkpoint, "ab")
+
+    try:
+        for result in _ordered_chunks(_chunked(inputs, chunk_size), workers, options):
+            if sink is not None:
+                result.tofile(sink)
+                sink.flush()
+            yield result
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def _chunked(values: Iterator[Number], size: int) -> Iterator[Any]:
+    np = _require_numpy()
+    while True:
+        chunk = np.fromiter(
+            (complex(v) for v in itertools.islice(values, size)), dtype=complex
+        )
+        if not chunk.size:
+            return
+        yield chunk
+
+
+def _sweep_chunk(chunk: Any, options: Tuple[Any, ...]) -> Any:
+    max_terms, tolerance, method, rs_threshold, cache_path = options
+    if cache_path:
+        return _process_cache(cache_path).zeta_many(
+            chunk, max_terms, tolerance, method, rs_threshold
+        )
+    return riemann_zeta_many(chunk, max_terms, tolerance, method, rs_threshold)
+
+
+@functools.lru_cache(maxsize=None)
+def _process_cache(path: str) -> ZetaCache:
+    """One ZetaCache per process and store file, reused across chunks."""
+    return ZetaCache(path=path)
+
+
+def _ordered_chunks(
+    chunks: Iterator[Any], workers: int, options: Tuple[Any, ...]
+) -> Iterator[Any]:
+    """Run _sweep_chunk over chunks on a pool, yielding in submission order."""
+    if workers == 1:
+        for chunk in chunks:
+            yield _sweep_chunk(chunk, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_sweep_chunk, chunk, options))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _guess_format(path: str, choices: Sequence[str], default: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    aliases = {"txt": "text", "json": "jsonl", "bin": "c128"}
+    ext = aliases.get(ext, ext)
+    return ext if ext in choices else default
+
+
+def read_values(
+    path: str, fmt: str = "auto", column: str = "0", chunk_size: int = 4096
+) -> Iterator[complex]:
+    """
+    Lazily yield s values from a file ("-" is stdin).
+
+    Formats:
+        text: whitespace-separated numbers, blank lines and # comments ignored.
+        csv: one column of a CSV file, by index or header name.
+        npy: a 1-D .npy array (memory-mapped when read from a file).
+        f64 / c128: raw little-endian float64 / complex128 values.
+    """
+    if fmt == "auto":
+        fmt = "text" if path == "-" else _guess_format(path, INPUT_FORMATS, "text")
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format {fmt!r}")
+
+    if fmt in ("text", "csv"):
+        handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            reader = _read_text if fmt == "text" else _read_csv
+            yield from reader(handle, column)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+        return
+
+    np = _require_numpy()
+    if fmt == "npy":
+        source = sys.stdin.buffer if path == "-" else path
+        data = np.load(source, mmap_mode=None if path == "-" else "r")
+        if data.ndim != 1:
+            raise ValueError(f"Expected a 1-D array in {path}, got shape {data.shape}")
+        for start in range(0, data.size, chunk_size):
+            yield from data[start : start + chunk_size].astype(complex).tolist()
+        return
+
+    dtype = np.dtype("<f8" if fmt == "f64" else "<c16")
+    if path != "-":
+        data = np.memmap(path, dtype=dtype, mode="r")
+        for start in range(0, data.size, chunk_size):
+            yield from data[start : start + chunk_size].astype(complex).tolist()
+        return
+    while True:
+        raw = sys.stdin.buffer.read(chunk_size * dtype.itemsize)
+        if not raw:
+            return
+        usable = len(raw) - len(raw) % dtype.itemsize
+        yield from np.frombuffer(raw[:usable], dtype=dtype).astype(complex).tolist()
+
+
+def _read_text(handle: IO[str], column: str) -> Iterator[complex]:
+    for line in handle:
+        line = line.split("#", 1)[0]
+        for raw in line.split():
+            if raw == "&":
+                continue
+            yield _parse_one(raw)
+
+
+def _read_csv(handle: IO[str], column: str) -> Iterator[complex]:
+    rows = csv.reader(handle)
+    index = int(column) if column.isdigit() else None
+    for row in rows:
+        if not row:
+            continue
+        if index is None:
+            # First non-empty row is the header when selecting by name.
+            if column not in row:
+                raise SystemExit(f"Column '{column}' not found in CSV header {row}")
+            index = row.index(column)
+            continue
+        try:
+            yield complex(row[index].strip().replace(" ", ""))
+        except ValueError:
+            if rows.line_num == 1:
+                continue  # header row of a CSV selected by index
+            raise SystemExit(f"Cannot parse '{row[index]}' on CSV line {rows.line_num}")
+
+
+def _parse_one(raw: str) -> complex:
+    try:
+        return complex(raw)
+    except ValueError as exc:
+        raise SystemExit(f"Cannot parse '{raw}' as a number/complex: {exc}")
+
+
+def write_results(
+    inputs: Iterable[complex], chunks: Iterable[Any], path: str, fmt: str = "auto"
+) -> int:
+    """
+    Stream result chunks (as yielded by sweep) to a file ("-" is stdout).
+
+    csv and jsonl rows carry s next to zeta(s); npy stores only the zeta
+    values as a complex128 array whose header is patched with the final
+    length at the end, so nothing is held in memory. Returns the number of
+    values written.
+    """
+    if fmt == "auto":
+        fmt = "csv" if path == "-" else _guess_format(path, OUTPUT_FORMATS, "csv")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}")
+
+    if fmt == "npy":
+        if path == "-":
+            raise SystemExit("npy output needs a seekable file, not stdout")
+        return _write_npy(chunks, path)
+
+    handle = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    inputs = iter(inputs)
+    count = 0
+    try:
+        if fmt == "csv":
+            handle.write("s_real,s_imag,zeta_real,zeta_imag\n")
+        for chunk in chunks:
+            lines = []
+            for z, s in zip(chunk.tolist(), inputs):
+                if fmt == "csv":
+                    lines.append(f"{s.real!r},{s.imag!r},{z.real!r},{z.imag!r}\n")
+                else:
+                    lines.append(json.dumps({"s": [s.real, s.imag], "zeta": [z.real, z.imag]}) + "\n")
+            handle.write("".join(lines))
+            count += len(lines)
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+        else:
+            handle.flush()
+    return count
+
+
+def _write_npy(chunks: Iterable[Any], path: str) -> int:
+    np = _require_numpy()
+    header = {"descr": np.dtype(complex).str, "fortran_order": False, "shape": (0,)}
+    count = 0
+    with open(path, "wb") as handle:
+        np.lib.format.write_array_header_1_0(handle, header)
+        data_start = handle.tell()
+        for chunk in chunks:
+            np.ascontiguousarray(chunk, dtype=complex).tofile(handle)
+            count += chunk.size
+        handle.seek(0)
+        header["shape"] = (count,)
+        np.lib.format.write_array_header_1_0(handle, header)
+        # Headers are padded to a fixed 64-byte boundary, so this holds for
+        # any realistic length.
+        if handle.tell() != data_start:
+            raise RuntimeError("npy header size changed while patching the length")
+    return count
 
 
 def demo_samples(values: Iterable[Number]) -> None:
@@ -93,10 +1402,7 @@ def parse_values(args: List[str]) -> List[Number]:
         if raw == "&":
             # Ignore stray ampersands that can appear when pasting a shell line.
             continue
-        try:
-            parsed.append(complex(raw))
-        except ValueError as exc:
-            raise SystemExit(f"Cannot parse '{raw}' as a number/complex: {exc}")
+        parsed.append(_parse_one(raw))
     return parsed
 
 
@@ -121,11 +1427,155 @@ def main(argv: List[str]) -> None:
         "--tol",
         type=float,
         default=1e-12,
-        help="Early-stop tolerance for series term magnitude (default: 1e-12)",
+        help="Target accuracy: early-stop term size for --method direct, "
+        "term-count target for accelerated methods (default: 1e-12)",
+    )
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default=DEFAULT_METHOD,
+        help="Eta series summation: direct partial sums, or Borwein/Euler "
+        "acceleration with the term count chosen from --tol "
+        f"(default: {DEFAULT_METHOD})",
+    )
+    parser.add_argument(
+        "--rs-threshold",
+        type=float,
+        default=None,
+        help="|Im s| from which critical-line points use Riemann-Siegel "
+        "(default: derived from --tol)",
+    )
+    parser.add_argument(
+        "--zeros",
+        nargs=2,
+        type=float,
+        metavar=("T_START", "T_STOP"),
+        help="List zeros 1/2 + it with T_START <= t <= T_STOP instead of "
+        "evaluating values",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Evaluate all values at once with the NumPy batch evaluator",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Evaluate in chunks on a pool of N processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4096,
+        help="Values per worker task with --workers (default: 4096)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Append finished results to this file and resume from it on the "
+        "next run (without --workers the sweep runs in-process)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        metavar="DIGITS",
+        default=None,
+        help="Evaluate to DIGITS digits with mpmath arithmetic (values are "
+        "parsed at full precision) and report the cost",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="SQLite file used as a persistent cache of computed values "
+        "(shared by --workers processes)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=100_000,
+        help="In-memory LRU cache entries when caching (default: 100000)",
+    )
+    parser.add_argument(
+        "--input",
+        default=None,
+        help="Stream s values from this file ('-' for stdin) instead of argv",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=("auto",) + INPUT_FORMATS,
+        default="auto",
+        help="Input format (default: from the extension, text otherwise)",
+    )
+    parser.add_argument(
+        "--column",
+        default="0",
+        help="CSV column with s values, by index or header name (default: 0)",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="With --input: write results to this file ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=("auto",) + OUTPUT_FORMATS,
+        default="auto",
+        help="Output format (default: from the extension, csv otherwise)",
     )
 
     opts = parser.parse_args(argv)
 
+    if opts.zeros:
+        t_start, t_stop = opts.zeros
+        zeros = find_zeros(t_start, t_stop)
+        for t in zeros:
+            print(f"zero at 1/2 + {t!r}j")
+        expected = zero_count_estimate(t_stop) - zero_count_estimate(t_start)
+        print(f"Found {len(zeros)} zeros; smooth N(T) estimate ~ {expected:.1f}")
+        return
+
+    options = dict(
+        max_terms=opts.max_terms,
+        tolerance=opts.tol,
+        method=opts.method,
+        rs_threshold=opts.rs_threshold,
+    )
+
+    if opts.precision is not None:
+        raw_values = [v for v in opts.values if v != "&"] or ["2", "0.5+14j", "-1.5"]
+        for raw in raw_values:
+            try:
+                result = riemann_zeta_mp(raw, digits=opts.precision)
+            except (ValueError, TypeError) as exc:
+                raise SystemExit(f"Cannot parse '{raw}' as a number/complex: {exc}")
+            except RuntimeError as exc:
+                print(f"zeta({raw}): {exc}", file=sys.stderr)
+                continue
+            mpmath = _require_mpmath()
+            print(f"zeta({raw}) ~ {mpmath.nstr(result.value, opts.precision)}")
+            print(
+                f"  [{result.working_digits} working digits, {result.terms} terms, "
+                f"{result.passes} passes, {result.seconds:.3f} s]"
+            )
+        return
+
+    if opts.input is not None:
+        values_in, values_out = itertools.tee(
+            read_values(opts.input, opts.input_format, opts.column, opts.chunk_size)
+        )
+        chunks = sweep(
+            values_in,
+            workers=opts.workers if opts.workers is not None else 1,
+            chunk_size=opts.chunk_size,
+            checkpoint=opts.checkpoint,
+            cache_path=opts.cache,
+            **options,
+        )
+        count = write_results(values_out, chunks, opts.output or "-", opts.output_format)
+        print(f"Wrote {count} values", file=sys.stderr)
+        return
+
     if opts.values:
         values = parse_values(opts.values)
     else:
@@ -147,9 +1597,44 @@ def main(argv: List[str]) -> None:
             ]
             print("Riemann zeta values (Dirichlet eta approximation):")
 
-    for s in values:
-        val = riemann_zeta(s, max_terms=opts.max_terms, tolerance=opts.tol)
-        print(f"zeta({s}) ~ {val}")
+    # Worker processes open the store themselves (see sweep); a checkpoint
+    # needs sweep too, run in-process when --workers is not given.
+    use_sweep = opts.workers is not None or opts.checkpoint is not None
+    cache = None
+    if opts.cache and not use_sweep:
+        cache = ZetaCache(opts.cache_size, opts.cache)
+
+    if use_sweep:
+        chunks = sweep(
+            values,
+            workers=(opts.workers or None) if opts.workers is not None else 1,
+            chunk_size=opts.chunk_size,
+            checkpoint=opts.checkpoint,
+            cache_path=opts.cache,
+            **options,
+        )
+        results = itertools.chain.from_iterable(chunk.tolist() for chunk in chunks)
+        for s, val in zip(values, results):
+            print(f"zeta({s}) ~ {val}")
+    elif opts.batch:
+        evaluate_many = cache.zeta_many if cache else riemann_zeta_many
+        results = evaluate_many(values, **options)
+        for s, val in zip(values, results):
+            print(f"zeta({s}) ~ {complex(val)}")
+    else:
+        evaluate = cache.zeta if cache else riemann_zeta
+        for s in values:
+            val = evaluate(s, **options)
+            print(f"zeta({s}) ~ {val}")
+
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"cache: {stats['hits']} memory hits, {stats['store_hits']} store hits, "
+            f"{stats['misses']} misses",
+            file=sys.stderr,
+        )
+        cache.close()
 
     if not opts.values:
         print("\nReference checks:")
@@ -158,6 +1643,4 @@ def main(argv: List[str]) -> None:
 
 
 if __name__ == "__main__":
-    import sys
-
     main(sys.argv[1:])
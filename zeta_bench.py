@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Speed and accuracy benchmark for zeta.py.
+
+Every case in benchmarks/zeta_references.json (demo set, critical line,
+negative reals, large heights) is evaluated with each summation method. The
+script records wall time, the route and number of terms used, and the
+absolute error (and error relative to max(|zeta|, 1)) against the stored
+high-precision references. It
+writes JSON so runs can be compared between backends and versions:
+
+    python zeta_bench.py --output new.json --compare baseline.json
+
+With --compare, any case that got slower by more than --max-slowdown or
+lost accuracy beyond the tolerance is reported and the exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import zeta
+
+REFERENCES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmarks", "zeta_references.json"
+)
+
+# (group, s) pairs used when regenerating the reference file.
+CASES = [
+    ("demo", 2),
+    ("demo", 4),
+    ("demo", 0),
+    ("demo", -1),
+    ("demo", 0.5),
+    ("demo", 2 + 3j),
+    ("demo", 0.5 + 14j),
+    ("critical-line", 0.5 + 14.134725141734695j),
+    ("critical-line", 0.5 + 21j),
+    ("critical-line", 0.5 + 50j),
+    ("critical-line", 0.5 + 100j),
+    ("critical-line", 0.5 + 1000j),
+    ("critical-line", 0.5 + 10_000j),
+    ("critical-line", 0.5 + 100_000j),
+    ("critical-line", 0.5 + 1_000_000j),
+    ("negative-real", -0.5),
+    ("negative-real", -1.5),
+    ("negative-real", -3.5),
+    ("negative-real", -10.25),
+    ("negative-real", -25.5),
+    ("negative-real", -7),
+    ("negative-real", -40),
+    ("large-t", 2 + 1000j),
+    ("large-t", 0.75 + 5000j),
+    ("large-t", 0.25 + 20_000j),
+    ("large-t", -1 + 300j),
+]
+
+
+def load_references(path: str = REFERENCES_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)["cases"]
+
+
+def regenerate_references(path: str, digits: int) -> None:
+    """Recompute the reference values with mpmath (needed only here)."""
+    import mpmath
+
+    mpmath.mp.dps = digits
+    cases = []
+    for group, s in CASES:
+        s_c = complex(s)
+        value = mpmath.zeta(mpmath.mpc(s_c.real, s_c.imag))
+        cases.append(
+            {
+                "group": group,
+                "s": [s_c.real, s_c.imag],
+                "zeta": [mpmath.nstr(value.real, digits), mpmath.nstr(value.imag, digits)],
+            }
+        )
+    # One case per line keeps diffs of the reference file readable.
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(f'{{"digits": {digits}, "source": "mpmath {mpmath.__version__}", "cases": [\n')
+        handle.write(",\n".join(json.dumps(case) for case in cases))
+        handle.write("\n]}\n")
+
+
+def _time_call(fn, repeat: int) -> float:
+    """Best-of-repeat wall time in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(
+    methods: Sequence[str], tolerance: float, repeat: int, groups: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    results = []
+    for case in load_references():
+        if groups and case["group"] not in groups:
+            continue
+        s = complex(*case["s"])
+        ref = complex(float(case["zeta"][0]), float(case["zeta"][1]))
+        for method in methods:
+            evaluation = zeta.evaluate_zeta(s, tolerance=tolerance, method=method)
+            seconds = _time_call(
+                lambda: zeta.riemann_zeta(s, tolerance=tolerance, method=method), repeat
+            )
+            error = abs(complex(evaluation.value) - ref)
+            results.append(
+                {
+                    "group": case["group"],
+                    "s": case["s"],
+                    "method": method,
+                    "route": evaluation.route,
+                    "terms": evaluation.terms,
+                    "seconds": seconds,
+                    "abs_error": error,
+                    # Relative to max(|zeta|, 1) so cases at zeros stay meaningful.
+                    "rel_error": error / max(abs(ref), 1.0),
+                }
+            )
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "tolerance": tolerance,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float) -> List[str]:
+    """Describe cases that got slower or less accurate than the baseline."""
+    tolerance = current["tolerance"]
+    before = {(tuple(r["s"]), r["method"]): r for r in baseline["results"]}
+    problems = []
+    for row in current["results"]:
+        old = before.get((tuple(row["s"]), row["method"]))
+        if old is None:
+            continue
+        label = f"{row['method']} s={complex(*row['s'])}"
+        # Sub-10us timings are mostly noise; ignore slowdowns below that.
+        if row["seconds"] > max_slowdown * old["seconds"] and row["seconds"] > 1e-5:
+            problems.append(f"{label}: {old['seconds']:.2e}s -> {row['seconds']:.2e}s")
+        if row["rel_error"] > max(10 * old["rel_error"], tolerance):
+            problems.append(f"{label}: rel error {old['rel_error']:.1e} -> {row['rel_error']:.1e}")
+    return problems
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    print(
+        f"{'method':<16}{'group':<15}{'s':<26}{'route':<26}"
+        f"{'terms':>8}{'time':>11}{'rel err':>10}"
+    )
+    for row in report["results"]:
+        s = complex(*row["s"])
+        print(
+            f"{row['method']:<16}{row['group']:<15}{str(s):<26}{row['route']:<26}"
+            f"{row['terms']:>8}{row['seconds']:>11.2e}{row['rel_error']:>10.1e}"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark zeta.py speed and accuracy.")
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=zeta.METHODS,
+        default=[m for m in zeta.METHODS if m != "direct"],
+        help="Methods to benchmark (default: all but direct, which takes minutes)",
+    )
+    parser.add_argument(
+        "--groups", nargs="+", default=None, help="Only run these case groups"
+    )
+    parser.add_argument(
+        "--tol", type=float, default=1e-12, help="Tolerance passed to zeta (default: 1e-12)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing repetitions per case (default: 5)"
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the JSON report here ('-' for stdout)"
+    )
+    parser.add_argument(
+        "--compare", default=None, help="Baseline JSON report to check for regressions"
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.5,
+        help="Allowed time ratio against the baseline (default: 1.5)",
+    )
+    parser.add_argument(
+        "--regenerate-references",
+        type=int,
+        metavar="DIGITS",
+        default=None,
+        help="Recompute the stored references with mpmath at DIGITS digits and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.regenerate_references:
+        regenerate_references(REFERENCES_PATH, args.regenerate_references)
+        print(f"Wrote {REFERENCES_PATH}")
+        return 0
+
+    report = run(args.methods, args.tol, args.repeat, args.groups)
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        _print_summary(report)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        problems = compare(report, baseline, args.max_slowdown)
+        for line in problems:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())